@@ -0,0 +1,40 @@
+"""
+Benchmarks embedding the state of multi-widget apps.
+"""
+from bokeh.document import Document
+from pyviz_comms import Comm
+
+from panel.io.embed import embed_state
+from panel.io.model import add_to_doc
+from panel.layout import Row
+from panel.pane import Str
+from panel.widgets import Select
+
+
+class EmbedState:
+
+    params = ([1, 2, 4], ['independent', 'dependent'])
+    param_names = ['n_widgets', 'links']
+
+    number = 1
+
+    def setup(self, n, links):
+        widgets = [Select(options=['A', 'B', 'C']) for _ in range(n)]
+        if links == 'independent':
+            outputs = [Str() for _ in widgets]
+            for widget, output in zip(widgets, outputs):
+                widget.link(output, value='object')
+        else:
+            output = Str()
+            def update(*events):
+                output.object = ''.join(w.value for w in widgets)
+            for widget in widgets:
+                widget.param.watch(update, 'value')
+            outputs = [output]
+        self.layout = Row(*(widgets+outputs))
+        self.doc = Document()
+        self.model = self.layout.get_root(self.doc, Comm())
+        add_to_doc(self.model, self.doc)
+
+    def time_embed_state(self, n, links):
+        embed_state(self.layout, self.model, self.doc, progress=False)
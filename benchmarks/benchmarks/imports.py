@@ -0,0 +1,29 @@
+"""
+Benchmarks the time taken to import panel in a fresh interpreter.
+"""
+
+
+def timeraw_import_panel():
+    return "import panel"
+
+
+def timeraw_import_panel_and_resolve():
+    return """
+    import panel as pn
+    pn.panel('Some text')
+    """
+
+
+def track_lazy_modules_imported():
+    import subprocess
+    import sys
+    code = (
+        "import sys, panel;"
+        "print(sum(m in sys.modules for m in ("
+        "'panel.pane.deckgl', 'panel.pane.holoviews', 'panel.pane.plotly',"
+        "'panel.pane.streamz', 'panel.pane.vega', 'panel.pane.vtk',"
+        "'panel.pipeline', 'panel.template', 'bokeh.server.server')))"
+    )
+    return int(subprocess.check_output([sys.executable, '-c', code]))
+
+track_lazy_modules_imported.unit = 'modules'
@@ -0,0 +1,56 @@
+"""
+Benchmarks constructing, rendering and updating layouts of widgets.
+"""
+from bokeh.document import Document
+from pyviz_comms import Comm
+
+from panel.layout import Column
+from panel.widgets import FloatSlider
+
+
+def _widgets(n):
+    return [FloatSlider(name='Slider %d' % i) for i in range(n)]
+
+
+class LayoutRender:
+
+    params = [10, 100, 1000]
+    param_names = ['n_widgets']
+
+    # Run setup before each sample so models are not accumulated
+    number = 1
+
+    def setup(self, n):
+        self.widgets = _widgets(n)
+        self.layout = Column(*self.widgets)
+
+    def time_construct(self, n):
+        Column(*self.widgets)
+
+    def time_get_root(self, n):
+        self.layout.get_root(Document(), Comm())
+
+
+class LayoutUpdate:
+
+    params = [10, 100, 1000]
+    param_names = ['n_widgets']
+
+    number = 1
+
+    def setup(self, n):
+        self.layout = Column(*_widgets(n))
+        self.layout.get_root(Document(), Comm())
+        self.new = FloatSlider()
+
+    def time_append(self, n):
+        self.layout.append(self.new)
+
+    def time_replace_one(self, n):
+        self.layout[n // 2] = self.new
+
+    def time_reverse(self, n):
+        self.layout.objects = self.layout.objects[::-1]
+
+    def time_clear(self, n):
+        self.layout.clear()
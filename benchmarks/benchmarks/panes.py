@@ -0,0 +1,32 @@
+"""
+Benchmarks resolving objects to the appropriate Pane type.
+"""
+import numpy as np
+import pandas as pd
+
+import panel as pn
+
+
+def _function(a=1):
+    return a
+
+
+OBJECTS = {
+    'str': lambda: 'Some *markdown* text',
+    'html': lambda: '<div>Some HTML</div>',
+    'dataframe': lambda: pd.DataFrame({'x': np.arange(10)}),
+    'function': lambda: _function,
+    'widget': lambda: pn.widgets.TextInput(),
+}
+
+
+class PanelResolution:
+
+    params = list(OBJECTS)
+    param_names = ['object']
+
+    def setup(self, kind):
+        self.obj = OBJECTS[kind]()
+
+    def time_panel(self, kind):
+        pn.panel(self.obj)
@@ -0,0 +1,25 @@
+"""
+Benchmarks propagating parameter changes to the rendered models.
+"""
+from bokeh.document import Document
+from pyviz_comms import Comm
+
+from panel.io.model import add_to_doc
+from panel.widgets import TextInput
+
+
+class ParamChangeFanout:
+
+    params = [1, 10, 100]
+    param_names = ['n_views']
+
+    def setup(self, n):
+        self.widget = TextInput()
+        for _ in range(n):
+            doc = Document()
+            add_to_doc(self.widget.get_root(doc, Comm()), doc, hold=True)
+        self.count = 0
+
+    def time_param_change(self, n):
+        self.count += 1
+        self.widget.value = str(self.count)
@@ -0,0 +1,43 @@
+"""
+Benchmarks serializing model changes into PATCH-DOC messages.
+"""
+import numpy as np
+
+from bokeh.document import Document
+from bokeh.models import Column, ColumnDataSource, TextInput
+from pyviz_comms import Comm
+
+from panel.io.model import diff
+from panel.io.notebook import push
+from panel.io.profile import _msg_size
+
+
+class DiffSerialization:
+
+    params = ([10, 100, 1000], [True, False])
+    param_names = ['n_updates', 'binary']
+
+    # Serializing clears the held events so each sample needs a setup
+    number = 1
+
+    def setup(self, n, binary):
+        self.doc = Document()
+        inputs = [TextInput() for _ in range(n)]
+        source = ColumnDataSource(data={'x': np.zeros(n*100)})
+        self.doc.add_root(Column(*inputs))
+        self.doc.add_root(source)
+        self.doc.hold('combine')
+        for i, model in enumerate(inputs):
+            model.value = str(i)
+        source.data = {'x': np.random.RandomState(0).rand(n*100)}
+
+    def time_diff(self, n, binary):
+        diff(self.doc, binary=binary)
+
+    def time_push(self, n, binary):
+        push(self.doc, Comm(), binary=binary)
+
+    def track_diff_size(self, n, binary):
+        return _msg_size(diff(self.doc, binary=binary))
+
+    track_diff_size.unit = 'bytes'
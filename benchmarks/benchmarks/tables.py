@@ -0,0 +1,55 @@
+"""
+Benchmarks rendering the DataFrame widget for large frames.
+"""
+import numpy as np
+import pandas as pd
+
+from bokeh.document import Document
+from pyviz_comms import Comm
+
+from panel.widgets import DataFrame
+
+
+def _frame(n):
+    rng = np.random.RandomState(0)
+    return pd.DataFrame({
+        'int': rng.randint(0, 100, n),
+        'float': rng.rand(n),
+        'str': rng.choice(['A', 'B', 'C'], n),
+        'date': pd.date_range('2000-01-01', periods=n, freq='min'),
+    })
+
+
+class DataFrameRender:
+
+    params = [1000, 10000, 100000]
+    param_names = ['n_rows']
+
+    number = 1
+
+    def setup(self, n):
+        self.df = _frame(n)
+        self.widget = DataFrame(self.df)
+
+    def time_construct(self, n):
+        DataFrame(self.df)
+
+    def time_get_root(self, n):
+        self.widget.get_root(Document(), Comm())
+
+
+
+class DataFrameUpdate:
+
+    params = [1000, 10000, 100000]
+    param_names = ['n_rows']
+
+    number = 1
+
+    def setup(self, n):
+        self.df = _frame(n)
+        self.widget = DataFrame(self.df)
+        self.widget.get_root(Document(), Comm())
+
+    def time_update_value(self, n):
+        self.widget.value = self.df.iloc[::-1]
@@ -1,25 +1,49 @@
 from __future__ import absolute_import, division, unicode_literals
 
+import sys as _sys
+
+from importlib import import_module as _import_module
+
 import param as _param
 
 from . import layout # noqa
 from . import links # noqa
 from . import pane # noqa
 from . import param # noqa
-from . import pipeline # noqa
 from . import widgets # noqa
 
 from .config import config, panel_extension as extension # noqa
 from .depends import depends # noqa
 from .interact import interact # noqa
 from .io import ipywidget, serve, state # noqa
+from .io.cache import cache # noqa
 from .layout import ( # noqa
     Accordion, Card, Row, Column, WidgetBox, Tabs, Spacer, 
     GridSpec, GridBox
 )
 from .pane import panel, Pane # noqa
 from .param import Param # noqa
-from .template import Template # noqa
+
+# Modules and objects which are imported on first access
+_LAZY_ATTRS = {
+    'pipeline': ('.pipeline', None),
+    'Template': ('.template', 'Template'),
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module, attr = _LAZY_ATTRS[name]
+        module = _import_module(module, __name__)
+        return module if attr is None else getattr(module, attr)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
+
+# Module level __getattr__ requires Python 3.7 (PEP 562)
+if _sys.version_info < (3, 7):
+    for _name in _LAZY_ATTRS:
+        globals()[_name] = __getattr__(_name)
 
 __version__ = str(_param.version.Version(
     fpath=__file__, archive_commit="$Format:%h$", reponame="panel"))
@@ -11,7 +11,7 @@ from bokeh.command.util import die
 from bokeh.util.string import nice_join
 
 from . import __version__
-from .io.server import INDEX_HTML
+from .io.server import INDEX_HTML, _share_cache
 
 
 def transform_cmds(argv):
@@ -41,6 +41,26 @@ def transform_cmds(argv):
     return transformed
 
 
+def num_procs(argv):
+    """
+    Returns the number of worker processes requested by the
+    --num-procs argument of the serve command. Invalid values are
+    treated as a single process and left for bokeh to report.
+    """
+    for i, arg in enumerate(argv):
+        if arg.startswith('--num-procs='):
+            value = arg.split('=', 1)[1]
+        elif arg == '--num-procs' and i+1 < len(argv):
+            value = argv[i+1]
+        else:
+            continue
+        try:
+            return int(value)
+        except ValueError:
+            return 1
+    return 1
+
+
 def main(args=None):
     """Merges commands offered by pyct and bokeh and provides help for both"""
     from bokeh.command.subcommands import all as bokeh_commands
@@ -80,6 +100,8 @@ def main(args=None):
         if sys.argv[1] == 'serve' and not any(arg.startswith('--index') for arg in sys.argv):
             sys.argv = sys.argv + ['--index=%s' % INDEX_HTML]
         sys.argv = transform_cmds(sys.argv)
+        if sys.argv[1] == 'serve' and num_procs(sys.argv) != 1:
+            _share_cache()
         bokeh_entry_point()
     elif sys.argv[1] in pyct_commands:
         try:
@@ -62,10 +62,39 @@ class _config(param.Parameterized):
     css_files = param.List(default=_CSS_FILES, doc="""
         External CSS files to load.""")
 
+    embed_format = param.ObjectSelector(default='json', objects=['json', 'shards'], doc="""
+        Format of the files embedded state is exported to when
+        embed_json is enabled, either one json file per state or a
+        small number of compressed binary shards which are loaded on
+        demand.""")
+
+    event_policy = param.ObjectSelector(default=None, objects=[
+        'throttle', 'debounce', 'latest', None], doc="""
+        How events received from the frontend are coalesced before
+        they are processed. 'throttle' processes the latest value of
+        all events received within the debounce period of a component,
+        'debounce' waits until no new event was received for the
+        debounce period (or the maximum wait time elapsed) and
+        'latest' processes the latest value on the next tick. If None
+        server events are throttled and events received via comms
+        in the notebook are processed immediately.""")
+
     js_files = param.Dict(default={}, doc="""
         External JS files to load. Dictionary should map from exported
         name to the URL of the JS file.""")
 
+    nthreads = param.Integer(default=None, bounds=(1, None), doc="""
+        If set, events received from the frontend on the server are
+        processed on a pool of the specified number of threads. Events
+        belonging to a single session are always processed in order
+        and model updates are scheduled back onto the server IOLoop.""")
+
+    profile = param.Boolean(default=False, doc="""
+        Whether to record the time spent in each phase of processing
+        events and updating models for each component. Aggregated
+        timings are available via state.timing_stats and can be
+        exported with state.dump_trace.""")
+
     raw_css = param.List(default=[], doc="""
         List of raw CSS strings to add to load.""")
 
@@ -74,6 +103,22 @@ class _config(param.Parameterized):
         embedded. Useful when only partial updates are made in an
         app, e.g. when working with HoloViews.""")
 
+    session_idle_ttl = param.Number(default=None, bounds=(0, None), doc="""
+        Time in seconds after which server sessions which have not
+        received any events from the frontend are closed and
+        destroyed.""")
+
+    session_pool_size = param.Integer(default=0, bounds=(0, None), doc="""
+        Number of app instances to build ahead of demand for apps
+        served from a function. New sessions are handed a pre-built
+        instance and the pool is refilled on the server IOLoop once
+        no new session arrived for a second, so builds do not delay
+        bursts of new sessions.""")
+
+    session_ttl = param.Number(default=None, bounds=(0, None), doc="""
+        Maximum lifetime of a server session in seconds, after which
+        it is closed and destroyed.""")
+
     sizing_mode = param.ObjectSelector(default=None, objects=[
         'fixed', 'stretch_width', 'stretch_height', 'stretch_both',
         'scale_width', 'scale_height', 'scale_both', None], doc="""
@@ -374,6 +419,11 @@ def _cleanup_server(server_id):
     if server_id not in state._servers:
         return
     server, viewable, docs = state._servers.pop(server_id)
+    state._session_pools.pop(server_id, None)
+    state._server_nthreads.pop(server_id, None)
+    pool = state._thread_pools.pop(server_id, None)
+    if pool is not None:
+        pool[0].shutdown(wait=False)
     server.stop()
     for doc in docs:
         for root in doc.roots:
@@ -5,7 +5,7 @@ model state, and rendering panel objects.
 
 from .embed import embed_state # noqa
 from .state import state # noqa
-from .model import add_to_doc, remove_root, diff # noqa
+from .model import add_to_doc, remove_root, diff, hold # noqa
 from .resources import Resources # noqa
 from .server import get_server, serve, unlocked # noqa
 from .notebook import block_comm, ipywidget, load_notebook, push # noqa
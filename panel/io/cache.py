@@ -0,0 +1,362 @@
+"""
+Implements memoization utilities which allow caching the results of
+expensive computations globally (across all sessions on a server) or
+for a single session.
+"""
+from __future__ import absolute_import, division, unicode_literals
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+
+from collections import OrderedDict, defaultdict
+from collections.abc import MutableMapping
+from functools import wraps
+
+import numpy as np
+
+from .state import state
+
+_POLICIES = ('lru', 'lfu', 'fifo')
+
+
+def _function_key(func, closure=True):
+    """
+    Returns a tuple identifying a function by where it was defined, its
+    code and the values it closes over. Scripts served with bokeh are
+    executed in a new module for each session, so functions defined in
+    them are identified by the script path rather than the module name.
+    """
+    module = getattr(func, '__module__', None) or ''
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return (module, func.__qualname__)
+    location = code.co_filename if module.startswith('bokeh_app_') else module
+    key = (location, func.__qualname__, code.co_firstlineno, code.co_code)
+    if not closure:
+        return key
+    cells = []
+    for cell in (getattr(func, '__closure__', None) or ()):
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            value = None
+        # Avoid recursing into functions which may close over themselves
+        cells.append(_function_key(value, False) if callable(value)
+                     and hasattr(value, '__qualname__') else value)
+    return key + (cells,)
+
+
+def _update_hash(hasher, obj):
+    """
+    Recursively updates the hasher with a representation of the
+    object, hashing numpy arrays and pandas objects by their contents.
+    """
+    hasher.update(type(obj).__name__.encode('utf-8'))
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        hasher.update(repr(obj).encode('utf-8'))
+    elif isinstance(obj, bytes):
+        hasher.update(obj)
+    elif isinstance(obj, np.ndarray):
+        hasher.update(repr((obj.dtype.str, obj.shape)).encode('utf-8'))
+        if obj.dtype.kind == 'O':
+            for item in obj.ravel():
+                _update_hash(hasher, item)
+        else:
+            hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif 'pandas' in sys.modules and isinstance(
+            obj, (sys.modules['pandas'].DataFrame, sys.modules['pandas'].Series)):
+        import pandas as pd
+        if isinstance(obj, pd.DataFrame):
+            _update_hash(hasher, [str(c) for c in obj.columns])
+        hasher.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _update_hash(hasher, item)
+    elif isinstance(obj, dict):
+        items = sorted((_generate_hash(k), v) for k, v in obj.items())
+        for key, value in items:
+            hasher.update(key.encode('utf-8'))
+            _update_hash(hasher, value)
+    elif callable(obj) and hasattr(obj, '__qualname__'):
+        _update_hash(hasher, _function_key(obj))
+    else:
+        try:
+            hasher.update(pickle.dumps(obj))
+        except Exception:
+            hasher.update(repr(obj).encode('utf-8'))
+
+
+def _generate_hash(obj):
+    """
+    Returns a stable hash of the supplied object.
+    """
+    hasher = hashlib.md5()
+    _update_hash(hasher, obj)
+    return hasher.hexdigest()
+
+
+class Cache(object):
+    """
+    Thread-safe store of computed values which evicts items once they
+    are older than the ttl (in seconds) and applies the eviction
+    policy ('lru', 'lfu' or 'fifo') once max_items is exceeded.
+    """
+
+    def __init__(self, ttl=None, max_items=None, policy='lru'):
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.RLock()
+        self._key_locks = defaultdict(threading.Lock)
+        self.configure(ttl, max_items, policy)
+
+    def configure(self, ttl=None, max_items=None, policy='lru'):
+        """
+        Updates the ttl, max_items and eviction policy, immediately
+        expiring and evicting items which no longer fit.
+        """
+        if policy not in _POLICIES:
+            raise ValueError("Cache policy must be one of %s, got %r."
+                             % (', '.join(map(repr, _POLICIES)), policy))
+        with self._lock:
+            self.ttl = ttl
+            self.max_items = max_items
+            self.policy = policy
+            self._expire()
+            self._evict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        with self._lock:
+            self._expire()
+            return key in self._items
+
+    def _expire(self):
+        if self.ttl is None:
+            return
+        now = time.time()
+        for key, (_, created, _) in list(self._items.items()):
+            if (now - created) > self.ttl:
+                del self._items[key]
+
+    def _evict(self, room=0):
+        """
+        Evicts items until room additional items fit within max_items.
+        """
+        if self.max_items is None:
+            return
+        while self._items and len(self._items) + room > self.max_items:
+            if self.policy == 'lfu':
+                key = min(self._items, key=lambda k: self._items[k][2])
+                del self._items[key]
+            else:
+                self._items.popitem(last=False)
+
+    def get(self, key, fn, *args, **kwargs):
+        """
+        Returns the cached value for the key, calling fn with the
+        supplied arguments to compute it if it is missing or expired.
+        Concurrent requests for the same key compute it only once.
+        """
+        with self._lock:
+            self._expire()
+            if key in self._items:
+                return self._hit(key)
+            key_lock = self._key_locks[key]
+        with key_lock:
+            try:
+                with self._lock:
+                    if key in self._items:
+                        return self._hit(key)
+                value = fn(*args, **kwargs)
+                with self._lock:
+                    self.misses += 1
+                    # Evict before inserting so a new item is not immediately
+                    # evicted as the least frequently used one
+                    self._evict(room=1)
+                    self._items[key] = (value, time.time(), 0)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        return value
+
+    def _hit(self, key):
+        value, created, count = self._items[key]
+        self._items[key] = (value, created, count+1)
+        if self.policy == 'lru':
+            self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def _settings(self):
+        return dict(ttl=self.ttl, max_items=self.max_items, policy=self.policy)
+
+    def info(self):
+        """
+        Returns a dictionary summarizing the cache hits, misses and size.
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._items), 'max_items': self.max_items,
+                'ttl': self.ttl, 'policy': self.policy}
+
+
+class DiskCache(MutableMapping):
+    """
+    Dictionary-like store which pickles each value to a file in a
+    directory, allowing the values to be shared between multiple
+    processes, e.g. the workers of a server launched with num_procs.
+    Writes are atomic and unpickled values are memoized in-process
+    until the file is replaced by another process.
+
+    Since values are pickled only picklable objects can be stored,
+    i.e. not connections, Panel objects or lambdas, and in-place
+    modifications of a stored value (e.g. `cache['x'].append(1)`)
+    are not seen by other processes unless the value is assigned
+    again.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or tempfile.mkdtemp(prefix='panel_cache_')
+        os.makedirs(self.path, exist_ok=True)
+        self._loaded = {}
+
+    def _file(self, key, ext):
+        return os.path.join(self.path, _generate_hash(key)+ext)
+
+    def _write(self, filename, obj):
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            os.remove(tmp)
+            raise TypeError(
+                "DiskCache could not pickle %s object. When serving with "
+                "multiple processes state.cache can only store picklable "
+                "values, unpicklable objects such as connections, Panel "
+                "objects or lambdas have to be created in each process. "
+                "Original error: %s" % (type(obj).__name__, e))
+        os.replace(tmp, filename)
+
+    def __getitem__(self, key):
+        filename = self._file(key, '.pkl')
+        try:
+            mtime = os.stat(filename).st_mtime_ns
+        except OSError:
+            raise KeyError(key)
+        if filename in self._loaded and self._loaded[filename][0] == mtime:
+            return self._loaded[filename][1]
+        with open(filename, 'rb') as f:
+            value = pickle.load(f)
+        self._loaded[filename] = (mtime, value)
+        return value
+
+    def __setitem__(self, key, value):
+        self._write(self._file(key, '.pkl'), value)
+        self._write(self._file(key, '.key'), key)
+
+    def __delitem__(self, key):
+        filename = self._file(key, '.pkl')
+        self._loaded.pop(filename, None)
+        try:
+            os.remove(filename)
+        except OSError:
+            raise KeyError(key)
+        try:
+            os.remove(self._file(key, '.key'))
+        except OSError:
+            pass
+
+    def __iter__(self):
+        for name in sorted(os.listdir(self.path)):
+            if not name.endswith('.key'):
+                continue
+            try:
+                with open(os.path.join(self.path, name), 'rb') as f:
+                    yield pickle.load(f)
+            except OSError:
+                continue
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.path) if name.endswith('.key'))
+
+    def __contains__(self, key):
+        return os.path.isfile(self._file(key, '.pkl'))
+
+    def __repr__(self):
+        return 'DiskCache(%r)' % self.path
+
+
+def _get_cache(key, scope, **cache_kwargs):
+    if scope not in ('global', 'session'):
+        raise ValueError("Cache scope must be either 'global' or "
+                         "'session', got %r." % scope)
+    with state._cache_lock:
+        doc = state.curdoc if scope == 'session' else None
+        caches = state._memo_cache if doc is None else state._session_caches.setdefault(doc, {})
+        if key not in caches:
+            caches[key] = Cache(**cache_kwargs)
+        elif cache_kwargs != caches[key]._settings:
+            caches[key].configure(**cache_kwargs)
+        return caches[key]
+
+
+def cache(func=None, scope='global', ttl=None, max_items=None, policy='lru'):
+    """
+    Decorator which memoizes the return value of a function based on
+    a hash of its arguments, which may include numpy arrays and
+    pandas objects.
+
+    Arguments
+    ---------
+    func: callable
+      The function to memoize.
+    scope: str (optional, default='global')
+      Whether to share the cache across all sessions ('global') or
+      maintain a separate cache for each session ('session').
+    ttl: float (optional, default=None)
+      Time in seconds after which a cached value expires.
+    max_items: int (optional, default=None)
+      Maximum number of items to keep in the cache.
+    policy: str (optional, default='lru')
+      Eviction policy applied once max_items is exceeded, one of
+      'lru' (least recently used), 'lfu' (least frequently used)
+      or 'fifo' (first in, first out).
+
+    Returns
+    -------
+    The wrapped function with cache_info and clear methods.
+    """
+    if func is None:
+        return lambda f: cache(f, scope, ttl, max_items, policy)
+
+    cache_kwargs = dict(ttl=ttl, max_items=max_items, policy=policy)
+    func_hash = _generate_hash(func)
+
+    @wraps(func)
+    def wrapped(*args, **kwargs):
+        key = _generate_hash((args, kwargs))
+        return _get_cache(func_hash, scope, **cache_kwargs).get(key, func, *args, **kwargs)
+
+    def cache_info():
+        return _get_cache(func_hash, scope, **cache_kwargs).info()
+
+    def clear():
+        _get_cache(func_hash, scope, **cache_kwargs).clear()
+
+    wrapped.cache_info = cache_info
+    wrapped.clear = clear
+    return wrapped
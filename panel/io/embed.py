@@ -4,15 +4,18 @@ Various utilities for recording and embedding state in a rendered app.
 from __future__ import absolute_import, division, unicode_literals
 
 import os
+import gzip
+import hashlib
 import json
+import re
+import struct
 import uuid
 import param
 import sys
 
 from collections import defaultdict
 from contextlib import contextmanager
-from itertools import product
-from tqdm import tqdm
+from itertools import combinations, product
 
 from bokeh.core.property.bases import Property
 from bokeh.models import CustomJS
@@ -52,29 +55,75 @@ def always_changed(enable):
             Property.matches = backup
 
 
-def record_events(doc):
-    msg = diff(doc, False)
-    if msg is None:
-        return {'header': '{}', 'metadata': '{}', 'content': '{}'}
-    return {'header': msg.header_json, 'metadata': msg.metadata_json,
-            'content': msg.content_json}
+# Maximum size of the uncompressed records in a single shard
+SHARD_SIZE = 2**22
 
+BUFFER_RE = re.compile(r'"__buffer__": "([^"]+)"')
 
-def save_dict(state, key=(), depth=0, max_depth=None, save_path='', load_path=None):
+
+def record_events(doc, binary=False):
+    """
+    Records the held events on the Document as a PATCH-DOC message.
+    If binary is enabled arrays are recorded as separate buffers
+    and the message id and buffer ids are normalized so identical
+    states produce identical records.
+    """
+    msg = diff(doc, binary)
+    if msg is None:
+        return {'header': '{}', 'metadata': '{}', 'content': '{}'}
+    if not binary:
+        return {'header': msg.header_json, 'metadata': msg.metadata_json,
+                'content': msg.content_json}
+    ids = {str(header['id']): str(i) for i, (header, _) in enumerate(msg.buffers)}
+    content = BUFFER_RE.sub(lambda m: '"__buffer__": "%s"' % ids[m.group(1)],
+                            msg.content_json)
+    header = {k: v for k, v in msg.header.items() if k != 'msgid'}
+    return {'header': json.dumps(header, sort_keys=True),
+            'metadata': msg.metadata_json, 'content': content,
+            'buffers': [(json.dumps({'id': ids[str(h['id'])]}), bytes(payload))
+                        for h, payload in msg.buffers]}
+
+
+def encode_record(events):
+    """
+    Encodes recorded events as a sequence of frames, each consisting
+    of a flag indicating whether it is binary, its length and the
+    data, which are consumed in order by the State model.
+    """
+    frames = [events['header'], events['metadata'], events['content']]
+    for header, payload in events.get('buffers', []):
+        frames += [header, payload]
+    record = bytearray()
+    for frame in frames:
+        binary = isinstance(frame, bytes)
+        data = frame if binary else frame.encode('utf-8')
+        record += struct.pack('<BI', binary, len(data)) + data
+    return bytes(record)
+
+
+def save_dict(state, depth=0, max_depth=None, save_path='', load_path=None):
+    """
+    Writes the leaves of the nested state dictionary to json files,
+    replacing them with the path they will be loaded from. Files are
+    named by a hash of their contents so that identical states are
+    only written once.
+    """
     filename_dict = {}
     for k, v in state.items():
-        curkey = key+(k,)
         if depth < max_depth:
-            filename_dict[k] = save_dict(v, curkey, depth+1, max_depth,
+            filename_dict[k] = save_dict(v, depth+1, max_depth,
                                          save_path, load_path)
         else:
-            filename = '_'.join([str(i) for i in curkey]) +'.json'
+            # The message header only carries a unique message id
+            # and is therefore ignored when hashing the state
+            key = v['metadata'] + v['content']
+            filename = hashlib.sha1(key.encode('utf-8')).hexdigest()+'.json'
             filepath = os.path.join(save_path, filename)
-            directory = os.path.dirname(filepath)
-            if not os.path.exists(directory):
-                os.makedirs(directory)
-            with open(filepath, 'w') as f:
-                json.dump(v, f)
+            if not os.path.isfile(filepath):
+                if not os.path.exists(save_path):
+                    os.makedirs(save_path)
+                with open(filepath, 'w') as f:
+                    json.dump(v, f)
             refpath = filepath
             if load_path:
                 refpath = os.path.join(load_path, filename)
@@ -82,6 +131,166 @@ def save_dict(state, key=(), depth=0, max_depth=None, save_path='', load_path=No
     return filename_dict
 
 
+def save_shards(state, max_depth, save_path='', load_path=None, shard_size=SHARD_SIZE):
+    """
+    Packs the leaves of the nested state dictionary into gzip
+    compressed shards, writing identical records only once, and
+    replaces each leaf with the index of its shard and the offset
+    and length of its record in the decompressed shard. Returns the
+    index and the paths the shards will be loaded from.
+    """
+    records, shards = {}, [bytearray()]
+
+    def index(state, depth):
+        entries = {}
+        for k, v in state.items():
+            if depth < max_depth:
+                entries[k] = index(v, depth+1)
+                continue
+            record = encode_record(v)
+            digest = hashlib.sha1(record).hexdigest()
+            if digest not in records:
+                if shards[-1] and len(shards[-1])+len(record) > shard_size:
+                    shards.append(bytearray())
+                records[digest] = [len(shards)-1, len(shards[-1]), len(record)]
+                shards[-1] += record
+            entries[k] = records[digest]
+        return entries
+
+    state_index = index(state, 0)
+    if not os.path.exists(save_path):
+        os.makedirs(save_path)
+    paths = []
+    for shard in shards:
+        data = gzip.compress(bytes(shard))
+        filename = hashlib.sha1(data).hexdigest()+'.bin'
+        with open(os.path.join(save_path, filename), 'wb') as f:
+            f.write(data)
+        paths.append(os.path.join(load_path or save_path, filename))
+    return state_index, paths
+
+
+def record_state(doc, values, key, safe=False, binary=False):
+    """
+    Sets the widgets to the supplied combination of values and
+    records the resulting events, returning the path of the state
+    in the state dictionary and the events or None if any of the
+    values could not be applied.
+    """
+    path = []
+    for (w, m, _, g), k in zip(values, key):
+        try:
+            with always_changed(safe):
+                w.value = k
+        except Exception:
+            doc._held_events = []
+            return None
+        path.append(g(m))
+
+    # Drop events originating from widgets being varied
+    models = [v[1] for v in values]
+    doc._held_events = [e for e in doc._held_events if e.model not in models]
+    return tuple(path), record_events(doc, binary)
+
+
+def has_changes(state, max_depth, depth=0):
+    """
+    Whether any of the recorded states in the nested state dictionary
+    contains events.
+    """
+    if depth < max_depth:
+        return any(has_changes(v, max_depth, depth+1) for v in state.values())
+    return any(v['content'] != '{}' for v in state.values())
+
+
+ID_RE = re.compile(r'"id":\s*"([^"]+)"')
+
+
+def probe_widget(doc, widget, vals, models):
+    """
+    Sets the widget to each of the values and restores its initial
+    value, returning the ids of the models modified by its callbacks
+    and the changes made for each value. Model ids in the changes are
+    numbered in order of appearance so that models created anew on
+    each probe compare equal.
+    """
+    initial = widget.value
+    touched, changes = set(), []
+    for v in vals:
+        try:
+            with always_changed(True):
+                widget.value = v
+        except Exception:
+            pass
+        events = [e for e in doc._held_events if getattr(e, 'model', None)
+                  is not None and e.model not in models]
+        touched |= {e.model.ref['id'] for e in events}
+        msg = diff(doc, False, events) if events else None
+        if msg is None:
+            changes.append(None)
+        else:
+            ids = {}
+            changes.append(ID_RE.sub(lambda m: '"id": "%d"' % ids.setdefault(
+                m.group(1), len(ids)), msg.content_json))
+        doc._held_events = []
+    try:
+        widget.param.set_param(value=initial)
+    except Exception:
+        pass
+    doc._held_events = []
+    return touched, changes
+
+
+def independent_groups(doc, values):
+    """
+    Groups the widgets whose callbacks modify overlapping sets of
+    models or whose changes depend on the value of another widget.
+    Each pair of widgets is probed by setting one widget to each of
+    its values for every value of the other, which also detects
+    callbacks that only read another widget or only interact at a
+    value other than the initial one. The state space of each group
+    may then be explored independently instead of exploring the
+    cross product of all widget values.
+    """
+    models = [m for _, m, _, _ in values]
+    probes = [probe_widget(doc, w, vals, models) for w, _, vals, _ in values]
+    groups = [{i} for i in range(len(values))]
+
+    def group(i):
+        return next(g for g in groups if i in g)
+
+    def coupled(i, j):
+        touched, changes = probes[i]
+        if touched & probes[j][0]:
+            return True
+        other = values[j][0]
+        initial = other.value
+        try:
+            for v in values[j][2]:
+                try:
+                    other.value = v
+                except Exception:
+                    continue
+                doc._held_events = []
+                probe = probe_widget(doc, values[i][0], values[i][2], models)
+                if probe[1] != changes or probe[0] & probes[j][0]:
+                    return True
+        finally:
+            try:
+                other.param.set_param(value=initial)
+            except Exception:
+                pass
+            doc._held_events = []
+        return False
+
+    for i, j in combinations(range(len(values)), 2):
+        gi, gj = group(i), group(j)
+        if gi is not gj and (coupled(i, j) or coupled(j, i)):
+            groups.remove(gj)
+            gi |= gj
+    return sorted(sorted(g) for g in groups)
+
+
 def get_watchers(reactive):
     return [w for pwatchers in reactive._param_watchers.values()
             for awatchers in pwatchers.values() for w in awatchers]
@@ -177,14 +386,17 @@ def links_to_jslinks(model, widget):
 
 def embed_state(panel, model, doc, max_states=1000, max_opts=3,
                 json=False, json_prefix='', save_path='./',
-                load_path=None, progress=True):
+                load_path=None, progress=True, embed_format=None):
     """
-    Embeds the state of the application on a State model which allows
+    Embeds the state of the application on State models which allow
     exporting a static version of an app. This works by finding all
-    widgets with a predefined set of options and evaluating the cross
-    product of the widget values and recording the resulting events to
-    be replayed when exported. The state is recorded on a State model
-    which is attached as an additional root on the Document.
+    widgets with a predefined set of options, grouping the widgets
+    whose callbacks modify overlapping sets of models or depend on
+    each other's values and evaluating
+    the cross product of the widget values within each group and
+    recording the resulting events to be replayed when exported. The
+    state of each group is recorded on a State model which is
+    attached as an additional root on the Document.
 
     Arguments
     ---------
@@ -206,6 +418,10 @@ def embed_state(panel, model, doc, max_states=1000, max_opts=3,
       The path or URL the json files will be loaded from.
     progress: boolean (default=True)
       Whether to report progress
+    embed_format: str (default=None)
+      Whether to export one json file per state ('json') or to pack
+      the states into compressed binary shards ('shards'), defaults
+      to config.embed_format.
     """
     from ..config import config
     from ..layout import Panel
@@ -234,7 +450,6 @@ def embed_state(panel, model, doc, max_states=1000, max_opts=3,
 
     widgets = [w for w in panel.select(is_embeddable)
                if w not in Link.registry]
-    state_model = State()
 
     widget_data, ignore = [], []
     for widget in widgets:
@@ -267,17 +482,18 @@ def embed_state(panel, model, doc, max_states=1000, max_opts=3,
             w_model = widget._models[ref][0]
             if not isinstance(w_model, w_type):
                 w_model = w_model.select_one({'type': w_type})
-        js_callback = CustomJS(code=STATE_JS.format(
-            id=state_model.ref['id'], js_getter=js_getter))
-        widget_data.append((widget, w_model, vals, getter, js_callback, on_change))
+        # The State model is only known once the widgets are grouped
+        js_callback = CustomJS()
+        widget_data.append((widget, w_model, vals, getter, js_callback, on_change, js_getter))
 
     # Ensure we recording state for widgets which could be JS linked
-    values = []
-    for (w, w_model, vals, getter, js_callback, on_change) in widget_data:
+    values, callbacks = [], []
+    for (w, w_model, vals, getter, js_callback, on_change, js_getter) in widget_data:
         if w in ignore:
             continue
         w_model.js_on_change(on_change, js_callback)
         values.append((w, w_model, vals, getter))
+        callbacks.append((js_callback, js_getter))
 
     add_to_doc(model, doc, True)
     doc._held_events = []
@@ -287,47 +503,56 @@ def embed_state(panel, model, doc, max_states=1000, max_opts=3,
 
     restore = [w.value for w, _, _, _ in values]
     init_vals = [g(m) for _, m, _, g in values]
-    cross_product = list(product(*[vals[::-1] for _, _, vals, _ in values]))
+    groups = []
+    for indexes in independent_groups(doc, values):
+        state_model = State()
+        for i in indexes:
+            js_callback, js_getter = callbacks[i]
+            js_callback.code = STATE_JS.format(
+                id=state_model.ref['id'], js_getter=js_getter)
+        group_values = [values[i] for i in indexes]
+        states = list(product(*[vals[::-1] for _, _, vals, _ in group_values]))
+        groups.append((state_model, indexes, group_values, states))
+    doc._held_events = []
 
-    if len(cross_product) > max_states:
+    nstates = sum(len(states) for _, _, _, states in groups)
+    if nstates > max_states:
         if config._doc_build:
             return
         param.main.warning('The cross product of different application '
                            'states is very large to explore (N=%d), consider '
                            'reducing the number of options on the widgets or '
                            'increase the max_states specified in the function '
-                           'to remove this warning' %
-                           len(cross_product))
+                           'to remove this warning' % nstates)
+
+    embed_format = config.embed_format if embed_format is None else embed_format
+    binary = json and embed_format == 'shards'
 
     nested_dict = lambda: defaultdict(nested_dict)
-    state_dict = nested_dict()
-    changes = False
-    for key in (tqdm(cross_product, leave=False, file=sys.stdout) if progress else cross_product):
-        sub_dict = state_dict
-        skip = False
-        for i, k in enumerate(key):
-            w, m, _, g = values[i]
-            try:
-                with always_changed(config.safe_embed):
-                    w.value = k
-            except Exception:
-                skip = True
-                break
-            sub_dict = sub_dict[g(m)]
-        if skip:
-            doc._held_events = []
-            continue
+    state_dicts = [nested_dict() for _ in groups]
+    if progress:
+        from tqdm import tqdm
+        pbar = tqdm(total=nstates, leave=False, file=sys.stdout)
+    else:
+        pbar = None
 
-        # Drop events originating from widgets being varied
-        models = [v[1] for v in values]
-        doc._held_events = [e for e in doc._held_events if e.model not in models]
-        events = record_events(doc)
-        changes |= events['content'] != '{}'
-        if events:
+    def add_states(index, results):
+        for result in results:
+            if pbar is not None:
+                pbar.update()
+            if result is None:
+                continue
+            path, events = result
+            sub_dict = state_dicts[index]
+            for k in path:
+                sub_dict = sub_dict[k]
             sub_dict.update(events)
 
-    if not changes:
-        return
+    for i, (_, _, group_values, states) in enumerate(groups):
+        add_states(i, [record_state(doc, group_values, key, config.safe_embed, binary)
+                       for key in states])
+    if pbar is not None:
+        pbar.close()
 
     for (w, _, _, _), v in zip(values, restore):
         try:
@@ -340,9 +565,18 @@ def embed_state(panel, model, doc, max_states=1000, max_opts=3,
         save_path = os.path.join(save_path, random_dir)
         if load_path is not None:
             load_path = os.path.join(load_path, random_dir)
-        state_dict = save_dict(state_dict, max_depth=len(values)-1,
-                               save_path=save_path, load_path=load_path)
 
-    state_model.update(json=json, state=state_dict, values=init_vals,
-                       widgets={m.ref['id']: i for i, (_, m, _, _) in enumerate(values)})
-    doc.add_root(state_model)
+    for (state_model, indexes, group_values, _), state_dict in zip(groups, state_dicts):
+        if not has_changes(state_dict, len(group_values)-1):
+            continue
+        shards = []
+        if binary:
+            state_dict, shards = save_shards(state_dict, len(group_values)-1,
+                                             save_path, load_path)
+        elif json:
+            state_dict = save_dict(state_dict, max_depth=len(group_values)-1,
+                                   save_path=save_path, load_path=load_path)
+        state_model.update(json=json and not binary, state=state_dict, shards=shards,
+                           values=[init_vals[i] for i in indexes],
+                           widgets={m.ref['id']: i for i, (_, m, _, _) in enumerate(group_values)})
+        doc.add_root(state_model)
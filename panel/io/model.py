@@ -3,11 +3,17 @@ Utilities for manipulating bokeh models.
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import copy
 import textwrap
 from contextlib import contextmanager
 
+import numpy as np
+
 from bokeh.document import Document
-from bokeh.document.events import ColumnDataChangedEvent
+from bokeh.document.events import (
+    ColumnDataChangedEvent, ColumnsPatchedEvent, ColumnsStreamedEvent,
+    ModelChangedEvent
+)
 from bokeh.models import Box, ColumnDataSource, Model
 from bokeh.protocol import Protocol
 
@@ -17,6 +23,89 @@ from .state import state
 # Public API
 #---------------------------------------------------------------------
 
+def _concat(old, new):
+    if isinstance(old, np.ndarray) and isinstance(new, np.ndarray):
+        return np.concatenate([old, new])
+    return list(old) + list(new)
+
+
+def _merge_hint(event, previous):
+    """
+    Merges a stream or patch event with the preceding event on the
+    same ColumnDataSource, returning None if they cannot be merged.
+    """
+    old, new = previous.hint, event.hint
+    if type(old) is not type(new):
+        return None
+    if isinstance(new, ColumnsStreamedEvent):
+        if old.rollover != new.rollover or set(old.data) != set(new.data):
+            return None
+        hint = ColumnsStreamedEvent(
+            new.document, new.column_source,
+            {col: _concat(old.data[col], new.data[col]) for col in new.data},
+            new.rollover, new.setter, new.callback_invoker
+        )
+    else:
+        patches = dict(old.patches)
+        for col, patch in new.patches.items():
+            patches[col] = list(patches.get(col, [])) + list(patch)
+        hint = ColumnsPatchedEvent(
+            new.document, new.column_source, patches, new.setter,
+            new.callback_invoker
+        )
+    merged = copy.copy(event)
+    merged.hint = hint
+    return merged
+
+
+def collapse_events(events):
+    """
+    Collapses a sequence of Document events so that only the latest
+    change to each property of a model is retained (at the position
+    of the first change, so models are added to the document before
+    they are modified) and consecutive streams or patches to the same
+    ColumnDataSource are merged into a single event. Changes to models
+    which have since been removed from the document are dropped. Runs
+    in linear time in the number of events.
+    """
+    queue, latest, sources = [], {}, {}
+    for event in events:
+        if not isinstance(event, ModelChangedEvent):
+            queue.append(event)
+            continue
+        hint = event.hint
+        if isinstance(hint, (ColumnsStreamedEvent, ColumnsPatchedEvent)):
+            # Streams and patches on a source must be applied in order
+            # so only the immediately preceding event may be merged
+            positions = sources.setdefault(hint.column_source.id, [])
+            merged = _merge_hint(event, queue[positions[-1]]) if positions else None
+            if merged is not None:
+                queue[positions.pop()] = None
+                event = merged
+            positions.append(len(queue))
+            queue.append(event)
+            continue
+        if isinstance(hint, ColumnDataChangedEvent):
+            key = (hint.column_source.id, 'data')
+            replaces = hint.cols is None
+        else:
+            key = (event.model.id, event.attr)
+            replaces = True
+        if key[1] == 'data':
+            # Replacing the data supersedes earlier streams and patches
+            for previous in sources.pop(key[0], []):
+                if replaces:
+                    queue[previous] = None
+        if key in latest and replaces:
+            queue[latest[key]] = event
+            continue
+        latest[key] = len(queue)
+        queue.append(event)
+    return [event for event in queue if event is not None and not (
+        isinstance(event, ModelChangedEvent) and event.document is not None
+        and event.model.id not in event.document._all_models)]
+
+
 def diff(doc, binary=True, events=None):
     """
     Returns a json diff required to update an existing plot with
@@ -28,14 +117,13 @@ def diff(doc, binary=True, events=None):
 
     # Filter ColumnDataChangedEvents which reference non-existing
     # columns, later event will include the changes
-    fixed_events = []
     for e in events:
         if (hasattr(e, 'hint') and isinstance(e.hint, ColumnDataChangedEvent)
             and e.hint.cols is not None):
             e.hint.cols = None
-        fixed_events.append(e)
-    msg = Protocol().create("PATCH-DOC", events, use_buffers=binary)
-    doc._held_events = [e for e in doc._held_events if e not in events]
+    msg = Protocol().create("PATCH-DOC", collapse_events(events), use_buffers=binary)
+    dispatched = set(events)
+    doc._held_events = [e for e in doc._held_events if e not in dispatched]
     return msg
 
 
@@ -62,9 +150,71 @@ def add_to_doc(obj, doc, hold=False):
     if doc._hold is None and hold:
         doc.hold()
 
+def _flush_held(held_docs):
+    """
+    Dispatches the events held on each Document as a single message,
+    either across the notebook comm or to all server connections.
+    """
+    from .notebook import push
+    from .server import _dispatch_events
+    for doc, (comm, held) in held_docs.items():
+        if comm is not None:
+            push(doc, comm)
+        elif doc.session_context:
+            _dispatch_events(doc)
+        if not held:
+            doc.unhold()
+
+
 @contextmanager
-def hold(doc, policy='combine'):
+def hold(doc=None, policy='combine'):
+    """
+    Context manager, which may also be used as a decorator, that
+    holds events on a Document. If no Document is supplied model
+    updates made across all Documents (including notebook comms)
+    are deferred until the outermost hold exits, at which point one
+    combined message is dispatched for each Document that was
+    updated, e.g.:
+
+        with pn.io.hold():
+            for widget in widgets:
+                widget.value = ...
+
+    On the server only updates made while the Document is unlocked,
+    e.g. in a callback, are combined. When a server Document is
+    supplied and no global hold, unlocked() block or other hold on
+    the Document is active its updates are dispatched as one message
+    when the hold exits, otherwise the enclosing context dispatches
+    them.
+
+    Arguments
+    ---------
+    doc: bokeh.document.Document (optional)
+      The Document to hold events on.
+    policy: str (default='combine')
+      The bokeh hold policy applied to the Document.
+    """
+    if doc is None:
+        held, held_docs = state._hold, state._held_docs
+        state._hold = True
+        if held_docs is None:
+            state._held_docs = {}
+        try:
+            yield
+        finally:
+            if held_docs is None:
+                held_docs, state._held_docs = state._held_docs, None
+                state._hold = held
+                _flush_held(held_docs)
+        return
+
     held = doc._hold
+    # Only the outermost batching context dispatches the events
+    session = (policy is not None and doc.session_context is not None and
+               held is None and not state._hold and
+               doc not in state._held_session_docs)
+    if session:
+        state._held_session_docs.add(doc)
     try:
         if policy is None:
             doc.unhold()
@@ -72,6 +222,9 @@ def hold(doc, policy='combine'):
             doc.hold(policy)
         yield
     finally:
+        if session:
+            state._held_session_docs.discard(doc)
+            _flush_held({doc: (None, True)})
         if held:
             doc._hold = held
         else:
@@ -5,6 +5,7 @@ inside the Jupyter notebook.
 from __future__ import absolute_import, division, unicode_literals
 
 import json
+import time
 import uuid
 
 from contextlib import contextmanager
@@ -54,6 +55,12 @@ def push(doc, comm, binary=True):
     """
     Pushes events stored on the document across the provided comm.
     """
+    if state._held_docs is not None:
+        # Events are pushed when the global hold is released
+        state._held_docs.setdefault(doc, (comm, True))
+        return
+    from .profile import record_message
+    start = time.perf_counter()
     msg = diff(doc, binary=binary)
     if msg is None:
         return
@@ -63,6 +70,7 @@ def push(doc, comm, binary=True):
     for header, payload in msg.buffers:
         comm.send(json.dumps(header))
         comm.send(buffers=[payload])
+    record_message('Document', 'push', start, msg, doc)
 
 DOC_NB_JS = _env.get_template("doc_nb_js.js")
 AUTOLOAD_NB_JS = _env.get_template("autoload_panel_js.js")
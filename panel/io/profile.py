@@ -0,0 +1,140 @@
+"""
+Implements low-overhead instrumentation of the reactive pipeline,
+recording the time spent in each phase of handling an event for each
+component when config.profile is enabled.
+"""
+from __future__ import absolute_import, division, unicode_literals
+
+import json
+import os
+import threading
+import time
+
+from collections import defaultdict
+from functools import wraps
+
+import numpy as np
+
+from bokeh.document import Document
+
+from ..config import config
+from .state import state
+
+_PERCENTILES = (50, 90, 99)
+
+# Phases currently being timed on each thread, used to avoid
+# recording a phase again when a subclass override calls super
+_active = threading.local()
+
+
+def _record(name, phase, start, end, size=None, doc=None):
+    """
+    Appends a timing to the ring buffer on the global state.
+    """
+    thread = threading.current_thread()
+    doc = state.curdoc if doc is None else doc
+    state._timings.append((
+        name, phase, start, end-start, size,
+        thread.ident if thread else None, None if doc is None else id(doc)
+    ))
+
+
+def _msg_size(msg):
+    """
+    Returns the number of bytes in all the frames of a bokeh message.
+    """
+    size = len(msg.header_json) + len(msg.metadata_json) + len(msg.content_json)
+    for header, payload in msg.buffers:
+        size += len(json.dumps(header) if isinstance(header, dict) else header)
+        size += len(payload)
+    return size
+
+
+def record_message(name, phase, start, msg, doc=None):
+    """
+    Records the time since start and the size of a message sent to
+    the frontend when config.profile is set.
+    """
+    if config.profile and msg is not None:
+        _record(name, phase, start, time.perf_counter(), _msg_size(msg), doc)
+
+
+def profiled(phase):
+    """
+    Decorator which records the duration of a method call on the
+    component under the supplied phase when config.profile is set.
+    Nested calls of the same phase on the same object, e.g. an
+    override calling the super method, are only recorded once.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapped(self, *args, **kwargs):
+            if not config.profile:
+                return method(self, *args, **kwargs)
+            stack = _active.__dict__.setdefault('stack', set())
+            key = (id(self), phase)
+            if key in stack:
+                return method(self, *args, **kwargs)
+            stack.add(key)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                stack.discard(key)
+                doc = next((arg for arg in args if isinstance(arg, Document)), None)
+                _record(type(self).__name__, phase, start, end, doc=doc)
+        return wrapped
+    return decorator
+
+
+def timing_stats():
+    """
+    Aggregates the recorded timings by component and phase, returning
+    the count, total, mean, percentiles and maximum duration (in
+    milliseconds) and the mean message size where one was recorded.
+    """
+    durations, sizes = defaultdict(list), defaultdict(list)
+    for name, phase, _, duration, size, _, _ in list(state._timings):
+        durations[(name, phase)].append(duration*1000)
+        if size is not None:
+            sizes[(name, phase)].append(size)
+    stats = {}
+    for key, values in durations.items():
+        values = np.asarray(values)
+        info = {'count': len(values), 'total': values.sum(),
+                'mean': values.mean(), 'max': values.max()}
+        for p, v in zip(_PERCENTILES, np.percentile(values, _PERCENTILES)):
+            info['p%d' % p] = v
+        if key in sizes:
+            info['size'] = np.mean(sizes[key])
+        stats[key] = info
+    return stats
+
+
+def trace_events(doc=None):
+    """
+    Returns the recorded timings, optionally only those of a single
+    Document, in the Chrome trace event format.
+    """
+    pid = os.getpid()
+    events = []
+    for name, phase, start, duration, size, tid, doc_id in list(state._timings):
+        if doc is not None and doc_id != id(doc):
+            continue
+        event = {'name': '%s.%s' % (name, phase), 'cat': phase, 'ph': 'X',
+                 'ts': start*1e6, 'dur': duration*1e6, 'pid': pid,
+                 'tid': tid, 'args': {'component': name}}
+        if size is not None:
+            event['args']['size'] = size
+        events.append(event)
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def dump_trace(filename, doc=None):
+    """
+    Writes the recorded timings to a JSON file which can be loaded
+    in chrome://tracing or other trace viewers.
+    """
+    with open(filename, 'w') as f:
+        json.dump(trace_events(doc), f)
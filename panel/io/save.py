@@ -71,7 +71,7 @@ def save_png(model, filename, template=None, template_variables=None):
 def save(panel, filename, title=None, resources=None, template=None,
          template_variables=None, embed=False, max_states=1000,
          max_opts=3, embed_json=False, json_prefix='', save_path='./',
-         load_path=None, progress=True):
+         load_path=None, progress=True, embed_format=None):
     """
     Saves Panel objects to file.
 
@@ -105,6 +105,9 @@ def save(panel, filename, title=None, resources=None, template=None,
       The path or URL the json files will be loaded from.
     progress: boolean (default=True)
       Whether to report progress
+    embed_format: str (default=None)
+      Whether to export json files per state ('json') or compressed
+      binary shards ('shards'), defaults to config.embed_format.
     """
     from ..pane import PaneBase
     from ..template import Template
@@ -131,7 +134,8 @@ def save(panel, filename, title=None, resources=None, template=None,
             if embed:
                 embed_state(
                     panel, model, doc, max_states, max_opts, embed_json,
-                    json_prefix, save_path, load_path, progress
+                    json_prefix, save_path, load_path, progress,
+                    embed_format=embed_format
                 )
             else:
                 add_to_doc(model, doc, True)
@@ -3,22 +3,33 @@ Utilities for creating bokeh Server instances.
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import atexit
+import datetime
+import gzip
+import hashlib
 import os
+import shutil
 import signal
 import sys
 import threading
+import time
 import uuid
 
+from collections import deque
 from contextlib import contextmanager
 from functools import partial
 from types import FunctionType
 
+import param
+
 from bokeh.document.events import ModelChangedEvent
-from bokeh.server.server import Server
 from tornado.websocket import WebSocketHandler
-from tornado.web import RequestHandler
+from tornado.ioloop import IOLoop, PeriodicCallback
+from tornado.process import task_id
+from tornado.web import HTTPError, RequestHandler, StaticFileHandler
 from tornado.wsgi import WSGIContainer
 
+from .model import collapse_events
 from .state import state
 
 
@@ -28,6 +39,28 @@ from .state import state
 
 INDEX_HTML = os.path.join(os.path.dirname(__file__), '..', '_templates', "index.html")
 
+DOWNLOAD_ROUTE = '/panel_download/'
+
+# Size of the chunks written by the DownloadHandler and AssetHandler
+DOWNLOAD_CHUNK_SIZE = 64*1024
+
+ASSET_ROUTE = '/panel_asset/'
+
+# Asset mime types which benefit from gzip compression
+COMPRESSIBLE_TYPES = ('image/svg+xml', 'audio/wav', 'text/')
+
+def _content_disposition(filename):
+    """
+    Returns an attachment Content-Disposition header for the filename,
+    with an ASCII fallback and the RFC 5987 encoded UTF-8 filename.
+    """
+    from urllib.parse import quote
+    fallback = filename.encode('ascii', 'replace').decode('ascii')
+    fallback = fallback.replace('\\', '_').replace('"', '_')
+    return 'attachment; filename="%s"; filename*=UTF-8\'\'%s' % (
+        fallback, quote(filename, safe=''))
+
+
 def _origin_url(url):
     if url.startswith("http"):
         url = url.split("//")[1]
@@ -40,11 +73,221 @@ def _server_url(url, port):
     else:
         return 'http://%s:%d%s' % (url.split(':')[0], port, "/")
 
+def _dispatch_msg(socket, msg):
+    """
+    Writes all the frames of a bokeh protocol message to the socket.
+    """
+    WebSocketHandler.write_message(socket, msg.header_json)
+    WebSocketHandler.write_message(socket, msg.metadata_json)
+    WebSocketHandler.write_message(socket, msg.content_json)
+    for header, payload in msg._buffers:
+        WebSocketHandler.write_message(socket, header)
+        WebSocketHandler.write_message(socket, payload, binary=True)
+
+
+def _dispatch_events(doc, old_events=()):
+    """
+    Dispatches the ModelChangedEvents held on the Document, which
+    are not in old_events, as a single PATCH-DOC message to all
+    connections and removes the delivered events.
+    """
+    from .profile import record_message
+    start = time.perf_counter()
+    connections = doc.session_context.session._subscribed_connections
+    held = doc._held_events
+    dispatch = [
+        event for event in held if isinstance(event, ModelChangedEvent)
+        and event not in old_events
+    ]
+    msg, undelivered = None, False
+    for conn in connections:
+        socket = conn._socket
+        if hasattr(socket, 'write_lock') and socket.write_lock._block._value == 0:
+            state._locks.add(socket)
+        if socket in state._locks or not hasattr(socket, 'write_message'):
+            undelivered = True
+            continue
+        elif not dispatch:
+            continue
+        # All connections are subscribed to the same Document so
+        # the combined message only has to be serialized once
+        if msg is None:
+            msg = conn.protocol.create('PATCH-DOC', collapse_events(dispatch))
+        _dispatch_msg(socket, msg)
+    record_message('Document', 'dispatch', start, msg, doc)
+    if not connections:
+        events = []
+    elif undelivered:
+        events = list(held)
+    else:
+        dispatched = set(dispatch)
+        events = [event for event in held if event not in dispatched]
+    doc._held_events = events
+
+
+class _SessionPool(object):
+    """
+    Pool of app instances, i.e. the objects returned by evaluating an
+    app function, which are built ahead of demand and handed to new
+    sessions. Instances are built on the IOLoop since building an app
+    may modify global state, e.g. caches on Panel classes, which means
+    that a build blocks all other sessions while it runs. The pool is
+    therefore only refilled once no instance was requested for
+    idle_delay seconds, one instance per IOLoop callback, and the
+    refill pauses whenever a new session arrives. Pooling thus speeds
+    up the first render of sessions arriving after a quiet period,
+    while bursts of sessions beyond the pool size build on demand.
+
+    Only plain functions passed to pn.serve or get_server are pooled,
+    apps served with `panel serve` are evaluated per session by bokeh.
+    """
+
+    # Seconds without new sessions after which the pool is refilled
+    idle_delay = 1
+
+    def __init__(self, app, size, loop=None):
+        self.app = app
+        self.size = size
+        self.loop = loop
+        self.hits = 0
+        self.misses = 0
+        self._instances = deque()
+        self._timeout = None
+        self._lock = threading.Lock()
+
+    def _build(self):
+        from ..template import Template
+        from ..pane import panel as as_panel
+        instance = self.app()
+        return instance if isinstance(instance, Template) else as_panel(instance)
+
+    def _build_instance(self):
+        try:
+            instance = self._build()
+        except Exception as e:
+            param.main.warning('Building app instance for session pool '
+                               'failed with: %s' % e)
+            return False
+        with self._lock:
+            self._instances.append(instance)
+        return True
+
+    def _schedule_fill(self, delay):
+        if self._timeout is not None:
+            self.loop.remove_timeout(self._timeout)
+        self._timeout = self.loop.call_later(delay, self.fill)
+
+    def fill(self):
+        """
+        Builds one missing instance and schedules building the next
+        one on a later IOLoop callback until the pool is full.
+        """
+        self._timeout = None
+        with self._lock:
+            missing = self.size - len(self._instances)
+        if missing > 0 and self._build_instance() and missing > 1:
+            self._schedule_fill(0)
+
+    def get(self):
+        """
+        Returns a pre-built app instance if one is available, building
+        one on demand otherwise.
+        """
+        with self._lock:
+            instance = self._instances.popleft() if self._instances else None
+            if instance is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if instance is None:
+            instance = self._build()
+        # Postpones the refill until no new sessions arrive
+        self.loop.add_callback(self._schedule_fill, self.idle_delay)
+        return instance
+
+    def info(self):
+        """
+        Returns a dictionary summarizing the pool hits, misses and size.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': self.size,
+                    'available': len(self._instances)}
+
+
+def _remove_cache(path, pid):
+    if os.getpid() == pid:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _share_cache():
+    """
+    Replaces the process-local state.cache with a DiskCache, which
+    must happen before forking so that all worker processes share
+    the same directory. The directory is removed when the parent
+    process exits.
+    """
+    from .cache import DiskCache
+    if isinstance(state.cache, DiskCache):
+        return
+    cache = DiskCache()
+    cache.update(state.cache)
+    state.cache = cache
+    atexit.register(_remove_cache, cache.path, os.getpid())
+
+
+def _reap_sessions(loop):
+    """
+    Closes the connections of all sessions served on the IOLoop which
+    exceeded the idle or absolute session TTL and requests their
+    expiration. The sessions are then destroyed by the regular bokeh
+    session cleanup, which triggers the cleanup of all panel
+    components attached to them.
+    """
+    from ..config import config
+    now = time.time()
+    for doc, activity in list(state._session_activity.items()):
+        session = doc.session_context._session if doc.session_context else None
+        if (activity['loop'] is not loop or session is None or
+            session.expiration_requested):
+            continue
+        idle = config.session_idle_ttl
+        ttl = config.session_ttl
+        if ((idle is not None and (now - activity['last_activity']) > idle) or
+            (ttl is not None and (now - activity['created']) > ttl)):
+            for connection in list(session._subscribed_connections):
+                connection._socket.close()
+            session.request_expiration()
+
+
+def _start_reaper():
+    """
+    Starts checking for expired sessions on the current IOLoop if a
+    session TTL is configured. Called whenever a session is created,
+    so that sessions are reaped whether the app was launched with
+    pn.serve or with `panel serve`.
+    """
+    from ..config import config
+    loop = IOLoop.current()
+    ttls = [t for t in (config.session_idle_ttl, config.session_ttl) if t is not None]
+    if not ttls or loop in state._reapers:
+        return
+    # Check for expired sessions a few times per TTL
+    reaper = PeriodicCallback(partial(_reap_sessions, loop), max(1000, min(ttls)*250))
+    state._reapers[loop] = reaper
+    reaper.start()
+
+
 def _eval_panel(panel, server_id, title, location, doc):
     from ..template import Template
     from ..pane import panel as as_panel
 
-    if isinstance(panel, FunctionType):
+    if doc.session_context:
+        state._init_session(doc)
+        state._doc_servers[doc] = server_id
+
+    if isinstance(panel, _SessionPool):
+        panel = panel.get()
+    elif isinstance(panel, FunctionType):
         panel = panel()
     if isinstance(panel, Template):
         return panel._modify_doc(server_id, title, doc, location)
@@ -60,48 +303,81 @@ def unlocked():
     """
     Context manager which unlocks a Document and dispatches
     ModelChangedEvents triggered in the context body to all sockets
-    on current sessions.
+    on current sessions. All events are combined into a single
+    PATCH-DOC message which is serialized once and sent to every
+    subscribed connection.
     """
     curdoc = state.curdoc
     if curdoc is None or curdoc.session_context is None:
         yield
         return
-    connections = curdoc.session_context.session._subscribed_connections
+
+    if curdoc in state._held_session_docs:
+        # Events are dispatched when the Document hold is released
+        yield
+        return
+
+    if state._held_docs is not None:
+        # Events are dispatched when the global hold is released
+        if curdoc not in state._held_docs:
+            state._held_docs[curdoc] = (None, curdoc._hold is not None)
+            if curdoc._hold is None:
+                curdoc.hold()
+        yield
+        return
 
     hold = curdoc._hold
     if hold:
-        old_events = list(curdoc._held_events)
+        old_events = set(curdoc._held_events)
     else:
-        old_events = []
+        old_events = set()
         curdoc.hold()
+    # Nested unlocked() blocks leave the dispatch to this one
+    state._held_session_docs.add(curdoc)
     try:
         yield
-        events = []
-        for conn in connections:
-            socket = conn._socket
-            if hasattr(socket, 'write_lock') and socket.write_lock._block._value == 0:
-                state._locks.add(socket)
-            locked = socket in state._locks
-            for event in curdoc._held_events:
-                if (isinstance(event, ModelChangedEvent) and event not in old_events
-                    and hasattr(socket, 'write_message') and not locked):
-                    msg = conn.protocol.create('PATCH-DOC', [event])
-                    WebSocketHandler.write_message(socket, msg.header_json)
-                    WebSocketHandler.write_message(socket, msg.metadata_json)
-                    WebSocketHandler.write_message(socket, msg.content_json)
-                    for header, payload in msg._buffers:
-                        WebSocketHandler.write_message(socket, header)
-                        WebSocketHandler.write_message(socket, payload, binary=True)
-                elif event not in events:
-                    events.append(event)
-        curdoc._held_events = events
+        _dispatch_events(curdoc, old_events)
     finally:
+        state._held_session_docs.discard(curdoc)
         if not hold:
             curdoc.unhold()
 
 
+class _DocumentAwaitable(object):
+    """
+    Wraps an awaitable, e.g. a coroutine callback, making the Document
+    the current document only while each synchronous step between two
+    await points runs and dispatching the events triggered by the step
+    as a single message. While the awaitable is suspended the global
+    state is untouched, so concurrently running callbacks of other
+    sessions see their own Document.
+    """
+
+    def __init__(self, awaitable, doc):
+        self._awaitable = awaitable
+        self._doc = doc
+
+    def __await__(self):
+        steps = self._awaitable.__await__()
+        value, error = None, None
+        while True:
+            with state._unblock(self._doc), unlocked():
+                try:
+                    if error is None:
+                        future = steps.send(value)
+                    else:
+                        future = steps.throw(error)
+                except StopIteration as e:
+                    return e.value
+            try:
+                value, error = (yield future), None
+            except BaseException as e:
+                value, error = None, e
+
+
 def serve(panels, port=0, websocket_origin=None, loop=None, show=True,
-          start=True, title=None, verbose=True, location=True, **kwargs):
+          start=True, title=None, verbose=True, location=True,
+          nthreads=None, num_procs=1, **kwargs):
     """
     Allows serving one or more panel objects on a single server.
     The panels argument should be either a Panel object or a function
@@ -137,11 +413,20 @@ def serve(panels, port=0, websocket_origin=None, loop=None, show=True,
     location : boolean or panel.io.location.Location
       Whether to create a Location component to observe and
       set the URL location.
+    nthreads: int (optional, default=None)
+      Number of threads used to process events received from the
+      frontend by this server (overrides config.nthreads)
+    num_procs: int (optional, default=1)
+      Number of worker processes to fork, which share the listening
+      socket and a DiskCache backing state.cache (0 uses one process
+      per CPU core). The DiskCache pickles every value, so it cannot
+      hold unpicklable objects and in-place modifications are not
+      shared; the pn.cache memo remains local to each process.
     kwargs: dict
       Additional keyword arguments to pass to Server instance
     """
     return get_server(panels, port, websocket_origin, loop, show, start,
-                      title, verbose, location, **kwargs)
+                      title, verbose, location, nthreads, num_procs, **kwargs)
 
 
 class ProxyFallbackHandler(RequestHandler):
@@ -161,9 +446,130 @@ class ProxyFallbackHandler(RequestHandler):
         self.on_finish()
 
 
+class DownloadHandler(RequestHandler):
+    """
+    Streams files registered by FileDownload widgets. Each download
+    is registered under a random token, which may only be used once
+    and only together with the id of the session that registered it.
+    """
+
+    async def get(self, token):
+        session_id = self.get_argument('session', None)
+        with state._download_lock:
+            download = state._downloads.get(token)
+            if download is None or download[3] != session_id:
+                raise HTTPError(404)
+            del state._downloads[token]
+        fileobj, filename, mime, _ = download
+        self.set_header('Content-Type', mime)
+        self.set_header('Content-Disposition', _content_disposition(filename))
+        if isinstance(fileobj, str):
+            stat = os.stat(fileobj)
+            etag = hashlib.md5(('%s-%s-%s' % (
+                fileobj, stat.st_mtime, stat.st_size)).encode('utf-8')).hexdigest()
+            self.set_header('Content-Length', stat.st_size)
+            self.set_header('Etag', '"%s"' % etag)
+            with open(fileobj, 'rb') as f:
+                await self._stream(iter(partial(f.read, DOWNLOAD_CHUNK_SIZE), b''))
+        elif hasattr(fileobj, 'read'):
+            empty = fileobj.read(0)
+            if isinstance(empty, bytes) and fileobj.seekable():
+                pos = fileobj.tell()
+                size = fileobj.seek(0, os.SEEK_END) - pos
+                fileobj.seek(pos)
+                self.set_header('Content-Length', size)
+            await self._stream(iter(partial(fileobj.read, DOWNLOAD_CHUNK_SIZE), empty))
+        else:
+            await self._stream(fileobj)
+
+    async def _stream(self, chunks):
+        for chunk in chunks:
+            if not isinstance(chunk, bytes):
+                chunk = chunk.encode('utf-8')
+            self.write(chunk)
+            await self.flush()
+
+
+class AssetHandler(StaticFileHandler):
+    """
+    Serves content addressed assets registered by media and image
+    panes. Since the URL changes whenever the content changes assets
+    may be cached indefinitely. Conditional and HTTP Range requests
+    (required for seeking in audio and video) are handled by the
+    StaticFileHandler, compressible content is gzipped.
+    """
+
+    def initialize(self):
+        super(AssetHandler, self).initialize(path='')
+
+    @classmethod
+    def get_absolute_path(cls, root, path):
+        return path
+
+    def validate_absolute_path(self, root, absolute_path):
+        asset = state._assets.get(absolute_path)
+        if asset is None:
+            raise HTTPError(404)
+        # Hold on to the asset in case it is evicted while streaming
+        self._asset = asset
+        return absolute_path
+
+    async def get(self, path, include_body=True):
+        asset = state._assets.get(path)
+        if (asset is not None and asset[1].startswith(COMPRESSIBLE_TYPES) and
+            'Range' not in self.request.headers and
+            'gzip' in self.request.headers.get('Accept-Encoding', '')):
+            self.path = self.absolute_path = self.validate_absolute_path(self.root, path)
+            self.modified = self.get_modified_time()
+            self.set_headers()
+            if self.should_return_304():
+                self.set_status(304)
+                return
+            content = self.get_content(path)
+            if not isinstance(content, bytes):
+                content = b''.join(content)
+            data = gzip.compress(content)
+            self.set_header('Content-Encoding', 'gzip')
+            self.set_header('Vary', 'Accept-Encoding')
+            self.set_header('Content-Length', len(data))
+            if include_body:
+                self.write(data)
+            return
+        await super(AssetHandler, self).get(path, include_body)
+
+    def get_content(self, abspath, start=None, end=None):
+        obj, _ = self._asset
+        if isinstance(obj, str):
+            return super(AssetHandler, self).get_content(obj, start, end)
+        return obj[start:end]
+
+    def compute_etag(self):
+        # Assets are indexed by the hash of their content
+        return '"%s"' % self.absolute_path
+
+    def get_content_size(self):
+        obj, _ = self._asset
+        return os.path.getsize(obj) if isinstance(obj, str) else len(obj)
+
+    def get_modified_time(self):
+        obj, _ = self._asset
+        # In-memory assets are immutable, so they were never modified
+        mtime = os.path.getmtime(obj) if isinstance(obj, str) else 0
+        return datetime.datetime.utcfromtimestamp(int(mtime))
+
+    def get_content_type(self):
+        return self._asset[1]
+
+    def get_cache_time(self, path, modified, mime_type):
+        return self.CACHE_MAX_AGE
+
+    def set_extra_headers(self, path):
+        self.set_header('Cache-Control', 'public, max-age=%d, immutable' % self.CACHE_MAX_AGE)
+
+
 def get_server(panel, port=0, websocket_origin=None, loop=None,
                show=False, start=False, title=None, verbose=False,
-               location=True, **kwargs):
+               location=True, nthreads=None, num_procs=1, **kwargs):
     """
     Returns a Server instance with this panel attached as the root
     app.
@@ -195,6 +601,15 @@ def get_server(panel, port=0, websocket_origin=None, loop=None,
     location : boolean or panel.io.location.Location
       Whether to create a Location component to observe and
       set the URL location.
+    nthreads: int (optional, default=None)
+      Number of threads used to process events received from the
+      frontend by this server (overrides config.nthreads)
+    num_procs: int (optional, default=1)
+      Number of worker processes to fork, which share the listening
+      socket and a DiskCache backing state.cache (0 uses one process
+      per CPU core). The DiskCache pickles every value, so it cannot
+      hold unpicklable objects and in-place modifications are not
+      shared; the pn.cache memo remains local to each process.
     kwargs: dict
       Additional keyword arguments to pass to Server instance
 
@@ -203,10 +618,22 @@ def get_server(panel, port=0, websocket_origin=None, loop=None,
     server : bokeh.server.server.Server
       Bokeh Server instance running this panel
     """
-    from tornado.ioloop import IOLoop
+    from bokeh.server.server import Server
+    from ..config import config
 
     server_id = kwargs.pop('server_id', uuid.uuid4().hex)
+    if nthreads is not None:
+        state._server_nthreads[server_id] = nthreads
+
+    def _pooled(app):
+        if config.session_pool_size and isinstance(app, FunctionType):
+            return _SessionPool(app, config.session_pool_size)
+        return app
     kwargs['extra_patterns'] = extra_patterns = kwargs.get('extra_patterns', [])
+    extra_patterns.append((DOWNLOAD_ROUTE+'(.*)', DownloadHandler))
+    state._download_route = DOWNLOAD_ROUTE
+    extra_patterns.append((ASSET_ROUTE+'(.*)', AssetHandler))
+    state._asset_route = ASSET_ROUTE
     if isinstance(panel, dict):
         apps = {}
         for slug, app in panel.items():
@@ -222,15 +649,19 @@ def get_server(panel, port=0, websocket_origin=None, loop=None,
                     extra_patterns.append(('^'+slug+'.*', ProxyFallbackHandler,
                                            dict(fallback=wsgi, proxy=slug)))
                     continue
-            apps[slug] = partial(_eval_panel, app, server_id, title, location)
+            apps[slug] = partial(_eval_panel, _pooled(app), server_id, title, location)
     else:
-        apps = {'/': partial(_eval_panel, panel, server_id, title, location)}
+        apps = {'/': partial(_eval_panel, _pooled(panel), server_id, title, location)}
 
     opts = dict(kwargs)
+    if num_procs != 1:
+        # The IOLoop of each worker is created after forking
+        _share_cache()
+        opts['num_procs'] = num_procs
     if loop:
         loop.make_current()
         opts['io_loop'] = loop
-    else:
+    elif num_procs == 1:
         opts['io_loop'] = IOLoop.current()
 
     if 'index' not in opts:
@@ -241,14 +672,22 @@ def get_server(panel, port=0, websocket_origin=None, loop=None,
             websocket_origin = [websocket_origin]
         opts['allow_websocket_origin'] = websocket_origin
 
+    pools = {slug: app.args[0] for slug, app in apps.items()
+             if isinstance(app.args[0], _SessionPool)}
     server = Server(apps, port=port, **opts)
-    if verbose:
+    if verbose and (num_procs == 1 or task_id() == 0):
         address = server.address or 'localhost'
         print("Launching server at http://%s:%s" % (address, server.port))
 
     state._servers[server_id] = (server, panel, [])
 
-    if show:
+    for pool in pools.values():
+        pool.loop = server.io_loop
+        server.io_loop.add_callback(pool.fill)
+    if pools:
+        state._session_pools[server_id] = pools
+
+    if show and (num_procs == 1 or task_id() == 0):
         def show_callback():
             server.show('/')
         server.io_loop.add_callback(show_callback)
@@ -282,7 +721,11 @@ class StoppableThread(threading.Thread):
         self._stop_event = threading.Event()
         self.io_loop = io_loop
         self._cb = ioloop.PeriodicCallback(self._check_stopped, timeout)
-        self._cb.start()
+        if io_loop is None:
+            self._cb.start()
+        else:
+            # Start the callback on the loop the thread will run
+            io_loop.add_callback(self._cb.start)
 
     def _check_stopped(self):
         if self.stopped:
@@ -296,6 +739,7 @@ class StoppableThread(threading.Thread):
             target, args, kwargs = self._Thread__target, self._Thread__args, self._Thread__kwargs
         if not target:
             return
+        from bokeh.server.server import Server
         bokeh_server = None
         try:
             bokeh_server = target(*args, **kwargs)
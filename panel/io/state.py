@@ -3,15 +3,37 @@ Various utilities for recording and embedding state in a rendered app.
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import hashlib
+import logging
+import os
+import sys
 import threading
+import time
 
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from weakref import WeakKeyDictionary, WeakSet
 
 import param
 
 from bokeh.document import Document
 from bokeh.io import curdoc as _curdoc
+from bokeh.models import ColumnDataSource
 from pyviz_comms import CommManager as _CommManager
+from tornado.ioloop import IOLoop
+
+
+def _nbytes(obj):
+    """
+    Approximates the number of bytes held by a column of data.
+    """
+    if hasattr(obj, 'nbytes'):
+        return obj.nbytes
+    elif isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(sys.getsizeof(v) for v in obj)
+    return sys.getsizeof(obj)
 
 
 class _state(param.Parameterized):
@@ -20,9 +42,13 @@ class _state(param.Parameterized):
     apps to indicate their state to a user.
     """
 
-    cache = param.Dict(default={}, doc="""
+    cache = param.ClassSelector(default={}, class_=MutableMapping, doc="""
        Global location you can use to cache large datasets or expensive computation results
-       across multiple client sessions for a given server.""") 
+       across multiple client sessions for a given server. When serving with multiple
+       processes this is a DiskCache shared between the processes, which pickles every
+       value, so only picklable values can be stored and in-place modifications of a
+       value are not shared unless it is assigned again. The pn.cache memo is not
+       backed by this store and remains local to each process.""")
 
     webdriver = param.Parameter(default=None, doc="""
       Selenium webdriver used to export bokeh models to pngs.""")
@@ -34,11 +60,58 @@ class _state(param.Parameterized):
     # Whether to hold comm events
     _hold = False
 
+    # Documents (with their comm and whether they were already held)
+    # updated while a global pn.io.hold is active
+    _held_docs = None
+
+    # Server Documents held by an unlocked() block or pn.io.hold(doc),
+    # whose events are dispatched when the outermost one is released
+    _held_session_docs = set()
+
     # Used to ensure that events are not scheduled from the wrong thread
     _thread_id = None
 
+    # Thread local storage of the Document being processed on a thread
+    _local = threading.local()
+
+    # Executors (with their size) used to process events on threads,
+    # indexed by server id (None for servers using config.nthreads)
+    _thread_pools = {}
+
+    # Number of threads requested for each server by server id
+    _server_nthreads = {}
+
+    # The server id of each Document served by pn.serve or get_server
+    _doc_servers = WeakKeyDictionary()
+
+    # Per-Document task queues used to process events on threads
+    _doc_queues = WeakKeyDictionary()
+    _queue_lock = threading.Lock()
+
     _comm_manager = _CommManager
 
+    # Memoization caches created by as_cached and pn.cache
+    _memo_cache = {}
+    _session_caches = WeakKeyDictionary()
+    _cache_lock = threading.Lock()
+
+    # Downloads registered by FileDownload widgets indexed by token,
+    # each bound to the id of the session which registered it
+    _downloads = {}
+    _download_lock = threading.Lock()
+
+    # Route of the DownloadHandler if it was registered on the server
+    _download_route = None
+
+    # Content addressed assets served by the AssetHandler indexed by hash
+    _assets = OrderedDict()
+    _asset_hashes = {}
+    _asset_lock = threading.Lock()
+    _asset_route = None
+
+    # Maximum total size (in bytes) of in-memory assets retained
+    _asset_memory_limit = 256*1024*1024
+
     # Locations
     _location = None # Global location, e.g. for notebook context
     _locations = WeakKeyDictionary() # Server locations indexed by document
@@ -52,12 +125,27 @@ class _state(param.Parameterized):
     # An index of all currently active servers
     _servers = {}
 
+    # Pools of pre-built app instances indexed by server id and slug
+    _session_pools = {}
+
+    # Creation and last activity time (and IOLoop) of server sessions by document
+    _session_activity = WeakKeyDictionary()
+
+    # Callbacks closing expired sessions indexed by IOLoop
+    _reapers = WeakKeyDictionary()
+
     # Jupyter display handles
     _handles = {}
 
     # Stores a set of locked Websockets, reset after every change event
     _locks = WeakSet()
 
+    # Number of model property updates skipped since they were unchanged
+    _suppressed_updates = 0
+
+    # Ring buffer of the timings recorded when config.profile is enabled
+    _timings = deque(maxlen=10000)
+
     def __repr__(self):
         server_info = []
         for server, panel, docs in self._servers.values():
@@ -68,6 +156,116 @@ class _state(param.Parameterized):
             return "state(servers=[])"
         return "state(servers=[\n  {}\n])".format(",\n  ".join(server_info))
 
+    @property
+    def timing_stats(self):
+        """
+        Returns a dictionary of aggregated timings (in milliseconds)
+        indexed by component and phase, recorded when config.profile
+        is enabled.
+        """
+        from .profile import timing_stats
+        return timing_stats()
+
+    def dump_trace(self, filename, doc=None):
+        """
+        Writes the timings recorded when config.profile is enabled to
+        a Chrome trace event JSON file.
+
+        Arguments
+        ---------
+        filename: str
+          The file to write the trace to.
+        doc: bokeh.document.Document (optional, default=None)
+          If supplied only the timings of this session are written.
+        """
+        from .profile import dump_trace
+        dump_trace(filename, doc)
+
+    @property
+    def suppressed_updates(self):
+        """
+        Number of model property updates which were skipped because
+        the value matched the value last sent to the model.
+        """
+        return self._suppressed_updates
+
+    @property
+    def session_pool_info(self):
+        """
+        Returns a dictionary of the hits, misses and size of the
+        session pools of each server, indexed by server id and slug.
+        """
+        return {server_id: {slug: pool.info() for slug, pool in pools.items()}
+                for server_id, pools in self._session_pools.items()}
+
+    @property
+    def session_info(self):
+        """
+        Returns a list of dictionaries summarizing each live server
+        session, including the number of models and views, the
+        approximate number of bytes held by ColumnDataSources and
+        the creation and last activity time.
+        """
+        info = []
+        for doc, activity in list(self._session_activity.items()):
+            models = list(doc._all_models.values())
+            cds_bytes = sum(
+                _nbytes(column) for model in models if isinstance(model, ColumnDataSource)
+                for column in model.data.values()
+            )
+            info.append(dict(
+                id=doc.session_context.id if doc.session_context else None,
+                models=len(models), cds_bytes=cds_bytes,
+                views=len([v for v in self._views.values() if v[2] is doc]),
+                created=activity['created'], last_activity=activity['last_activity']
+            ))
+        return info
+
+    def _server_prefix(self, doc):
+        """
+        Returns the URL prefix of the server the Document is served
+        on, which has to be prepended to the routes Panel adds.
+        """
+        server_id = self._doc_servers.get(doc)
+        if server_id not in self._servers:
+            return ''
+        prefix = (self._servers[server_id][0].prefix or '').strip('/')
+        return '/' + prefix if prefix else ''
+
+    def _init_session(self, doc):
+        """
+        Starts tracking the activity of a server session, i.e. any
+        property change or event received from the frontend.
+        """
+        from .server import _start_reaper
+        if doc in self._session_activity:
+            return
+        now = time.time()
+        self._session_activity[doc] = {
+            'created': now, 'last_activity': now, 'loop': IOLoop.current()
+        }
+        _start_reaper()
+        doc.on_change(self._session_changed)
+        doc.on_message('bokeh_event', lambda msg: self._record_activity(doc))
+        doc.on_session_destroyed(self._session_destroyed)
+
+    def _record_activity(self, doc):
+        activity = self._session_activity.get(doc)
+        if activity is not None:
+            activity['last_activity'] = time.time()
+
+    def _session_changed(self, event):
+        # Only events originating from a client connection have a setter
+        if event.setter is not None:
+            self._record_activity(event.document)
+
+    def _session_destroyed(self, session_context):
+        self._session_activity.pop(session_context._document, None)
+        with self._download_lock:
+            for token, download in list(self._downloads.items()):
+                if download[3] == session_context.id:
+                    del self._downloads[token]
+
     def kill_all_servers(self):
         """Stop all servers and clear them from the current state."""
         for server_id in self._servers:
@@ -76,6 +274,162 @@ class _state(param.Parameterized):
             except AssertionError:  # can't stop a server twice
                 pass
         self._servers = {}
+        self._session_pools = {}
+        for server_id in list(self._server_nthreads):
+            self._server_nthreads.pop(server_id)
+            pool = self._thread_pools.pop(server_id, None)
+            if pool is not None:
+                pool[0].shutdown(wait=False)
+
+    def _nthreads(self, doc):
+        """
+        Returns the number of threads used to process events for the
+        Document, as requested for its server or set on config.
+        """
+        from ..config import config
+        server_id = self._doc_servers.get(doc)
+        return self._server_nthreads.get(server_id, config.nthreads)
+
+    def _execute(self, doc, fn):
+        """
+        Executes the function on the thread pool of the server the
+        Document belongs to, ensuring that all functions submitted for
+        a particular Document are executed in order.
+        """
+        loop = IOLoop.current()
+        server_id = self._doc_servers.get(doc)
+        if server_id not in self._server_nthreads:
+            server_id = None
+        nthreads = self._nthreads(doc)
+        pool, size = self._thread_pools.get(server_id, (None, None))
+        if pool is None or size != nthreads:
+            if pool is not None:
+                pool.shutdown(wait=False)
+            pool = ThreadPoolExecutor(max_workers=nthreads)
+            self._thread_pools[server_id] = (pool, nthreads)
+        with self._queue_lock:
+            queue = self._doc_queues.get(doc)
+            if queue is None:
+                self._doc_queues[doc] = queue = deque()
+            queue.append(fn)
+            if len(queue) > 1:
+                return
+        pool.submit(self._process_queue, doc, queue, loop)
+
+    def _process_queue(self, doc, queue, loop):
+        while True:
+            with self._queue_lock:
+                fn = queue[0]
+            self._local.curdoc = doc
+            self._local.loop = loop
+            try:
+                fn()
+            except Exception:
+                logging.getLogger('panel').exception(
+                    'Error processing event on thread.')
+            finally:
+                self._local.curdoc = None
+                self._local.loop = None
+            with self._queue_lock:
+                queue.popleft()
+                if not queue:
+                    return
+
+    def as_cached(self, key, fn, ttl=None, max_items=None, policy='lru',
+                  scope='global', **kwargs):
+        """
+        Caches the return value of a function, memoizing on the given
+        key and a hash of the supplied keyword arguments.
+
+        Arguments
+        ---------
+        key: (str)
+          The key to cache the return value under.
+        fn: (callable)
+          The function or callable whose return value will be cached.
+        ttl: (float)
+          Time in seconds after which the cached value expires.
+        max_items: (int)
+          Maximum number of values cached under the key.
+          Supplying a different ttl, max_items or policy for an
+          existing key reconfigures its cache.
+        policy: (str)
+          Eviction policy applied once max_items is exceeded, one of
+          'lru', 'lfu' or 'fifo'.
+        scope: (str)
+          Whether to share the cache across all sessions ('global') or
+          only within the current session ('session').
+        **kwargs: dict
+          Additional keyword arguments to supply to the function,
+          which will be memoized over as well.
+
+        Returns
+        -------
+        The cached value or the newly computed value.
+        """
+        from .cache import _generate_hash, _get_cache
+        cache = _get_cache(key, scope, ttl=ttl, max_items=max_items, policy=policy)
+        return cache.get(_generate_hash(kwargs), fn, **kwargs)
+
+    def _asset_url(self, obj, mime):
+        """
+        Registers a file path or bytes as a content addressed asset,
+        returning the URL it is served at or None if assets cannot be
+        served in the current context.
+        """
+        doc = self.curdoc
+        if self._asset_route is None or doc is None or doc.session_context is None:
+            return None
+        if isinstance(obj, str):
+            stat = os.stat(obj)
+            file_key = (os.path.abspath(obj), stat.st_mtime, stat.st_size)
+            key = self._asset_hashes.get(file_key)
+            if key is None:
+                hasher = hashlib.md5()
+                with open(obj, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024*1024), b''):
+                        hasher.update(chunk)
+                key = self._asset_hashes[file_key] = hasher.hexdigest()
+        else:
+            key = hashlib.md5(obj).hexdigest()
+        with self._asset_lock:
+            self._assets[key] = (obj, mime)
+            self._assets.move_to_end(key)
+            self._evict_assets()
+        return self._server_prefix(doc) + self._asset_route + key
+
+    def _evict_assets(self):
+        memory = [key for key, (obj, _) in self._assets.items()
+                  if not isinstance(obj, str)]
+        total = sum(len(self._assets[key][0]) for key in memory)
+        while memory and total > self._asset_memory_limit:
+            obj, _ = self._assets.pop(memory.pop(0))
+            total -= len(obj)
+
+    def _schedule_async(self, fn, *args, **kwargs):
+        """
+        Schedules an async def function on the IOLoop of the server or
+        notebook kernel, even when called from a thread pool worker.
+        """
+        loop = getattr(self._local, 'loop', None) or IOLoop.current()
+        loop.add_callback(fn, *args, **kwargs)
+
+    @contextmanager
+    def _unblock(self, doc):
+        """
+        Marks the Document as the current document and the current
+        thread as the thread processing its events, allowing model
+        updates to be applied directly rather than on the next tick.
+        """
+        thread = threading.current_thread()
+        curdoc, thread_id = self._curdoc, self._thread_id
+        self.curdoc = doc
+        self._thread_id = thread.ident if thread else None
+        try:
+            yield
+        finally:
+            self.curdoc = curdoc
+            self._thread_id = thread_id
 
     def _unblocked(self, doc):
         thread = threading.current_thread()
@@ -84,7 +438,9 @@ class _state(param.Parameterized):
 
     @property
     def curdoc(self):
-        if self._curdoc:
+        if getattr(self._local, 'curdoc', None):
+            return self._local.curdoc
+        elif self._curdoc:
             return self._curdoc
         elif _curdoc().session_context:
             return _curdoc()
@@ -63,8 +63,9 @@ class Accordion(NamedListPanel):
             pane = panel(pane, name=name)
             self.objects[i] = pane
 
+        new_ids = {id(obj) for obj in self.objects}
         for obj in old_objects:
-            if obj not in self.objects:
+            if id(obj) not in new_ids:
                 self._panels[id(obj)]._cleanup(root)
 
         params = {k: v for k, v in self.param.get_param_values()
@@ -11,6 +11,7 @@ import param
 from bokeh.models import Column as BkColumn, Row as BkRow
 
 from ..io.model import hold
+from ..io.profile import profiled
 from ..io.state import state
 from ..reactive import Reactive
 from ..util import param_name, param_reprs
@@ -55,6 +56,7 @@ class Panel(Reactive):
     # Callback API
     #----------------------------------------------------------------
 
+    @profiled('update_model')
     def _update_model(self, events, msg, root, model, doc, comm=None):
         msg = dict(msg)
         if self._rename['objects'] in msg:
@@ -89,13 +91,16 @@ class Panel(Reactive):
             pane = panel(pane)
             self.objects[i] = pane
 
+        # Index objects by identity to avoid quadratic list lookups
+        old_ids = {id(obj) for obj in old_objects}
+        new_ids = {id(obj) for obj in self.objects}
         for obj in old_objects:
-            if obj not in self.objects:
+            if id(obj) not in new_ids:
                 obj._cleanup(root)
 
         current_objects = list(self.objects)
         for i, pane in enumerate(self.objects):
-            if pane in old_objects:
+            if id(pane) in old_ids:
                 child, _ = pane._models[root.ref['id']]
             else:
                 try:
@@ -395,11 +400,13 @@ class NamedListPanel(ListPanel):
     def _update_names(self, event):
         if len(event.new) == len(self._names):
             return
+        old_names = {}
+        for obj, name in zip(event.old, self._names):
+            old_names.setdefault(id(obj), name)
         names = []
         for obj in event.new:
-            if obj in event.old:
-                index = event.old.index(obj)
-                name = self._names[index]
+            if id(obj) in old_names:
+                name = old_names[id(obj)]
             else:
                 name = obj.name
             names.append(name)
@@ -12,6 +12,7 @@ import param
 from bokeh.models import Box as BkBox, GridBox as BkGridBox
 
 from ..io.model import hold
+from ..io.profile import profiled
 from .base import _col, _row, ListPanel, Panel
 
 
@@ -140,6 +141,7 @@ class GridBox(ListPanel):
         self._link_props(model, self._linked_props, doc, root, comm)
         return model
 
+    @profiled('update_model')
     def _update_model(self, events, msg, root, model, doc, comm=None):
         from ..io import state
 
@@ -210,8 +212,10 @@ class GridSpec(Panel):
         if isinstance(old_objects, dict):
             old_objects = list(old_objects.values())
 
+        old_ids = {id(obj) for obj in old_objects}
+        new_ids = {id(obj) for obj in current_objects}
         for old in old_objects:
-            if old not in current_objects:
+            if id(old) not in new_ids:
                 old._cleanup(root)
 
         children = []
@@ -232,7 +236,7 @@ class GridSpec(Panel):
                     properties['width'] = w*width
             obj.param.set_param(**properties)
 
-            if obj in old_objects:
+            if id(obj) in old_ids:
                 child, _ = obj._models[root.ref['id']]
             else:
                 try:
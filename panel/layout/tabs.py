@@ -7,6 +7,7 @@ from bokeh.models import (
     Spacer as BkSpacer, Panel as BkPanel, Tabs as BkTabs
 )
 
+from ..io.profile import profiled
 from ..viewable import Layoutable
 from .base import NamedListPanel
 
@@ -86,6 +87,7 @@ class Tabs(NamedListPanel):
             old, new = self._process_close(ref, attr, old, new)
         super(Tabs, self)._comm_change(doc, ref, attr, old, new)
 
+    @profiled('server_change')
     def _server_change(self, doc, ref, attr, old, new):
         if attr in self._changing.get(ref, []):
             self._changing[ref].remove(attr)
@@ -104,6 +106,7 @@ class Tabs(NamedListPanel):
     # Model API
     #----------------------------------------------------------------
 
+    @profiled('update_model')
     def _update_model(self, events, msg, root, model, doc, comm=None):
         msg = dict(msg)
         if 'closable' in msg:
@@ -128,15 +131,17 @@ class Tabs(NamedListPanel):
             pane = panel(pane, name=name)
             self.objects[i] = pane
 
+        old_ids = {id(obj) for obj in old_objects}
+        new_ids = {id(obj) for obj in self.objects}
         for obj in old_objects:
-            if obj not in self.objects:
+            if id(obj) not in new_ids:
                 obj._cleanup(root)
 
         current_objects = list(self)
         panels = self._panels[root.ref['id']]
         for i, (name, pane) in enumerate(zip(self._names, self)):
             hidden = self.dynamic and i != self.active
-            if (pane in old_objects and id(pane) in panels and
+            if (id(pane) in old_ids and id(pane) in panels and
                 ((hidden and isinstance(panels[id(pane)].child, BkSpacer)) or
                  (not hidden and not isinstance(panels[id(pane)].child, BkSpacer)))):
                 panel = panels[id(pane)]
@@ -82,26 +82,38 @@ class Callback(param.Parameterized):
 
     @classmethod
     def _process_callbacks(cls, root_view, root_model):
-        if not root_model:
+        if not root_model or not cls.registry:
             return
 
-        linkable = root_view.select(Viewable)
-        linkable += root_model.select({'type' : BkModel})
-
-        if not linkable:
+        # Look up Viewables by the models they rendered on this root
+        # instead of traversing the whole tree, the bokeh models are
+        # only collected if a bokeh model is a link source or target
+        ref = root_model.ref['id']
+        models = []
+        def rendered(obj):
+            if isinstance(obj, Viewable):
+                return ref in obj._models
+            elif isinstance(obj, BkModel):
+                if not models:
+                    models.append(root_model.references())
+                return obj in models[0]
+            return False
+
+        sources = [src for src in list(cls.registry) if rendered(src)]
+        if not sources:
             return
 
-        found = [(link, src, getattr(link, 'target', None)) for src in linkable
+        found = [(link, src, getattr(link, 'target', None)) for src in sources
                  for link in cls.registry.get(src, [])
-                 if not link._requires_target or link.target in linkable]
+                 if not link._requires_target or rendered(link.target)]
 
         arg_overrides = {}
         if 'holoviews' in sys.modules:
             from .pane.holoviews import HoloViews, generate_panel_bokeh_map
 
-            hv_views = root_view.select(HoloViews)
+            hv_views = HoloViews._get_root_panes(ref)
             map_hve_bk = generate_panel_bokeh_map(root_model, hv_views)
-            for src in linkable:
+            for src in sources:
                 for link in cls.registry.get(src, []):
                     if hasattr(link, 'target'):
                         for tgt in map_hve_bk.get(link.target, []):
@@ -116,7 +128,6 @@ class Callback(param.Parameterized):
                         for tgt in hv_objs:
                             arg_overrides[id(link)][k] = tgt
 
-        ref = root_model.ref['id']
         callbacks = []
         for link, src, tgt in found:
             cb = cls._callbacks[type(link)]
@@ -9,4 +9,4 @@ from .layout import Card # noqa
 from .location import Location # noqa
 from .markup import JSON, HTML # noqa
 from .state import State # noqa
-from .widgets import Audio, FileDownload, Player, Progress, Video, VideoStream # noqa
+from .widgets import Audio, ChunkedFileInput, FileDownload, Player, Progress, Video, VideoStream # noqa
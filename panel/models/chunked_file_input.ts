@@ -0,0 +1,115 @@
+import {InputWidget, InputWidgetView} from "@bokehjs/models/widgets/input_widget"
+import {input} from "@bokehjs/core/dom"
+import * as p from "@bokehjs/core/properties"
+
+export class ChunkedFileInputView extends InputWidgetView {
+  model: ChunkedFileInput
+
+  protected dialog_el: HTMLInputElement
+  protected _file: File | null = null
+
+  connect_signals(): void {
+    super.connect_signals()
+    this.connect(this.model.properties.received.change, () => this._send_next())
+  }
+
+  render(): void {
+    super.render()
+    if (this.dialog_el == null) {
+      this.dialog_el = input({type: "file"})
+      this.dialog_el.onchange = () => {
+        const {files} = this.dialog_el
+        if (files != null && files.length)
+          this._start(files[0])
+      }
+    }
+    if (this.model.accept != null && this.model.accept != '')
+      this.dialog_el.accept = this.model.accept
+    this.dialog_el.disabled = this.model.disabled
+    this.group_el.appendChild(this.dialog_el)
+  }
+
+  protected _start(file: File): void {
+    // Reset the acknowledged chunks before sending the first chunk
+    this._file = null
+    this.model.setv({
+      filename: file.name,
+      mime_type: file.type,
+      size: file.size,
+      chunk_index: -1,
+      received: 0,
+    })
+    this._file = file
+    this._send_chunk(0)
+  }
+
+  protected _send_next(): void {
+    if (this._file == null)
+      return
+    const start = this.model.received * this.model.chunk_size
+    if (start >= this._file.size) {
+      this._file = null
+      return
+    }
+    this._send_chunk(this.model.received)
+  }
+
+  protected _send_chunk(index: number): void {
+    const file = this._file
+    if (file == null)
+      return
+    const start = index * this.model.chunk_size
+    const blob = file.slice(start, start + this.model.chunk_size)
+    const reader = new FileReader()
+    reader.onload = () => {
+      const url = reader.result as string
+      const data = url.slice(url.indexOf(',') + 1)
+      // The server processes the chunk once the index changes
+      this.model.chunk = data
+      this.model.chunk_index = index
+    }
+    reader.readAsDataURL(blob)
+  }
+}
+
+export namespace ChunkedFileInput {
+  export type Attrs = p.AttrsOf<Props>
+
+  export type Props = InputWidget.Props & {
+    accept: p.Property<string>
+    chunk: p.Property<string>
+    chunk_index: p.Property<number>
+    chunk_size: p.Property<number>
+    filename: p.Property<string>
+    mime_type: p.Property<string>
+    received: p.Property<number>
+    size: p.Property<number>
+  }
+}
+
+export interface ChunkedFileInput extends ChunkedFileInput.Attrs {}
+
+export class ChunkedFileInput extends InputWidget {
+  properties: ChunkedFileInput.Props
+
+  constructor(attrs?: Partial<ChunkedFileInput.Attrs>) {
+    super(attrs)
+  }
+
+  static __module__ = "panel.models.widgets"
+
+  static init_ChunkedFileInput(): void {
+    this.prototype.default_view = ChunkedFileInputView
+
+    this.define<ChunkedFileInput.Props>({
+      accept:      [ p.String, ""      ],
+      chunk:       [ p.String, ""      ],
+      chunk_index: [ p.Number, -1      ],
+      chunk_size:  [ p.Number, 1048576 ],
+      filename:    [ p.String, ""      ],
+      mime_type:   [ p.String, ""      ],
+      received:    [ p.Number, 0       ],
+      size:        [ p.Number, 0       ],
+    })
+  }
+}
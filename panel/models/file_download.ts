@@ -37,6 +37,7 @@ export class FileDownloadView extends InputWidgetView {
     this.connect(this.model.properties.button_type.change, () => this.render())
     this.connect(this.model.properties.data.change, () => this.render())
     this.connect(this.model.properties.filename.change, () => this.render())
+    this.connect(this.model.properties.url.change, () => this._download_url())
     this.connect(this.model.properties.label.change, () => this._update_label())
   }
   
@@ -46,8 +47,10 @@ export class FileDownloadView extends InputWidgetView {
     this.anchor_el.classList.add(bk_btn)
     this.anchor_el.classList.add(bk_btn_type(this.model.button_type))
     this.anchor_el.textContent = this.model.label
-    if (this.model.data === null || this.model.filename === null) {
+    if (this.model.data === null || this.model.filename === null || this.model.url !== null) {
       this.anchor_el.addEventListener("click", () => this.click())
+      if (this.model.url !== null && !this.model.auto)
+        this._link_url()
       this.group_el.appendChild(this.anchor_el)  
       this._initialized = true
       return
@@ -63,6 +66,28 @@ export class FileDownloadView extends InputWidgetView {
     this._initialized = true
   }
 
+  _download_url(): void {
+    // One-time URLs are consumed immediately, each click requests a new URL
+    if (this.model.url === null)
+      return
+    if (!this.model.auto) {
+      // Download on the next click or allow right-click save as
+      this._link_url()
+      return
+    }
+    const link = document.createElement('a')
+    link.href = this.model.url
+    link.download = this.model.filename || ''
+    document.body.appendChild(link)
+    link.click()
+    document.body.removeChild(link)
+  }
+
+  _link_url(): void {
+    this.anchor_el.href = this.model.url as string
+    this.anchor_el.download = this.model.filename || ''
+  }
+
   _update_label(): void {
     this.anchor_el.textContent = this.model.label
   }
@@ -82,6 +107,7 @@ export namespace FileDownload {
     data: p.Property<string | null>
     label: p.Property<string>
     filename: p.Property<string | null>
+    url: p.Property<string | null>
   }
 }
 
@@ -106,6 +132,7 @@ export class FileDownload extends InputWidget {
       label:    [ p.String,  "Download"  ],
       filename: [ p.String,  null  ],
       button_type: [ p.ButtonType, "default" ], // TODO (bev)
+      url:      [ p.String,  null  ],
     })
 
     this.override({
@@ -1,6 +1,7 @@
 export {AcePlot} from "./ace"
 export {Audio} from "./audio"
 export {Card} from "./card"
+export {ChunkedFileInput} from "./chunked_file_input"
 export {CommManager} from "./comm_manager"
 export {DeckGLPlot} from "./deckgl"
 export {HTML} from "./html"
@@ -1,4 +1,4 @@
-from bokeh.core.properties import Bool, Dict, Any, List
+from bokeh.core.properties import Bool, Dict, Any, List, String
 from bokeh.models import Model
 
 
@@ -6,6 +6,9 @@ class State(Model):
 
     json = Bool(False, help="Whether the values point to json files")
 
+    shards = List(String, help="""
+        Paths of the compressed shards the recorded state points to.""")
+
     state = Dict(Any, Any, help="Contains the recorded state")
 
     widgets = Dict(Any, Any)
@@ -16,6 +16,41 @@ function get_json(file: string, callback: any): void {
   xobj.send(null);
 }
 
+function get_buffer(file: string, callback: (buffer: ArrayBuffer) => void): void {
+  const xobj = new XMLHttpRequest();
+  xobj.responseType = 'arraybuffer';
+  xobj.open('GET', file, true);
+  xobj.onreadystatechange = function () {
+    if (xobj.readyState == 4 && xobj.status == 200) {
+      callback(xobj.response);
+    }
+  };
+  xobj.send(null);
+}
+
+function decompress(buffer: ArrayBuffer): Promise<ArrayBuffer> {
+  const stream = (new Blob([buffer]) as any).stream().pipeThrough(
+    new (window as any).DecompressionStream('gzip'))
+  return new Response(stream).arrayBuffer()
+}
+
+function decode_record(buffer: ArrayBuffer): (string | ArrayBuffer)[] {
+  // Each frame is prefixed by a binary flag and its length
+  const view = new DataView(buffer)
+  const decoder = new TextDecoder()
+  const frames: (string | ArrayBuffer)[] = []
+  let offset = 0
+  while (offset < buffer.byteLength) {
+    const binary = view.getUint8(offset)
+    const length = view.getUint32(offset+1, true)
+    offset += 5
+    const data = buffer.slice(offset, offset+length)
+    frames.push(binary ? data : decoder.decode(data))
+    offset += length
+  }
+  return frames
+}
+
 export class StateView extends View {
   model: State
 
@@ -28,6 +63,7 @@ export namespace State {
 
   export type Props = Model.Props & {
     json: p.Property<boolean>
+    shards: p.Property<string[]>
     state: p.Property<object>
     values: p.Property<any[]>
     widgets: p.Property<{[key: string]: number}>
@@ -40,29 +76,59 @@ export class State extends Model {
   properties: State.Props
   _receiver: Receiver
   _cache: {[key: string]: string}
+  _shards: {[key: number]: ArrayBuffer | null}
 
   constructor(attrs?: Partial<State.Attrs>) {
     super(attrs)
     this._receiver = new Receiver()
     this._cache = {}
+    this._shards = {}
   }
 
   apply_state(state: any): void {
-    this._receiver.consume(state.header)
-    this._receiver.consume(state.metadata)
-    this._receiver.consume(state.content)
-    if (this._receiver.message && this.document) {
-      this.document.apply_json_patch(this._receiver.message.content)
+    this.apply_frames([state.header, state.metadata, state.content])
+  }
+
+  apply_frames(frames: (string | ArrayBuffer)[]): void {
+    for (const frame of frames)
+      this._receiver.consume(frame)
+    const message = this._receiver.message
+    if (message && this.document) {
+      this.document.apply_json_patch(message.content, message.buffers)
     }
   }
 
-  _receive_json(result: string, path: string): void {
-    const state = JSON.parse(result)
-    this._cache[path] = state
-	let current: any = this.state
+  _current_state(): any {
+    let current: any = this.state
     for (const i of this.values) {
       current = current[i]
     }
+    return current
+  }
+
+  _apply_record(entry: number[]): void {
+    const [shard, offset, length] = entry
+    const buffer = this._shards[shard]
+    if (buffer === undefined) {
+      // Shards are loaded once on demand, the record for the
+      // current values is applied once the shard arrives
+      this._shards[shard] = null
+      get_buffer(this.shards[shard], (data: ArrayBuffer) => {
+        decompress(data).then((decompressed: ArrayBuffer) => {
+          this._shards[shard] = decompressed
+          const current = this._current_state()
+          if (current[0] === shard)
+            this._apply_record(current)
+        })
+      })
+    } else if (buffer !== null)
+      this.apply_frames(decode_record(buffer.slice(offset, offset+length)))
+  }
+
+  _receive_json(result: string, path: string): void {
+    const state = JSON.parse(result)
+    this._cache[path] = state
+    const current = this._current_state()
     if (current === path)
       this.apply_state(state)
 	else if (this._cache[current])
@@ -78,7 +144,9 @@ export class State extends Model {
       state = state[i]
     }
     this.values = values
-    if (this.json) {
+    if (this.shards.length) {
+      this._apply_record(state)
+    } else if (this.json) {
       if (this._cache[state]) {
         this.apply_state(this._cache[state])
       } else {
@@ -96,6 +164,7 @@ export class State extends Model {
 
     this.define<State.Props>({
       json:    [ p.Boolean, false ],
+      shards:  [ p.Array,   []    ],
       state:   [ p.Any, {}        ],
       widgets: [ p.Any, {}        ],
       values:  [ p.Any, []        ],
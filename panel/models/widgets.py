@@ -104,6 +104,30 @@ class Progress(HTMLBox):
     """)
 
 
+class ChunkedFileInput(InputWidget):
+    """
+    File input which transfers the selected file in chunks, waiting
+    for each chunk to be acknowledged before sending the next.
+    """
+
+    accept = String(help="""Comma-separated list of accepted file types""")
+
+    chunk = String(help="""The base64 encoded data of the current chunk""")
+
+    chunk_index = Int(-1, help="""The index of the current chunk""")
+
+    chunk_size = Int(1024*1024, help="""The size of each chunk in bytes""")
+
+    filename = String(help="""The name of the file being uploaded""")
+
+    mime_type = String(help="""The mime type of the file being uploaded""")
+
+    received = Int(0, help="""
+        The number of chunks which were acknowledged by the server""")
+
+    size = Int(0, help="""The size of the file being uploaded in bytes""")
+
+
 class FileDownload(InputWidget):
 
     auto = Bool(False, help="""Whether to download on click""")
@@ -123,3 +147,5 @@ class FileDownload(InputWidget):
     filename = String(help="""Filename to use on download""")
 
     title = Override(default='')
+
+    url = String(help="""One-time URL to stream the file from""")
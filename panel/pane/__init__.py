@@ -7,16 +7,40 @@ images, equations etc.
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import sys
+
+from importlib import import_module
+
 from .ace import Ace # noqa
 from .base import PaneBase, Pane, panel # noqa
 from .equation import LaTeX # noqa
-from .deckgl import DeckGL # noqa
-from .holoviews import HoloViews # noqa
 from .image import GIF, JPG, PNG, SVG # noqa
 from .markup import DataFrame, HTML, JSON, Markdown, Str # noqa
 from .media import Audio, Video # noqa
-from .plotly import Plotly # noqa
 from .plot import Bokeh, Matplotlib, RGGPlot, YT # noqa
-from .streamz import Streamz # noqa
-from .vega import Vega # noqa
-from .vtk import VTK, VTKVolume # noqa
+
+# Optional Pane types which are imported on first access, see
+# PaneBase._lazy_modules for how they are loaded when resolving
+# the Pane type of an object
+_LAZY_TYPES = {
+    'DeckGL': '.deckgl',
+    'HoloViews': '.holoviews',
+    'Plotly': '.plotly',
+    'Streamz': '.streamz',
+    'Vega': '.vega',
+    'VTK': '.vtk',
+    'VTKVolume': '.vtk',
+}
+
+def __getattr__(name):
+    if name in _LAZY_TYPES:
+        return getattr(import_module(_LAZY_TYPES[name], __name__), name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_TYPES))
+
+# Module level __getattr__ requires Python 3.7 (PEP 562)
+if sys.version_info < (3, 7):
+    for _name in _LAZY_TYPES:
+        globals()[_name] = __getattr__(_name)
@@ -4,10 +4,17 @@ objects to a visual representation expressed as a bokeh model.
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import sys
+
 from functools import partial
+from importlib import import_module
+from types import FunctionType, MethodType
 
+import numpy as np
 import param
 
+from six import string_types
+
 from bokeh.io import curdoc as _curdoc
 from bokeh.models.layouts import GridBox as _BkGridBox
 
@@ -55,6 +62,34 @@ def panel(obj, **kwargs):
     return pane.layout
 
 
+# Types for which Pane applies methods commonly inspect the value of
+# the object (e.g. filenames, URLs or specs), which means the resolved
+# Pane type cannot be cached by type alone
+_VALUE_TYPES = string_types + (
+    bytes, dict, list, tuple, np.ndarray, FunctionType, MethodType,
+    partial, param.Parameter
+)
+
+# Checks whether an object could be rendered by one of the optional
+# Pane types, without importing the module which declares the type
+
+def _maybe_deckgl(obj):
+    return hasattr(obj, 'deck_widget')
+
+def _maybe_plotly(obj):
+    if isinstance(obj, list):
+        return bool(obj) and all(_maybe_plotly(o) for o in obj)
+    return (hasattr(obj, 'to_plotly_json') or
+            (isinstance(obj, dict) and 'data' in obj and 'layout' in obj))
+
+def _maybe_vega(obj):
+    return isinstance(obj, dict) and '$schema' in obj
+
+def _maybe_vtk(obj):
+    return ((isinstance(obj, np.ndarray) and obj.ndim == 3) or
+            (isinstance(obj, string_types) and obj.endswith('.vtkjs')))
+
+
 class RerenderError(RuntimeError):
     """
     Error raised when a pane requests re-rendering during initial render.
@@ -102,8 +137,31 @@ class PaneBase(Reactive):
     # List of parameters that trigger a rerender of the Bokeh model
     _rerender_params = ['object']
 
+    # Cache of all concrete Pane types, reset when a subclass is declared
+    _pane_types = None
+
+    # Optional Pane modules which are imported when resolving the Pane
+    # type of an object, once one of the libraries they render objects
+    # of has been imported or the object could be rendered by them
+    _lazy_modules = [
+        ('panel.pane.deckgl', ('pydeck',), _maybe_deckgl),
+        ('panel.pane.plotly', ('plotly',), _maybe_plotly),
+        ('panel.pane.vega', ('altair',), _maybe_vega),
+        ('panel.pane.vtk', ('vtk',), _maybe_vtk),
+        ('panel.pane.holoviews', ('holoviews',), None),
+        ('panel.pane.streamz', ('streamz',), None)
+    ]
+
+    # Cache of the resolved Pane type indexed by object type
+    _type_cache = {}
+
     __abstract = True
 
+    def __init_subclass__(cls, **kwargs):
+        super(PaneBase, cls).__init_subclass__(**kwargs)
+        PaneBase._pane_types = None
+        PaneBase._type_cache.clear()
+
     def __init__(self, object=None, **params):
         applies = self.applies(object, **(params if self._applies_kw else {}))
         if (isinstance(applies, bool) and not applies) and object is not None :
@@ -261,6 +319,23 @@ class PaneBase(Reactive):
         state._views[ref] = (self, root, doc, comm)
         return root
 
+    @classmethod
+    def _get_pane_types(cls, obj=None):
+        """
+        Returns all concrete Pane types, caching them until a new
+        Pane subclass is declared. Optional Pane modules are imported
+        if they may apply to the supplied object.
+        """
+        for module, libraries, maybe_applies in PaneBase._lazy_modules:
+            if module in sys.modules:
+                continue
+            if (any(lib in sys.modules for lib in libraries) or
+                (maybe_applies is not None and maybe_applies(obj))):
+                import_module(module)
+        if PaneBase._pane_types is None:
+            PaneBase._pane_types = list(param.concrete_descendents(PaneBase).values())
+        return PaneBase._pane_types
+
     @classmethod
     def get_pane_type(cls, obj, **kwargs):
         """
@@ -268,6 +343,11 @@ class PaneBase(Reactive):
         the precedence of all types whose applies method declares that
         the object is supported.
 
+        If no Pane type declares a priority specific to the object,
+        the resolved Pane type is cached by the type of the object,
+        unless the object is a string, container, array, function or
+        file-like object whose value may determine the Pane type.
+
         Arguments
         ---------
         obj (object): The object type to return a Pane for
@@ -278,8 +358,12 @@ class PaneBase(Reactive):
         """
         if isinstance(obj, Viewable):
             return type(obj)
+        obj_type = type(obj)
+        cacheable = not (kwargs or isinstance(obj, _VALUE_TYPES) or hasattr(obj, 'read'))
+        if cacheable and obj_type in PaneBase._type_cache:
+            return PaneBase._type_cache[obj_type]
         descendents = []
-        for p in param.concrete_descendents(PaneBase).values():
+        for p in cls._get_pane_types(obj):
             if p.priority is None:
                 applies = True
                 try:
@@ -297,6 +381,8 @@ class PaneBase(Reactive):
                                  'declares no priority.' % p.__name__)
             elif priority is None or priority is False:
                 continue
+            elif applies:
+                cacheable = False
             descendents.append((priority, applies, p))
         pane_types = reversed(sorted(descendents, key=lambda x: x[0]))
         for _, applies, pane_type in pane_types:
@@ -307,6 +393,8 @@ class PaneBase(Reactive):
                     applies = False
             if not applies:
                 continue
+            if cacheable:
+                PaneBase._type_cache[obj_type] = pane_type
             return pane_type
         raise TypeError('%s type could not be rendered.' % type(obj).__name__)
 
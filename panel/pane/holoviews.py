@@ -5,9 +5,9 @@ objects and their widgets and support for Links
 from __future__ import absolute_import, division, unicode_literals
 
 import sys
+import weakref
 
 from collections import OrderedDict, defaultdict
-from distutils.version import LooseVersion
 from functools import partial
 
 import param
@@ -77,6 +77,9 @@ class HoloViews(PaneBase):
 
     _rerender_params = ['object', 'backend']
 
+    # Index of the HoloViews panes rendered on each root model
+    _root_panes = defaultdict(weakref.WeakValueDictionary)
+
     def __init__(self, object=None, **params):
         super(HoloViews, self).__init__(object, **params)
         self._initialized = False
@@ -256,10 +259,23 @@ class HoloViews(PaneBase):
             old_plot.cleanup()
         self._plots[ref] = (plot, child_pane)
         self._models[ref] = (model, parent)
+        self._register_root(ref)
         return model
 
+    def _register_root(self, ref):
+        HoloViews._root_panes[ref][id(self)] = self
+
+    @classmethod
+    def _get_root_panes(cls, ref):
+        """
+        Returns the HoloViews panes rendered on the root with the
+        supplied ref in the order they were rendered.
+        """
+        return list(cls._root_panes.get(ref, {}).values())
+
     def _render(self, doc, comm, root):
         import holoviews as hv
+        from distutils.version import LooseVersion
         from holoviews import Store, renderer as load_renderer
 
         if self.renderer:
@@ -290,7 +306,13 @@ class HoloViews(PaneBase):
         Traverses HoloViews object to find and clean up any streams
         connected to existing plots.
         """
-        old_plot, old_pane = self._plots.pop(root.ref['id'], (None, None))
+        ref = root.ref['id']
+        old_plot, old_pane = self._plots.pop(ref, (None, None))
+        panes = HoloViews._root_panes.get(ref)
+        if panes is not None:
+            panes.pop(id(self), None)
+            if not panes:
+                del HoloViews._root_panes[ref]
         if old_plot:
             old_plot.cleanup()
         if old_pane:
@@ -465,7 +487,7 @@ def find_links(root_view, root_model):
     Traverses the supplied Viewable searching for Links between any
     HoloViews based panes.
     """
-    hv_views = root_view.select(HoloViews)
+    hv_views = HoloViews._get_root_panes(root_model.ref['id'])
     root_plots = [plot for view in hv_views for plot, _ in view._plots.values()
                   if getattr(plot, 'root', None) is root_model]
 
@@ -514,7 +536,7 @@ def link_axes(root_view, root_model):
     Pre-processing hook to allow linking axes across HoloViews bokeh
     plots.
     """
-    panes = root_view.select(HoloViews)
+    panes = HoloViews._get_root_panes(root_model.ref['id'])
 
     if not panes:
         return
@@ -5,13 +5,17 @@ file types.
 from __future__ import absolute_import, division, unicode_literals
 
 import base64
+import mmap
+import os
+import struct
 
-from io import BytesIO
+from collections import OrderedDict
 from six import string_types
 
 import param
 
 from .markup import escape, DivPaneBase
+from ..io.state import state
 from ..util import isfile, isurl
 
 
@@ -42,12 +46,41 @@ class ImageBase(DivPaneBase):
 
     imgtype = 'None'
 
-    _rerender_params = ['alt_text', 'link_url', 'embed', 'object', 'style']
+    _mime_types = {'jpg': 'jpeg', 'svg': 'svg+xml'}
+
+    _rerender_params = ['alt_text', 'link_url', 'embed', 'object', 'style',
+                        'width', 'height', 'sizing_mode']
+
+    # Parameters which do not require the image payload to be regenerated
+    _layout_params = ['alt_text', 'link_url', 'style', 'width', 'height',
+                      'sizing_mode']
+
+    # Image dimensions of local files indexed by path, mtime and size
+    _shape_cache = OrderedDict()
+
+    # Maximum number of local file dimensions to cache
+    _shape_cache_size = 256
+
+    # Number of bytes at the start of a file which encode the dimensions
+    _header_size = None
+
+    # ETag and content of remote images indexed by URL
+    _url_cache = OrderedDict()
+
+    # Maximum number of remote images to cache
+    _url_cache_size = 32
+
+    # Local files larger than this (in bytes) are memory-mapped
+    _mmap_threshold = 1024*1024
 
     _target_transforms = {'object': """'<img src="' + value + '"></img>'"""}
 
     __abstract = True
 
+    def __init__(self, object=None, **params):
+        super(ImageBase, self).__init__(object, **params)
+        self._payload = None
+
     @classmethod
     def applies(cls, obj):
         imgtype = cls.imgtype
@@ -78,22 +111,125 @@ class ImageBase(DivPaneBase):
         if hasattr(self.object, 'read'):
             return self.object.read()
         if isurl(self.object, [self.imgtype]):
-            import requests
-            r = requests.request(url=self.object, method='GET')
-            return r.content
+            return self._fetch(self.object)
+
+    @classmethod
+    def _fetch(cls, url):
+        """
+        Fetches a remote image, revalidating previously fetched
+        content using its ETag.
+        """
+        import requests
+        etag, content = cls._url_cache.get(url, (None, None))
+        headers = {'If-None-Match': etag} if etag else {}
+        r = requests.request(url=url, method='GET', headers=headers)
+        if r.status_code == 304 and content is not None:
+            cls._url_cache.move_to_end(url)
+            return content
+        if r.headers.get('ETag'):
+            cls._url_cache[url] = (r.headers['ETag'], r.content)
+            while len(cls._url_cache) > cls._url_cache_size:
+                cls._url_cache.popitem(last=False)
+        return r.content
 
     def _imgshape(self, data):
         """Calculate and return image width,height"""
         raise NotImplementedError
 
+    def _file_shape(self, f):
+        """
+        Calculate and return the image width,height of an open file,
+        reading only the header if its size is known.
+        """
+        return self._imgshape(f.read(self._header_size or -1))
+
+    @property
+    def _mime(self):
+        return 'image/' + self._mime_types.get(self.imgtype, self.imgtype)
+
+    def _src(self, data):
+        """
+        Returns the image src, referencing a content addressed asset
+        URL when served and a base64 encoded data URI otherwise.
+        """
+        mime = self._mime
+        if isinstance(self.object, string_types) and isfile(self.object):
+            url = state._asset_url(self.object, mime)
+        else:
+            url = state._asset_url(data, mime)
+        if url is not None:
+            return url
+        b64 = base64.b64encode(data).decode("utf-8")
+        return "data:{mime};base64,{b64}".format(mime=mime, b64=b64)
+
+    def _update_pane(self, *events):
+        if any(event.name not in self._layout_params for event in events):
+            self._payload = None
+        super(ImageBase, self)._update_pane(*events)
+
+    def _file_key(self):
+        if isinstance(self.object, string_types) and isfile(self.object):
+            stat = os.stat(self.object)
+            return (os.path.abspath(self.object), stat.st_mtime, stat.st_size)
+
+    def _file_payload(self, file_key):
+        """
+        Reads only the header of a local file to determine the image
+        dimensions and reads the full file only if it has to be
+        embedded as base64, memory-mapping large files.
+        """
+        cache = type(self)._shape_cache
+        shape_key = file_key + (type(self).__name__,)
+        with open(self.object, 'rb') as f:
+            shape = cache.get(shape_key)
+            if shape is None:
+                shape = self._file_shape(f)
+            cache[shape_key] = shape
+            cache.move_to_end(shape_key)
+            while len(cache) > self._shape_cache_size:
+                cache.popitem(last=False)
+            if not self.embed:
+                return shape, self.object
+            src = state._asset_url(self.object, self._mime)
+            if src is not None:
+                return shape, src
+            f.seek(0)
+            if file_key[2] > self._mmap_threshold:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+        try:
+            return shape, self._src(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def _get_payload(self):
+        """
+        Returns the image dimensions and src, reusing the previously
+        generated payload if the object was not changed.
+        """
+        file_key = self._file_key()
+        key = (file_key, self.embed, state._asset_route is not None and
+               state.curdoc is not None and state.curdoc.session_context is not None)
+        if self._payload is not None and self._payload[0] == key:
+            return self._payload[1]
+        if file_key is not None:
+            payload = self._file_payload(file_key)
+        else:
+            data = self._img()
+            if not isinstance(data, bytes):
+                data = base64.b64decode(data)
+            src = self._src(data) if self.embed else self.object
+            payload = (self._imgshape(data), src)
+        self._payload = (key, payload)
+        return payload
+
     def _get_properties(self):
         p = super(ImageBase, self)._get_properties()
         if self.object is None:
             return dict(p, text='<img></img>')
-        data = self._img()
-        if not isinstance(data, bytes):
-            data = base64.b64decode(data)
-        width, height = self._imgshape(data)
+        (width, height), src = self._get_payload()
         if self.width is not None:
             if self.height is None:
                 height = int((self.width/width)*height)
@@ -103,11 +239,6 @@ class ImageBase(DivPaneBase):
         elif self.height is not None:
             width = int((self.height/height)*width)
             height = self.height
-        if not self.embed:
-            src = self.object
-        else:
-            b64 = base64.b64encode(data).decode("utf-8")
-            src = "data:image/"+self.imgtype+";base64,{b64}".format(b64=b64)
 
         smode = self.sizing_mode
         if smode in ['fixed', None]:
@@ -137,9 +268,10 @@ class PNG(ImageBase):
 
     imgtype = 'png'
 
+    _header_size = 24
+
     @classmethod
     def _imgshape(cls, data):
-        import struct
         w, h = struct.unpack('>LL', data[16:24])
         return int(w), int(h)
 
@@ -148,9 +280,10 @@ class GIF(ImageBase):
 
     imgtype = 'gif'
 
+    _header_size = 10
+
     @classmethod
     def _imgshape(cls, data):
-        import struct
         w, h = struct.unpack("<HH", data[6:10])
         return int(w), int(h)
 
@@ -161,21 +294,44 @@ class JPG(ImageBase):
 
     @classmethod
     def _imgshape(cls, data):
-        import struct
-        b = BytesIO(data)
-        b.read(2)
-        c = b.read(1)
-        while (c and ord(c) != 0xDA):
-            while (ord(c) != 0xFF): c = b.read(1)
-            while (ord(c) == 0xFF): c = b.read(1)
-            if (ord(c) >= 0xC0 and ord(c) <= 0xC3):
-                b.read(3)
-                h, w = struct.unpack(">HH", b.read(4))
+        # Walk the JPEG segments until a start of frame marker is found
+        i, size = 2, len(data)
+        while i < size:
+            while i < size and data[i] != 0xFF:
+                i += 1
+            while i < size and data[i] == 0xFF:
+                i += 1
+            if i >= size or data[i] == 0xDA:
                 break
-            else:
-                b.read(int(struct.unpack(">H", b.read(2))[0])-2)
-            c = b.read(1)
-        return int(w), int(h)
+            marker = data[i]
+            i += 1
+            if 0xC0 <= marker <= 0xC3:
+                h, w = struct.unpack(">HH", data[i+3:i+7])
+                return int(w), int(h)
+            i += struct.unpack(">H", data[i:i+2])[0]
+        raise ValueError('Could not determine the dimensions of the JPG image.')
+
+    @classmethod
+    def _file_shape(cls, f):
+        # Read the segment headers, seeking over the segment contents
+        f.seek(2)
+        while True:
+            byte = f.read(1)
+            while byte and byte != b'\xff':
+                byte = f.read(1)
+            while byte == b'\xff':
+                byte = f.read(1)
+            if not byte or byte == b'\xda':
+                break
+            marker = ord(byte)
+            if 0xC0 <= marker <= 0xC3:
+                h, w = struct.unpack(">HH", f.read(7)[3:7])
+                return int(w), int(h)
+            length = f.read(2)
+            if len(length) < 2:
+                break
+            f.seek(struct.unpack(">H", length)[0]-2, 1)
+        raise ValueError('Could not determine the dimensions of the JPG image.')
 
 
 class SVG(ImageBase):
@@ -218,8 +374,7 @@ class SVG(ImageBase):
             data = data.encode('utf-8')
 
         if self.encode:
-            b64 = base64.b64encode(data).decode("utf-8")
-            src = "data:image/svg+xml;base64,{b64}".format(b64=b64)
+            src = self._src(data)
             html = "<img src='{src}' width={width} height={height}></img>".format(
                 src=src, width=width, height=height
             )
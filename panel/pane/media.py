@@ -12,6 +12,7 @@ from six import string_types
 import numpy as np
 import param
 
+from ..io.state import state
 from ..models import Audio as _BkAudio, Video as _BkVideo
 from ..util import isfile, isurl
 from .base import PaneBase
@@ -43,6 +44,9 @@ class _MediaBase(PaneBase):
 
     _media_type = None
 
+    # Mime subtypes which differ from the file extension
+    _mime_subtypes = {'mp3': 'mpeg'}
+
     _rename = {'name': None, 'sample_rate': None, 'object': 'value'}
 
     _updates = True
@@ -79,16 +83,27 @@ class _MediaBase(PaneBase):
         wavfile.write(buffer, self.sample_rate, data)
         return buffer
 
+    def _mime_type(self, fmt):
+        return '%s/%s' % (self._media_type, self._mime_subtypes.get(fmt, fmt))
+
     def _process_param_change(self, msg):
         msg = super(_MediaBase, self)._process_param_change(msg)
         if 'value' in msg:
             value = msg['value']
             if isinstance(value, np.ndarray):
                 fmt = 'wav'
-                buffer = self._from_numpy(value)
-                data = b64encode(buffer.getvalue())
+                data = self._from_numpy(value).getvalue()
+                url = state._asset_url(data, self._mime_type(fmt))
+                if url is not None:
+                    msg['value'] = url
+                    return msg
+                data = b64encode(data)
             elif os.path.isfile(value):
                 fmt = value.split('.')[-1]
+                url = state._asset_url(value, self._mime_type(fmt))
+                if url is not None:
+                    msg['value'] = url
+                    return msg
                 with open(value, 'rb') as f:
                     data = f.read()
                 data = b64encode(data)
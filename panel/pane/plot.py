@@ -118,6 +118,8 @@ class RGGPlot(PNG):
 
     _rerender_params = PNG._rerender_params + ['object', 'dpi', 'width', 'height']
 
+    _layout_params = ['alt_text', 'link_url', 'style', 'sizing_mode']
+
     @classmethod
     def applies(cls, obj):
         return type(obj).__name__ == 'GGPlot' and hasattr(obj, 'r_repr')
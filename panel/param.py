@@ -20,6 +20,7 @@ from bokeh.io import curdoc as _curdoc
 from param.parameterized import classlist
 
 from .io import state
+from .io.server import _DocumentAwaitable, unlocked
 from .layout import Row, Panel, Tabs, Column
 from .pane.base import PaneBase, ReplacementPane
 from .util import (
@@ -552,11 +553,14 @@ class ParamMethod(ReplacementPane):
     default ParamMethod will watch all parameters on the class owning
     the method or can be restricted to certain parameters by annotating
     the method using the param.depends decorator. The method may
-    return any object which itself can be rendered as a Pane.
+    return any object which itself can be rendered as a Pane and may
+    be declared with async def, in which case it is awaited on the
+    server or notebook event loop.
     """
 
     def __init__(self, object=None, **params):
         super(ParamMethod, self).__init__(object, **params)
+        self._evaluations = 0
         self._link_object_params()
         if object is not None:
             self._update_inner(self.eval(object))
@@ -576,6 +580,28 @@ class ParamMethod(ReplacementPane):
                 kwargs = {n: getattr(dep.owner, dep.name) for n, dep in kw_deps.items()}
         return function(*args, **kwargs)
 
+    def _update_inner(self, new_object):
+        self._evaluations += 1
+        if inspect.isawaitable(new_object):
+            state._schedule_async(self._eval_async, new_object,
+                                  self._evaluations, state.curdoc)
+            return
+        super(ParamMethod, self)._update_inner(new_object)
+
+    async def _eval_async(self, awaitable, evaluation, doc):
+        if doc is None or not doc.session_context:
+            new_object = await awaitable
+        else:
+            new_object = await _DocumentAwaitable(awaitable, doc)
+        if evaluation != self._evaluations:
+            # Discard results superseded by a more recent evaluation
+            return
+        if doc is None or not doc.session_context:
+            super(ParamMethod, self)._update_inner(new_object)
+            return
+        with state._unblock(doc), unlocked():
+            super(ParamMethod, self)._update_inner(new_object)
+
     def _update_pane(self, *events):
         callbacks = []
         for watcher in self._callbacks:
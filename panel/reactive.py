@@ -6,21 +6,32 @@ models rendered on the frontend.
 
 import difflib
 import threading
+import time
 
 from collections import namedtuple
 from functools import partial
 
 from tornado import gen
+from tornado.ioloop import IOLoop
 
 from .callbacks import PeriodicCallback
 from .config import config
+from .io.cache import _generate_hash
 from .io.model import hold
 from .io.notebook import push
+from .io.profile import profiled
 from .io.server import unlocked
 from .io.state import state
-from .util import edit_readonly
+from .util import edit_readonly, is_array_like
 from .viewable import Layoutable, Renderable, Viewable
 
+def _equal(a, b):
+    try:
+        return a is b or bool(a == b)
+    except Exception:
+        return False
+
+
 LinkWatcher = namedtuple("Watcher","inst cls fn mode onlychanged parameter_names what queued target links transformed")
 
 
@@ -45,6 +56,15 @@ class Syncable(Renderable):
     # Timeout before the first event is processed
     _debounce = 50
 
+    # Policy used to coalesce events received from the frontend, one
+    # of 'throttle', 'debounce' or 'latest' (defaults to config.event_policy),
+    # widgets expose it as the event_policy parameter
+    _event_policy = None
+
+    # Maximum time (in ms) the 'debounce' policy may defer events,
+    # widgets expose it as the max_wait parameter
+    _max_wait = None
+
     # Mapping from parameter name to bokeh model property name
     _rename = {}
 
@@ -56,10 +76,12 @@ class Syncable(Renderable):
         super(Syncable, self).__init__(**params)
         self._processing = False
         self._events = {}
+        self._event_times = (None, None)
         self._callbacks = []
         self._links = []
         self._link_params()
         self._changing = {}
+        self._shadow = {}
 
     # Allows defining a mapping from model property name to a JS code
     # snippet that transforms the object before serialization
@@ -127,6 +149,38 @@ class Syncable(Renderable):
     def _synced_params(self):
         return list(self.param)
 
+    def _shadow_update(self, ref, model, msg):
+        """
+        Returns the subset of the message which differs from the
+        values last sent to the model, recording the new values.
+        Array-like values are compared by a hash of their contents,
+        all other values must also equal the current value on the
+        model, e.g. to catch changes made on the frontend.
+        """
+        shadow_model, shadow = self._shadow.get(ref, (None, {}))
+        if shadow_model is not model:
+            shadow = {}
+            self._shadow[ref] = (model, shadow)
+        changed = {}
+        for attr, value in msg.items():
+            if is_array_like(value):
+                token = (True, _generate_hash(value))
+                unchanged = shadow.get(attr) == token
+            else:
+                token = (False, value)
+                unchanged = (
+                    attr in shadow and not shadow[attr][0] and
+                    _equal(shadow[attr][1], value) and
+                    _equal(getattr(model, attr, None), value)
+                )
+            if unchanged:
+                continue
+            shadow[attr] = token
+            changed[attr] = value
+        state._suppressed_updates += len(msg) - len(changed)
+        return changed
+
+    @profiled('update_model')
     def _update_model(self, events, msg, root, model, doc, comm):
         self._changing[root.ref['id']] = [
             attr for attr, value in msg.items()
@@ -141,6 +195,7 @@ class Syncable(Renderable):
         super(Syncable, self)._cleanup(root)
         ref = root.ref['id']
         self._models.pop(ref, None)
+        self._shadow.pop(ref, None)
         comm, client_comm = self._comms.pop(ref, (None, None))
         if comm:
             try:
@@ -153,6 +208,7 @@ class Syncable(Renderable):
             except Exception:
                 pass
 
+    @profiled('param_change')
     def _param_change(self, *events):
         msgs = []
         for event in events:
@@ -168,25 +224,83 @@ class Syncable(Renderable):
         for ref, (model, parent) in self._models.items():
             if ref not in state._views or ref in state._fake_roots:
                 continue
+            model_msg = self._shadow_update(ref, model, msg)
+            if not model_msg:
+                continue
             viewable, root, doc, comm = state._views[ref]
             if comm or not doc.session_context or state._unblocked(doc):
                 with unlocked():
-                    self._update_model(events, msg, root, model, doc, comm)
+                    self._update_model(events, model_msg, root, model, doc, comm)
                 if comm and 'embedded' not in root.tags:
                     push(doc, comm)
             else:
-                cb = partial(self._update_model, events, msg, root, model, doc, comm)
+                cb = partial(self._update_model, events, model_msg, root, model, doc, comm)
                 doc.add_next_tick_callback(cb)
 
+    @profiled('process_events')
     def _process_events(self, events):
         with edit_readonly(self):
             self.param.set_param(**self._process_property_change(events))
 
+    @property
+    def _policy(self):
+        return self._event_policy or config.event_policy
+
+    def _queue_event(self, attr, new):
+        """
+        Queues an event, only the latest value for each property is
+        retained until the queued events are processed.
+        """
+        now = time.time()*1000
+        first = self._event_times[0] if self._processing else now
+        self._event_times = (first, now)
+        self._events.update({attr: new})
+
+    def _schedule_change(self, doc, delay=None, comm=False):
+        """
+        Schedules processing of the queued events on the server or
+        notebook IOLoop after a delay determined by the event policy.
+        """
+        if delay is None:
+            delay = 0 if self._policy == 'latest' else self._debounce
+        if comm:
+            IOLoop.current().call_later(delay/1000., partial(self._comm_event, doc))
+        else:
+            doc.add_timeout_callback(partial(self._change_coroutine, doc), delay)
+
+    def _defer_change(self, doc, comm=False):
+        """
+        Applies the debounce policy by rescheduling event processing
+        until no new events were received for the debounce period or
+        the maximum wait time was exceeded. Returns whether the
+        event processing was deferred.
+        """
+        if self._policy != 'debounce':
+            return False
+        first, last = self._event_times
+        now = time.time()*1000
+        remaining = self._debounce - (now - last)
+        if self._max_wait is not None:
+            remaining = min(remaining, self._max_wait - (now - first))
+        if remaining <= 0:
+            return False
+        self._schedule_change(doc, remaining, comm)
+        return True
+
     @gen.coroutine
     def _change_coroutine(self, doc=None):
+        if self._defer_change(doc):
+            return
         self._change_event(doc)
 
+    @profiled('change_event')
     def _change_event(self, doc=None):
+        if doc is not None and doc.session_context and state._nthreads(doc):
+            events = self._events
+            self._events = {}
+            self._processing = False
+            state._execute(doc, partial(self._process_events, events))
+            return
         try:
             state.curdoc = doc
             thread = threading.current_thread()
@@ -194,31 +308,54 @@ class Syncable(Renderable):
             state._thread_id = thread_id
             events = self._events
             self._events = {}
-            self._process_events(events)
+            # Updates made by all callbacks are sent as one message
+            with unlocked():
+                self._process_events(events)
         finally:
             self._processing = False
             state.curdoc = None
             state._thread_id = None
 
+    def _comm_event(self, doc):
+        if self._defer_change(doc, comm=True):
+            return
+        try:
+            events = self._events
+            self._events = {}
+            with hold(doc):
+                self._process_events(events)
+        finally:
+            self._processing = False
+
     def _comm_change(self, doc, ref, attr, old, new):
         if attr in self._changing.get(ref, []):
             self._changing[ref].remove(attr)
             return
+        self._shadow.get(ref, (None, {}))[1].pop(attr, None)
 
-        with hold(doc):
-            self._process_events({attr: new})
+        if self._policy is None:
+            with hold(doc):
+                self._process_events({attr: new})
+            return
 
+        self._queue_event(attr, new)
+        if not self._processing:
+            self._processing = True
+            self._schedule_change(doc, comm=True)
+
+    @profiled('server_change')
     def _server_change(self, doc, ref, attr, old, new):
         if attr in self._changing.get(ref, []):
             self._changing[ref].remove(attr)
             return
+        self._shadow.get(ref, (None, {}))[1].pop(attr, None)
 
         state._locks.clear()
-        self._events.update({attr: new})
+        self._queue_event(attr, new)
         if not self._processing:
             self._processing = True
             if doc.session_context:
-                doc.add_timeout_callback(partial(self._change_coroutine, doc), self._debounce)
+                self._schedule_change(doc)
             else:
                 self._change_event(doc)
 
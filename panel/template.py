@@ -24,7 +24,7 @@ from .io.save import save
 from .io.state import state
 from .layout import Column
 from .models.comm_manager import CommManager
-from .pane import panel as _panel, HTML, Str, HoloViews
+from .pane import panel as _panel, HTML, Str
 from .viewable import ServableMixin, Viewable
 from .widgets import Button
 
@@ -112,7 +112,10 @@ class Template(param.Parameterized, ServableMixin):
             cls=cls, objs=('%s' % spacer).join(objs), spacer=spacer)
 
     def _init_doc(self, doc=None, comm=None, title=None, notebook=False):
+        from .pane.holoviews import HoloViews
         doc = doc or _curdoc()
+        if doc.session_context:
+            state._init_session(doc)
         title = title or 'Panel Application'
         doc.title = title
 
@@ -127,6 +130,7 @@ class Template(param.Parameterized, ServableMixin):
                 sub._models[ref] = sub._models.get(mref)
                 if isinstance(sub, HoloViews) and mref in sub._plots:
                     sub._plots[ref] = sub._plots.get(mref)
+                    sub._register_root(ref)
             col.objects.append(obj)
             obj._documents[doc] = model
             model.name = name
@@ -0,0 +1,242 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bokeh.document import Document
+
+from panel.io.cache import Cache, DiskCache, _generate_hash, cache
+from panel.io.state import state
+
+
+def test_generate_hash_arrays_and_dataframes():
+    arr = np.arange(10)
+    assert _generate_hash(arr) == _generate_hash(np.arange(10))
+    assert _generate_hash(arr) != _generate_hash(np.arange(11))
+
+    df = pd.DataFrame({'a': [1, 2, 3]})
+    assert _generate_hash(df) == _generate_hash(df.copy())
+    assert _generate_hash(df) != _generate_hash(df.rename(columns={'a': 'b'}))
+    assert _generate_hash({'a': 1, 'b': 2}) == _generate_hash({'b': 2, 'a': 1})
+
+
+def test_cache_lru_eviction():
+    c = Cache(max_items=2)
+    c.get('a', lambda: 1)
+    c.get('b', lambda: 2)
+    c.get('a', lambda: 3)
+    c.get('c', lambda: 4)
+
+    assert 'a' in c
+    assert 'b' not in c
+    assert c.info()['hits'] == 1
+    assert c.info()['misses'] == 3
+
+
+def test_cache_fifo_eviction():
+    c = Cache(max_items=2, policy='fifo')
+    c.get('a', lambda: 1)
+    c.get('b', lambda: 2)
+    c.get('a', lambda: 3)
+    c.get('c', lambda: 4)
+
+    assert 'a' not in c
+    assert 'b' in c
+
+
+def test_cache_lfu_eviction_keeps_new_key():
+    c = Cache(max_items=2, policy='lfu')
+    c.get('a', lambda: 1)
+    c.get('b', lambda: 2)
+    c.get('a', lambda: 1)
+    c.get('a', lambda: 1)
+    c.get('b', lambda: 2)
+    c.get('c', lambda: 3)
+
+    assert 'a' in c
+    assert 'b' not in c
+    assert 'c' in c
+    assert c.get('c', lambda: 4) == 3
+
+
+def test_cache_lfu_eviction_ties_evict_oldest():
+    c = Cache(max_items=2, policy='lfu')
+    c.get('a', lambda: 1)
+    c.get('b', lambda: 2)
+    c.get('c', lambda: 3)
+
+    assert 'a' not in c
+    assert 'b' in c
+    assert 'c' in c
+
+
+def test_cache_ttl_expiry():
+    c = Cache(ttl=0.01)
+    c.get('a', lambda: 1)
+    time.sleep(0.02)
+
+    assert 'a' not in c
+    assert c.get('a', lambda: 2) == 2
+
+
+def test_cache_invalid_policy():
+    with pytest.raises(ValueError):
+        Cache(policy='random')
+
+
+def test_cache_failing_function_releases_key_lock():
+    c = Cache()
+
+    def fail():
+        raise RuntimeError('failed')
+
+    with pytest.raises(RuntimeError):
+        c.get('a', fail)
+    assert 'a' not in c._key_locks
+    assert c.get('a', lambda: 1) == 1
+
+
+def test_cache_configure_evicts_items():
+    c = Cache()
+    for key in 'abc':
+        c.get(key, lambda: 1)
+    c.configure(max_items=1, policy='fifo')
+
+    assert 'c' in c
+    assert len(c) == 1
+    assert c.info()['policy'] == 'fifo'
+
+
+def test_io_cache_submodule_not_shadowed():
+    import panel
+    import panel.io.cache as cache_module
+    assert cache_module.Cache is Cache
+    assert panel.cache is cache
+
+
+def test_cache_decorator():
+    calls = []
+
+    @cache(max_items=5)
+    def fn(arr, offset=0):
+        calls.append(offset)
+        return arr.sum() + offset
+
+    arr = np.arange(5)
+    assert fn(arr) == 10
+    assert fn(np.arange(5)) == 10
+    assert fn(arr, offset=1) == 11
+    assert calls == [0, 1]
+    assert fn.cache_info()['hits'] == 1
+    fn.clear()
+
+
+def test_cache_decorator_closures():
+    def make(value):
+        @cache
+        def fn():
+            return value
+        return fn
+
+    assert make(1)() == 1
+    assert make(2)() == 2
+
+
+def test_cache_decorator_app_scripts_share_cache():
+    import types
+    source = "from panel.io.cache import cache\n@cache\ndef fn(a):\n    calls.append(a)\n    return a\n"
+    code = compile(source, '/app/script.py', 'exec')
+    calls = []
+    fns = []
+    for name in ('bokeh_app_1', 'bokeh_app_2'):
+        module = types.ModuleType(name)
+        module.calls = calls
+        exec(code, module.__dict__)
+        fns.append(module.fn)
+    assert fns[0](1) == 1
+    assert fns[1](1) == 1
+    assert calls == [1]
+    assert fns[1].cache_info()['hits'] == 1
+    fns[0].clear()
+
+
+def test_as_cached_session_scope():
+    calls = []
+
+    def fn(value=0):
+        calls.append(value)
+        return value
+
+    doc1, doc2 = Document(), Document()
+    try:
+        for doc in (doc1, doc2, doc1):
+            state.curdoc = doc
+            assert state.as_cached('test_session', fn, scope='session', value=1) == 1
+    finally:
+        state.curdoc = None
+
+    assert calls == [1, 1]
+    assert len(state._session_caches[doc1]['test_session']) == 1
+
+
+def test_as_cached_reconfigures_existing_key():
+    try:
+        state.as_cached('test_reconfigure', lambda value: value, value=1)
+        state.as_cached('test_reconfigure', lambda value: value, value=2)
+        assert len(state._memo_cache['test_reconfigure']) == 2
+        state.as_cached('test_reconfigure', lambda value: value, max_items=1,
+                        ttl=10, value=3)
+        cache = state._memo_cache['test_reconfigure']
+        assert cache.max_items == 1
+        assert cache.ttl == 10
+        assert len(cache) == 1
+    finally:
+        state._memo_cache.pop('test_reconfigure', None)
+
+
+def _write_cache(cache):
+    cache['df'] = pd.DataFrame({'a': [1, 2, 3]})
+
+
+def test_disk_cache_shared_between_processes(tmpdir):
+    import multiprocessing as mp
+    cache = DiskCache(str(tmpdir))
+    proc = mp.get_context('fork').Process(target=_write_cache, args=(cache,))
+    proc.start()
+    proc.join()
+
+    assert 'df' in cache
+    assert list(cache) == ['df']
+    df = cache['df']
+    assert df.a.tolist() == [1, 2, 3]
+    assert cache['df'] is df
+
+    cache['df'] = 'replaced'
+    assert DiskCache(str(tmpdir))['df'] == 'replaced'
+    del cache['df']
+    assert len(cache) == 0
+    with pytest.raises(KeyError):
+        cache['df']
+
+
+def test_disk_cache_unpicklable_value(tmpdir):
+    cache = DiskCache(str(tmpdir))
+    with pytest.raises(TypeError) as excinfo:
+        cache['fn'] = lambda x: x
+    assert 'picklable' in str(excinfo.value)
+    assert 'fn' not in cache
+    assert tmpdir.listdir() == []
+
+
+def test_share_cache_copies_state_cache():
+    from panel.io.server import _share_cache
+    old = state.cache
+    state.cache = {'data': [1, 2, 3]}
+    try:
+        _share_cache()
+        assert isinstance(state.cache, DiskCache)
+        assert state.cache['data'] == [1, 2, 3]
+    finally:
+        state.cache = old
+
@@ -1,17 +1,21 @@
 from __future__ import absolute_import, division, unicode_literals, print_function
 
 import os
+import gzip
 import json
 import glob
+import struct
 
 from io import StringIO
 
-from bokeh.models import CustomJS
+import numpy as np
+
+from bokeh.models import ColumnDataSource, CustomJS
 
 from panel import Row
 from panel.config import config
-from panel.io.embed import embed_state
-from panel.pane import Str
+from panel.io.embed import embed_state, encode_record, record_events
+from panel.pane import Markdown, Str
 from panel.param import Param
 from panel.widgets import Select, FloatSlider, Checkbox
 
@@ -394,7 +398,8 @@ def test_save_embed_json(tmpdir):
     json_files = sorted(glob.glob(os.path.join(paths[0], '*.json')))
     assert len(json_files) == 2
 
-    for jf, v in zip(json_files, ('False', 'True')):
+    values = []
+    for jf in json_files:
         with open(jf) as f:
             state = json.load(f)
         assert 'content' in state
@@ -404,4 +409,189 @@ def test_save_embed_json(tmpdir):
         event = events[0]
         assert event['kind'] == 'ModelChanged'
         assert event['attr'] == 'text'
-        assert event['new'] == '&lt;pre&gt;%s&lt;/pre&gt;' % v
+        values.append(event['new'])
+    assert sorted(values) == ['&lt;pre&gt;%s&lt;/pre&gt;' % v for v in ('False', 'True')]
+
+
+def test_save_embed_json_deduplicates_states(tmpdir):
+    select = Select(options=['A', 'B', 'C', 'D'])
+    string = Str()
+    def link(target, event):
+        target.object = {'C': 'A', 'D': 'B'}.get(event.new, event.new)
+    select.link(string, callbacks={'value': link})
+    panel = Row(select, string)
+    filename = os.path.join(str(tmpdir), 'test.html')
+    panel.save(filename, embed=True, embed_json=True,
+               save_path=str(tmpdir))
+    paths = glob.glob(os.path.join(str(tmpdir), '*'))
+    paths.remove(filename)
+    assert len(paths) == 1
+    json_files = glob.glob(os.path.join(paths[0], '*.json'))
+    assert len(json_files) == 2
+
+
+def decode_record(record):
+    frames, offset = [], 0
+    while offset < len(record):
+        binary, length = struct.unpack('<BI', record[offset:offset+5])
+        data = record[offset+5:offset+5+length]
+        frames.append(data if binary else data.decode('utf-8'))
+        offset += 5+length
+    return frames
+
+
+def test_embed_shards(document, comm, tmpdir):
+    select = Select(options=['A', 'B', 'C', 'D'])
+    string = Str()
+    mapping = {'C': 'A', 'D': 'B'}
+    def link(target, event):
+        target.object = mapping.get(event.new, event.new)
+    select.link(string, callbacks={'value': link})
+    panel = Row(select, string)
+    with config.set(embed=True, embed_format='shards'):
+        model = panel.get_root(document, comm)
+        embed_state(panel, model, document, json=True,
+                    save_path=str(tmpdir), progress=False)
+    _, state = document.roots
+    assert not state.json
+    assert len(state.shards) == 1
+    assert set(state.state) == {'A', 'B', 'C', 'D'}
+    assert state.state['A'] == state.state['C']
+    assert state.state['B'] == state.state['D']
+
+    with open(state.shards[0], 'rb') as f:
+        shard = gzip.decompress(f.read())
+    for value, (_, offset, length) in state.state.items():
+        header, metadata, content = decode_record(shard[offset:offset+length])
+        assert 'msgid' not in json.loads(header)
+        event = json.loads(content)['events'][0]
+        assert event['attr'] == 'text'
+        assert event['new'] == '&lt;pre&gt;%s&lt;/pre&gt;' % mapping.get(value, value)
+
+
+def test_embed_format_overrides_config(document, comm, tmpdir):
+    select = Select(options=['A', 'B'])
+    string = Str()
+    def link(target, event):
+        target.object = event.new
+    select.link(string, callbacks={'value': link})
+    panel = Row(select, string)
+    with config.set(embed=True, embed_format='json'):
+        model = panel.get_root(document, comm)
+        embed_state(panel, model, document, json=True, save_path=str(tmpdir),
+                    progress=False, embed_format='shards')
+    _, state = document.roots
+    assert not state.json
+    assert len(state.shards) == 1
+
+
+def test_record_events_binary_buffers(document):
+    cds = ColumnDataSource(data={'x': np.arange(3.)})
+    document.add_root(cds)
+    records = []
+    for _ in range(2):
+        document.hold()
+        cds.data = {'x': np.arange(100.)}
+        records.append(encode_record(record_events(document, binary=True)))
+    assert records[0] == records[1]
+    header, metadata, content, buffer_header, buffer = decode_record(records[0])
+    assert json.loads(header)['num_buffers'] == 1
+    assert json.loads(content)['events'][0]['new']['x']['__buffer__'] == '0'
+    assert json.loads(buffer_header) == {'id': '0'}
+    np.testing.assert_array_equal(np.frombuffer(buffer), np.arange(100.))
+
+
+def test_embed_independent_widgets(document, comm):
+    select1 = Select(options=['A', 'B', 'C'])
+    select2 = Select(options=['D', 'E', 'F'])
+    string1, string2 = Str(), Str()
+    def link(target, event):
+        target.object = event.new
+    select1.link(string1, callbacks={'value': link})
+    select2.link(string2, callbacks={'value': link})
+    panel = Row(select1, select2, string1, string2)
+    with config.set(embed=True):
+        model = panel.get_root(document, comm)
+    embed_state(panel, model, document)
+    _, state1, state2 = document.roots
+    for state, string, options in ((state1, 1, 'ABC'), (state2, 2, 'DEF')):
+        assert set(state.state) == set(options)
+        assert state.values == [options[0]]
+        for k, v in state.state.items():
+            events = json.loads(v['content'])['events']
+            assert len(events) == 1
+            event = events[0]
+            assert event['model'] == model.children[string+1].ref
+            assert event['new'] == '&lt;pre&gt;%s&lt;/pre&gt;' % k
+
+
+def test_embed_dependent_widgets(document, comm):
+    select1 = Select(options=['A', 'B', 'C'])
+    select2 = Select(options=['D', 'E', 'F'])
+    string = Str()
+    def link(target, event):
+        target.object = select1.value + select2.value
+    select1.link(string, callbacks={'value': link})
+    select2.link(string, callbacks={'value': link})
+    panel = Row(select1, select2, string)
+    with config.set(embed=True):
+        model = panel.get_root(document, comm)
+    embed_state(panel, model, document)
+    _, state = document.roots
+    assert set(state.state) == {'A', 'B', 'C'}
+    for k1, v1 in state.state.items():
+        assert set(v1) == {'D', 'E', 'F'}
+        for k2, v2 in v1.items():
+            events = json.loads(v2['content'])['events']
+            assert events[-1]['new'] == '&lt;pre&gt;%s%s&lt;/pre&gt;' % (k1, k2)
+
+
+def test_embed_widgets_coupled_at_other_value(document, comm):
+    select1 = Select(options=['A', 'B', 'C'])
+    select2 = Select(options=['D', 'E', 'F'])
+    string1, string2 = Str(), Str()
+    def link1(target, event):
+        target.object = event.new
+    def link2(target, event):
+        # Only reads select1 once select2 is set to F
+        target.object = event.new + (select1.value if event.new == 'F' else '')
+    select1.link(string1, callbacks={'value': link1})
+    select2.link(string2, callbacks={'value': link2})
+    panel = Row(select1, select2, string1, string2)
+    with config.set(embed=True):
+        model = panel.get_root(document, comm)
+    embed_state(panel, model, document)
+    _, state = document.roots
+    assert set(state.state) == {'A', 'B', 'C'}
+    for k1, v1 in state.state.items():
+        assert set(v1) == {'D', 'E', 'F'}
+        events = json.loads(v1['F']['content'])['events']
+        assert events[-1]['new'] == '&lt;pre&gt;F%s&lt;/pre&gt;' % k1
+
+
+def test_embed_new_panes_unique_ids(document, comm):
+    select = Select(options=['A', 'B', 'C'])
+    row = Row(select, Str())
+    def update(event):
+        row[1] = Markdown('value '+event.new) if event.new == 'B' else Str(event.new)
+    select.param.watch(update, 'value')
+    with config.set(embed=True):
+        model = row.get_root(document, comm)
+        embed_state(row, model, document, progress=False)
+    _, state = document.roots
+    assert set(state.state) == {'A', 'B', 'C'}
+
+    existing = {m.id for m in document.roots[0].references()}
+    created = {}
+    for key, record in state.state.items():
+        content = json.loads(record['content'])
+        refs = {ref['id']: ref for ref in content['references']}
+        for ref in refs.values():
+            # Models created in one state must not be reused for a
+            # different model in another state
+            assert created.setdefault(ref['id'], ref['type']) == ref['type']
+        for event in content['events']:
+            assert event['model']['id'] in existing or event['model']['id'] in refs
+            new = event.get('new')
+            for child in (new if isinstance(new, list) else []):
+                assert child['id'] in existing or child['id'] in refs
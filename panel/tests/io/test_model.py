@@ -1,6 +1,14 @@
-from bokeh.models import ColumnDataSource
+import json
 
-from panel.io.model import patch_cds_msg
+from bokeh.document import Document
+from bokeh.document.events import (
+    ColumnDataChangedEvent, ColumnsPatchedEvent, ColumnsStreamedEvent
+)
+from bokeh.models import ColumnDataSource, Div, Row as BkRow
+
+from panel.io.model import add_to_doc, collapse_events, diff, hold, patch_cds_msg
+from panel.layout import Row
+from panel.widgets import TextInput
 
 def test_patch_cds_typed_array():
     cds = ColumnDataSource()
@@ -40,3 +48,145 @@ def test_patch_cds_typed_array():
     }
     patch_cds_msg(cds, msg)
     assert msg == expected
+
+
+def test_collapse_events_latest_property_change():
+    doc = Document()
+    cds = ColumnDataSource()
+    doc.add_root(cds)
+    doc.hold('collect')
+    for i in range(10):
+        cds.name = str(i)
+    cds.tags = ['a']
+    cds.name = 'final'
+    events = collapse_events(doc._held_events)
+    assert [(e.attr, e.new) for e in events] == [('name', 'final'), ('tags', ['a'])]
+
+
+def test_collapse_events_adds_children_before_modifying_them():
+    doc = Document()
+    row, m1, m2 = BkRow(), Div(), Div()
+    doc.add_root(row)
+    doc.hold('collect')
+    row.children = [m1]
+    m1.text = 'a'
+    row.children = [m1, m2]
+    events = collapse_events(doc._held_events)
+    assert [(e.model, e.attr) for e in events] == [(row, 'children'), (m1, 'text')]
+    assert events[0].new == [m1, m2]
+
+
+def test_collapse_events_drops_changes_to_removed_models():
+    doc = Document()
+    row, m1, m2 = BkRow(), BkRow(), Div()
+    doc.add_root(row)
+    doc.hold('collect')
+    row.children = [m1]
+    m1.children = [m2]
+    row.children = []
+    events = collapse_events(doc._held_events)
+    assert [(e.model, e.attr) for e in events] == [(row, 'children')]
+
+
+def test_collapse_events_merges_streams():
+    doc = Document()
+    cds = ColumnDataSource(data={'a': [0], 'b': ['A']})
+    doc.add_root(cds)
+    doc.hold('collect')
+    cds.stream({'a': [1], 'b': ['B']}, rollover=10)
+    cds.stream({'a': [2, 3], 'b': ['C', 'D']}, rollover=10)
+    events = collapse_events(doc._held_events)
+    assert len(events) == 1
+    assert isinstance(events[0].hint, ColumnsStreamedEvent)
+    assert events[0].hint.data == {'a': [1, 2, 3], 'b': ['B', 'C', 'D']}
+    assert events[0].hint.rollover == 10
+
+
+def test_collapse_events_does_not_merge_streams_with_different_rollover():
+    doc = Document()
+    cds = ColumnDataSource(data={'a': [0]})
+    doc.add_root(cds)
+    doc.hold('collect')
+    cds.stream({'a': [1]}, rollover=10)
+    cds.stream({'a': [2]}, rollover=2)
+    assert len(collapse_events(doc._held_events)) == 2
+
+
+def test_collapse_events_merges_patches():
+    doc = Document()
+    cds = ColumnDataSource(data={'a': [0, 1, 2]})
+    doc.add_root(cds)
+    doc.hold('collect')
+    cds.patch({'a': [(0, 3)]})
+    cds.patch({'a': [(1, 4), (0, 5)]})
+    events = collapse_events(doc._held_events)
+    assert len(events) == 1
+    assert isinstance(events[0].hint, ColumnsPatchedEvent)
+    assert events[0].hint.patches == {'a': [(0, 3), (1, 4), (0, 5)]}
+
+
+def test_collapse_events_data_supersedes_streams():
+    doc = Document()
+    cds = ColumnDataSource(data={'a': [0]})
+    doc.add_root(cds)
+    doc.hold('collect')
+    cds.stream({'a': [1]})
+    cds.patch({'a': [(0, 3)]})
+    cds.data = {'a': [4]}
+    cds.stream({'a': [5]})
+    events = collapse_events(doc._held_events)
+    assert len(events) == 2
+    assert isinstance(events[0].hint, ColumnDataChangedEvent)
+    assert events[1].hint.data == {'a': [5]}
+
+
+def test_diff_collapses_and_clears_held_events():
+    doc = Document()
+    cds = ColumnDataSource()
+    doc.add_root(cds)
+    doc.hold('collect')
+    cds.name = 'A'
+    cds.name = 'B'
+    msg = diff(doc, binary=False)
+    assert doc._held_events == []
+    events = msg.content['events']
+    assert len(events) == 1
+    assert events[0]['new'] == 'B'
+
+
+def test_hold_notebook_pushes_once(document, comm):
+    widgets = [TextInput() for _ in range(5)]
+    row = Row(*widgets)
+    model = row.get_root(document, comm)
+    add_to_doc(model, document, True)
+    document._held_events = []
+    msgs = []
+    comm.send = lambda data=None, metadata=None, buffers=[]: msgs.append(data)
+
+    with hold():
+        for i, widget in enumerate(widgets):
+            widget.value = str(i)
+        assert msgs == []
+
+    header, metadata, content = msgs
+    events = json.loads(content)['events']
+    assert [e['new'] for e in events] == ['0', '1', '2', '3', '4']
+    assert document._held_events == []
+
+
+def test_hold_as_decorator(document, comm):
+    widget = TextInput()
+    model = widget.get_root(document, comm)
+    add_to_doc(model, document, True)
+    msgs = []
+    comm.send = lambda data=None, metadata=None, buffers=[]: msgs.append(data)
+
+    @hold()
+    def update():
+        widget.value = 'A'
+        widget.placeholder = 'B'
+        assert msgs == []
+
+    update()
+    assert len(msgs) == 3
+    assert len(json.loads(msgs[2])['events']) == 2
@@ -0,0 +1,63 @@
+import json
+
+from panel.config import config
+from panel.io.model import add_to_doc
+from panel.io.state import state
+from panel.layout import Column, Row
+from panel.widgets import TextInput
+
+
+def test_profile_disabled_records_nothing(document, comm):
+    state._timings.clear()
+    widget = TextInput()
+    add_to_doc(widget.get_root(document, comm), document, hold=True)
+    widget.value = 'A'
+    assert len(state._timings) == 0
+
+
+def test_profile_records_phases_and_message_sizes(document, comm):
+    state._timings.clear()
+    widget = TextInput()
+    with config.set(profile=True):
+        add_to_doc(widget.get_root(document, comm), document, hold=True)
+        widget.value = 'A'
+        widget.value = 'B'
+
+    stats = state.timing_stats
+    assert stats[('TextInput', 'param_change')]['count'] == 2
+    assert stats[('TextInput', 'update_model')]['count'] == 2
+    push = stats[('Document', 'push')]
+    assert push['count'] == 2
+    assert push['size'] > 0
+    for info in stats.values():
+        assert info['p50'] <= info['p90'] <= info['p99'] <= info['max']
+
+
+def test_profile_records_override_once(document, comm):
+    state._timings.clear()
+    row = Row()
+    with config.set(profile=True):
+        add_to_doc(row.get_root(document, comm), document, hold=True)
+        row.append('A')
+    assert state.timing_stats[('Row', 'update_model')]['count'] == 1
+
+
+def test_profile_dump_trace(document, comm, tmpdir):
+    state._timings.clear()
+    col = Column(TextInput())
+    with config.set(profile=True):
+        add_to_doc(col.get_root(document, comm), document, hold=True)
+        col[0].value = 'A'
+        col.append('B')
+    filename = str(tmpdir.join('trace.json'))
+    state.dump_trace(filename, doc=document)
+    with open(filename) as f:
+        trace = json.load(f)
+    events = trace['traceEvents']
+    assert {'TextInput.update_model', 'Column.update_model', 'Document.push'} <= {
+        event['name'] for event in events}
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+
+    state.dump_trace(filename, doc=object())
+    with open(filename) as f:
+        assert json.load(f)['traceEvents'] == []
@@ -135,6 +135,22 @@ def test_layout_append(panel, document, comm):
     assert model.children == [div1, div2, div3]
 
 
+@pytest.mark.parametrize('panel', [Column, Row])
+def test_layout_update_reuses_unchanged_models(panel, document, comm):
+    layout = panel(*(Div() for _ in range(5)))
+
+    model = layout.get_root(document, comm=comm)
+    children = list(model.children)
+    removed = layout[1]
+
+    layout.pop(1)
+    layout.insert(3, Div())
+
+    assert model.children[:3] == [children[0]] + children[2:4]
+    assert model.children[4] is children[4]
+    assert model.ref['id'] not in removed._models
+
+
 @pytest.mark.parametrize('panel', [Column, Row])
 def test_layout_extend(panel, document, comm):
     div1 = Div()
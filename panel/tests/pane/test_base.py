@@ -1,5 +1,10 @@
 from __future__ import absolute_import
 
+import subprocess
+import sys
+
+from importlib import import_module
+
 import pytest
 
 import param
@@ -10,6 +15,9 @@ from panel.param import ParamMethod
 from panel.tests.util import check_layoutable_properties, py3_only
 
 
+for module, _, _ in PaneBase._lazy_modules:
+    import_module(module)
+
 all_panes = [w for w in param.concrete_descendents(PaneBase).values()
              if not w.__name__.startswith('_') and not
              issubclass(w, (Bokeh, HoloViews, ParamMethod, interactive))
@@ -51,3 +59,61 @@ def test_pane_signature(pane):
     assert len(parameters) == 2
     assert 'object' in parameters
     assert parameters['object'] == Parameter('object', Parameter.POSITIONAL_OR_KEYWORD, default=None)
+
+
+def test_pane_type_cached_by_type():
+    PaneBase._type_cache.clear()
+    assert PaneBase.get_pane_type(1) is PaneBase.get_pane_type(2)
+    assert int in PaneBase._type_cache
+
+
+def test_pane_type_not_cached_for_value_types():
+    PaneBase._type_cache.clear()
+    PaneBase.get_pane_type('**Markdown**')
+    PaneBase.get_pane_type([1, 2, 3])
+    assert str not in PaneBase._type_cache
+    assert list not in PaneBase._type_cache
+
+
+def test_pane_type_cache_reset_on_new_pane_type():
+    class Custom(object):
+        pass
+
+    assert PaneBase.get_pane_type(Custom()) is not PaneBase
+
+    class CustomPane(PaneBase):
+
+        priority = 0.9
+
+        @classmethod
+        def applies(cls, obj):
+            return isinstance(obj, Custom)
+
+    assert PaneBase.get_pane_type(Custom()) is CustomPane
+
+
+def test_optional_panes_imported_lazily():
+    code = (
+        "import sys, panel as pn;"
+        "lazy = ['panel.pane.vega', 'panel.pane.holoviews', 'panel.pane.streamz'];"
+        "print([m in sys.modules for m in lazy]);"
+        "print(type(pn.panel({'$schema': 'https://vega.github.io/schema/vega-lite/v4.json'})).__name__);"
+        "print([m in sys.modules for m in lazy])"
+    )
+    out = subprocess.check_output([sys.executable, '-c', code]).decode('utf-8').split()
+    assert out == ['[False,', 'False,', 'False]', 'Vega', '[True,', 'False,', 'False]']
+
+
+def test_optional_panes_not_imported_for_other_objects():
+    code = (
+        "import sys, panel as pn;"
+        "lazy = ['panel.pane.deckgl', 'panel.pane.plotly', 'panel.pane.vega', 'panel.pane.vtk'];"
+        "print(type(pn.panel('x')).__name__);"
+        "print(type(pn.panel({'a': 1})).__name__);"
+        "print([m in sys.modules for m in lazy]);"
+        "print(pn.pane.PaneBase.get_pane_type({'data': [], 'layout': {}}).__name__);"
+        "print([m in sys.modules for m in lazy])"
+    )
+    out = subprocess.check_output([sys.executable, '-c', code]).decode('utf-8').split()
+    assert out == ['Markdown', 'JSON', '[False,', 'False,', 'False,', 'False]',
+                   'Plotly', '[False,', 'True,', 'False,', 'False]']
@@ -407,6 +407,38 @@ def test_holoviews_linked_axes(document, comm):
     assert p1.y_range is p2.y_range
 
 
+@hv_available
+def test_holoviews_root_panes_index(document, comm):
+    hv1 = HoloViews(hv.Curve([1, 2, 3]), backend='bokeh')
+    hv2 = HoloViews(hv.Curve([1, 2, 3]), backend='bokeh')
+    layout = Row(hv1, hv2)
+
+    row_model = layout.get_root(document, comm=comm)
+    ref = row_model.ref['id']
+
+    assert HoloViews._get_root_panes(ref) == [hv1, hv2]
+
+    layout.pop(0)
+    assert HoloViews._get_root_panes(ref) == [hv2]
+
+    layout._cleanup(row_model)
+    assert ref not in HoloViews._root_panes
+
+
+@hv_available
+def test_holoviews_linked_axes_after_adding_item(document, comm):
+    layout = Row(HoloViews(hv.Curve([1, 2, 3]), backend='bokeh'))
+
+    row_model = layout.get_root(document, comm=comm)
+
+    layout.append(HoloViews(hv.Curve([1, 2, 3]), backend='bokeh'))
+
+    p1, p2 = row_model.select({'type': Figure})
+
+    assert p1.x_range is p2.x_range
+    assert p1.y_range is p2.y_range
+
+
 @hv_available
 def test_holoviews_linked_x_axis(document, comm):
     c1 = hv.Curve([1, 2, 3])
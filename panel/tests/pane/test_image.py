@@ -118,3 +118,79 @@ def test_image_link_url(document, comm):
     model = image_pane.get_root(document, comm)
 
     assert model.text.startswith('&lt;a href=&quot;http://anaconda.org&quot;')
+
+
+def _logo_path():
+    return os.path.join(os.path.dirname(__file__), '..', 'test_data', 'logo.png')
+
+
+def test_jpg_imgshape_from_header():
+    header = (b'\xff\xd8' + b'\xff\xe0\x00\x10' + b'JFIF\x00' + b'\x00'*9 +
+              b'\xff\xc0\x00\x11\x08\x00\x02\x00\x03' + b'\x00'*12)
+    assert JPG._imgshape(header) == (3, 2)
+
+
+def test_image_file_memory_mapped(document, comm):
+    png = PNG(_logo_path())
+    png._mmap_threshold = 0
+    model = png.get_root(document, comm)
+
+    with open(_logo_path(), 'rb') as f:
+        data = f.read()
+    assert (model.width, model.height) == PNG._imgshape(data)
+    assert b64encode(data).decode('utf-8') in model.text
+
+
+def test_image_payload_reused_on_layout_change(document, comm):
+    png = PNG(_logo_path())
+    model = png.get_root(document, comm)
+    payload = png._payload
+
+    png.width = 100
+    assert png._payload is payload
+    assert model.width == 100
+
+    png.embed = False
+    assert png._payload is not payload
+    assert 'logo.png' in model.text
+
+
+def test_image_file_like_payload_reused(document, comm):
+    with open(_logo_path(), 'rb') as f:
+        buffer = BytesIO(f.read())
+    png = PNG(buffer)
+    model = png.get_root(document, comm)
+    text = model.text
+
+    png.sizing_mode = 'stretch_width'
+    assert text.split('width')[0] == model.text.split('width')[0]
+
+
+def test_image_file_shape_reads_header_only(tmpdir):
+    with open(_logo_path(), 'rb') as f:
+        shape = PNG(_logo_path())._file_shape(f)
+        assert f.tell() == 24
+        f.seek(0)
+        assert shape == PNG._imgshape(f.read())
+
+    path = str(tmpdir.join('image.jpg'))
+    with open(path, 'wb') as f:
+        f.write(b'\xff\xd8' + b'\xff\xe1\xff\xfe' + b'\x00'*65532 +
+                b'\xff\xc0\x00\x11\x08\x00\x02\x00\x03' + b'\x00'*100000)
+    with open(path, 'rb') as f:
+        assert JPG(path)._file_shape(f) == (3, 2)
+        assert f.tell() < 65550
+
+
+def test_image_shape_cache_bounded(document, comm, tmpdir, monkeypatch):
+    monkeypatch.setattr(PNG, '_shape_cache', type(PNG._shape_cache)())
+    monkeypatch.setattr(PNG, '_shape_cache_size', 2)
+    with open(_logo_path(), 'rb') as f:
+        data = f.read()
+    paths = []
+    for i in range(3):
+        paths.append(str(tmpdir.join('logo%d.png' % i)))
+        with open(paths[-1], 'wb') as f:
+            f.write(data)
+        PNG(paths[-1], embed=False).get_root(document, comm)
+    assert [key[0] for key in PNG._shape_cache] == [os.path.abspath(p) for p in paths[1:]]
@@ -1,4 +1,4 @@
-from panel.cli import transform_cmds
+from panel.cli import num_procs, transform_cmds
 
 def test_transformation():
     args = ['panel', 'serve', '.',
@@ -8,3 +8,11 @@ def test_transformation():
     expected = ['panel', 'serve', '.', '--allow-websocket-origin', 'host.examplehost.com', '--port', '8086']
     remapped_args = transform_cmds(args)
     assert remapped_args == expected
+
+
+def test_num_procs():
+    assert num_procs(['panel', 'serve', 'app.py']) == 1
+    assert num_procs(['panel', 'serve', 'app.py', '--num-procs', '4']) == 4
+    assert num_procs(['panel', 'serve', 'app.py', '--num-procs=0']) == 0
+    assert num_procs(['panel', 'serve', 'app.py', '--num-procs', 'four']) == 1
+    assert num_procs(['panel', 'serve', 'app.py', '--num-procs=']) == 1
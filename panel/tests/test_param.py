@@ -1,5 +1,6 @@
 from __future__ import print_function
 
+import asyncio
 import os
 
 import param
@@ -8,6 +9,7 @@ from bokeh.models import (
     Div, Slider, Select, RangeSlider, MultiSelect, Row as BkRow,
     CheckboxGroup, Toggle, Button, TextInput as BkTextInput,
     Tabs as BkTabs, Column as BkColumn, TextInput)
+from tornado.ioloop import IOLoop
 from panel.pane import Pane, PaneBase, Matplotlib, Bokeh, HTML
 from panel.layout import Tabs, Row
 from panel.param import Param, ParamMethod, ParamFunction, JSONInit
@@ -844,6 +846,28 @@ def test_param_function_pane(document, comm):
     assert inner_pane._models == {}
 
 
+def test_param_function_pane_async(document, comm):
+    test = View()
+
+    @param.depends(test.param.a)
+    async def view(a):
+        await asyncio.sleep(0)
+        return Div(text='%d' % a)
+
+    loop = IOLoop.current()
+    pane = Pane(view)
+    row = pane.get_root(document, comm=comm)
+    loop.run_sync(lambda: asyncio.sleep(0.01))
+
+    assert row.children[0].text == '0'
+
+    test.a = 5
+    test.a = 6
+    loop.run_sync(lambda: asyncio.sleep(0.01))
+
+    assert row.children[0].text == '6'
+
+
 def test_param_function_pane_update(document, comm):
     test = View()
 
@@ -1,8 +1,10 @@
 from functools import partial
 
+import numpy as np
 import param
 
-from bokeh.models import Div
+from bokeh.models import ColumnDataSource, Div
+from panel.io.state import state
 from panel.layout import Tabs, WidgetBox
 from panel.reactive import Reactive
 from panel.viewable import Layoutable
@@ -83,6 +85,98 @@ def test_link_properties_server(document):
     assert cb.func == obj._server_change
 
 
+def test_comm_change_event_policy_coalesces_events(document, comm):
+
+    class ReactiveLink(Reactive):
+
+        text = param.String(default='A')
+
+    obj = ReactiveLink()
+    obj._event_policy = 'latest'
+    scheduled = []
+    obj._schedule_change = lambda doc, delay=None, comm=False: scheduled.append(comm)
+
+    obj._comm_change(document, 'ref', 'text', 'A', 'B')
+    obj._comm_change(document, 'ref', 'text', 'B', 'C')
+
+    assert obj.text == 'A'
+    assert scheduled == [True]
+
+    obj._comm_event(document)
+
+    assert obj.text == 'C'
+    assert not obj._processing
+
+
+def test_debounce_event_policy_defers_change(document):
+
+    class ReactiveLink(Reactive):
+
+        text = param.String(default='A')
+
+    obj = ReactiveLink()
+    obj._event_policy = 'debounce'
+    obj._debounce = 10000
+    scheduled = []
+    obj._schedule_change = lambda doc, delay=None, comm=False: scheduled.append(delay)
+
+    obj._queue_event('text', 'B')
+    obj._processing = True
+
+    assert obj._defer_change(document)
+    assert 0 < scheduled[0] <= 10000
+
+    obj._max_wait = 0
+    assert not obj._defer_change(document)
+
+
+def test_param_change_suppresses_unchanged_values(document, comm):
+    text_input = TextInput(value='A')
+    model = text_input.get_root(document, comm)
+    suppressed = state.suppressed_updates
+
+    text_input.value = 'B'
+    assert model.value == 'B'
+    assert state.suppressed_updates == suppressed
+
+    updates = []
+    model.on_change('value', lambda attr, old, new: updates.append(new))
+    text_input.param.trigger('value')
+    assert updates == []
+    assert state.suppressed_updates == suppressed+1
+
+    # Changes made on the frontend invalidate the shadow
+    model.value = 'C'
+    text_input.value = 'B'
+    assert model.value == 'B'
+
+
+def test_param_change_suppresses_unchanged_arrays(document, comm):
+
+    class ArraySource(Reactive):
+
+        data = param.Dict()
+
+        def _get_model(self, doc, root=None, parent=None, comm=None):
+            model = ColumnDataSource(data=self.data)
+            self._models[(root or model).ref['id']] = (model, parent)
+            return model
+
+    obj = ArraySource(data={'x': np.arange(3)})
+    model = obj.get_root(document, comm)
+    suppressed = state.suppressed_updates
+
+    obj.data = {'x': np.arange(3)}
+    assert state.suppressed_updates == suppressed
+    obj.data = {'x': np.arange(3)}
+    assert state.suppressed_updates == suppressed+1
+
+    obj.data['x'][0] = 5
+    obj.param.trigger('data')
+    assert state.suppressed_updates == suppressed+1
+    assert model.data['x'][0] == 5
+
+
 def test_text_input_controls():
     text_input = TextInput()
 
@@ -1,3 +1,9 @@
+from functools import partial
+
+import pytest
+
+from bokeh.document.events import ModelChangedEvent
+
 from panel.models import HTML as BkHTML
 from panel.io import state
 
@@ -43,3 +49,664 @@ def test_kill_all_servers(html_server_session, markdown_server_session):
     state.kill_all_servers()
     assert server_1._stopped
     assert server_2._stopped
+
+
+def test_server_unlocked_combines_events(html_server_session, monkeypatch):
+    html, server, session = html_server_session
+
+    import panel.io.server as server_module
+    msgs = []
+    monkeypatch.setattr(server_module, '_dispatch_msg', lambda socket, msg: msgs.append(msg))
+
+    doc = list(html._documents)[0]
+    model = html._documents[doc]
+    state.curdoc = doc
+    try:
+        with server_module.unlocked():
+            model.text = 'A'
+            model.width = 200
+            model.height = 300
+    finally:
+        state.curdoc = None
+
+    assert len(msgs) == 1
+    events = msgs[0].content['events']
+    assert {e['attr'] for e in events} == {'text', 'width', 'height'}
+    assert doc._held_events == []
+
+
+def test_server_change_sends_one_message(monkeypatch):
+    from bokeh.client import pull_session
+    import panel.io.server as server_module
+    from panel.layout import Column
+    from panel.pane import HTML
+    from panel.widgets import TextInput
+
+    msgs = []
+    monkeypatch.setattr(server_module, '_dispatch_msg', lambda socket, msg: msgs.append(msg))
+
+    text = TextInput()
+    panes = [HTML('A') for _ in range(5)]
+
+    def cb(event):
+        for pane in panes:
+            pane.object = event.new
+            pane.width = 200
+
+    text.param.watch(cb, 'value')
+    col = Column(text, *panes)
+    server = col._get_server(port=5020)
+    pull_session(
+        session_id='Test',
+        url="http://localhost:{:d}/".format(server.port),
+        io_loop=server.io_loop
+    )
+    try:
+        doc = list(col._documents)[0]
+        ref = col._documents[doc].ref['id']
+        text._server_change(doc, ref, 'value', '', 'B')
+        text._change_event(doc)
+    finally:
+        server.stop()
+
+    assert len(msgs) == 1
+    events = msgs[0].content['events']
+    assert [e['new'] for e in events if e['attr'] == 'text'] == ['B']*5
+
+
+def test_server_hold_combines_unlocked_blocks(html_server_session, monkeypatch):
+    html, server, session = html_server_session
+
+    import panel.io.server as server_module
+    from panel.io.model import hold
+    msgs = []
+    monkeypatch.setattr(server_module, '_dispatch_msg', lambda socket, msg: msgs.append(msg))
+
+    doc = list(html._documents)[0]
+    model = html._documents[doc]
+    state.curdoc = doc
+    try:
+        with hold():
+            for i in range(5):
+                with server_module.unlocked():
+                    model.width = 100 + i
+            with server_module.unlocked():
+                model.text = 'A'
+            assert msgs == []
+    finally:
+        state.curdoc = None
+
+    assert len(msgs) == 1
+    events = msgs[0].content['events']
+    assert [(e['attr'], e['new']) for e in events] == [('width', 104), ('text', 'A')]
+    assert doc._held_events == []
+    assert doc._hold is None
+
+
+def test_server_session_info(html_server_session):
+    html, server, session = html_server_session
+
+    doc = server.get_sessions('/')[0].document
+    for other in list(state._session_activity):
+        if other is not doc:
+            del state._session_activity[other]
+    info = state.session_info
+    assert len(info) == 1
+    assert info[0]['id'] == doc.session_context.id
+    assert info[0]['models'] == len(doc._all_models)
+    assert info[0]['views'] == 1
+    assert info[0]['cds_bytes'] == 0
+    assert info[0]['last_activity'] >= info[0]['created']
+
+
+def test_server_session_activity_from_client(html_server_session):
+    html, server, session = html_server_session
+
+    doc = server.get_sessions('/')[0].document
+    activity = state._session_activity[doc]
+    activity['last_activity'] = 0
+
+    # Changes made on the server do not count as activity
+    root = doc.roots[0]
+    state._session_changed(ModelChangedEvent(doc, root, 'text', None, 'A', 'A'))
+    assert activity['last_activity'] == 0
+
+    state._session_changed(ModelChangedEvent(doc, root, 'text', None, 'A', 'A', setter='client'))
+    assert activity['last_activity'] > 0
+
+
+def test_server_reap_idle_sessions(html_server_session):
+    html, server, session = html_server_session
+
+    from panel.config import config
+    from panel.io.server import _reap_sessions
+
+    server_session = server.get_sessions('/')[0]
+    activity = state._session_activity[server_session.document]
+    with config.set(session_idle_ttl=10):
+        _reap_sessions(server.io_loop)
+        assert not server_session.expiration_requested
+        activity['last_activity'] -= 20
+        _reap_sessions(server.io_loop)
+    assert server_session.expiration_requested
+
+
+def test_server_reap_expired_sessions(html_server_session):
+    html, server, session = html_server_session
+
+    from panel.config import config
+    from panel.io.server import _reap_sessions
+
+    server_session = server.get_sessions('/')[0]
+    activity = state._session_activity[server_session.document]
+    activity['created'] -= 20
+    with config.set(session_ttl=30):
+        _reap_sessions(server.io_loop)
+        assert not server_session.expiration_requested
+    with config.set(session_ttl=10):
+        _reap_sessions(server.io_loop)
+    assert server_session.expiration_requested
+
+
+def test_server_execute_on_thread_preserves_order():
+    import threading
+    import time
+
+    from bokeh.document import Document
+    from panel.config import config
+
+    doc = Document()
+    calls, done = [], threading.Event()
+
+    def cb(i):
+        time.sleep(0.01 if i == 0 else 0)
+        calls.append((i, state.curdoc is doc, threading.current_thread()))
+        if i == 2:
+            done.set()
+
+    config.nthreads = 2
+    try:
+        for i in range(3):
+            state._execute(doc, partial(cb, i))
+        assert done.wait(5)
+    finally:
+        config.nthreads = None
+
+    assert [i for i, _, _ in calls] == [0, 1, 2]
+    assert all(curdoc for _, curdoc, _ in calls)
+    assert all(t is not threading.main_thread() for _, _, t in calls)
+    assert state.curdoc is not doc
+
+
+def test_server_download_handler_streams_file(html_server_session, tmpdir):
+    from tornado.httpclient import AsyncHTTPClient
+    from panel.widgets import FileDownload
+
+    html, server, session = html_server_session
+    path = tmpdir.join('test.txt')
+    path.write('Some text')
+
+    download = FileDownload(str(path))
+    state.curdoc = server.get_sessions('/')[0].document
+    try:
+        download._transfer()
+    finally:
+        state.curdoc = None
+
+    assert download.data is None
+    assert download._url.startswith('/panel_download/')
+
+    url = "http://localhost:{:d}{}".format(server.port, download._url)
+    client = AsyncHTTPClient()
+
+    # Tokens are bound to the session which registered them
+    other = url.split('?')[0] + '?session=Other'
+    response = server.io_loop.run_sync(lambda: client.fetch(other, raise_error=False))
+    assert response.code == 404
+
+    response = server.io_loop.run_sync(lambda: client.fetch(url))
+    assert response.body == b'Some text'
+    assert response.headers['Content-Length'] == '9'
+    assert 'filename="test.txt"' in response.headers['Content-Disposition']
+
+    # Tokens may only be used once
+    response = server.io_loop.run_sync(lambda: client.fetch(url, raise_error=False))
+    assert response.code == 404
+
+
+def test_server_download_dropped_with_session(html_server_session, tmpdir):
+    from panel.widgets import FileDownload
+
+    html, server, session = html_server_session
+    path = tmpdir.join('test.txt')
+    path.write('Some text')
+
+    download = FileDownload(str(path))
+    doc = server.get_sessions('/')[0].document
+    state.curdoc = doc
+    try:
+        download._transfer()
+        token = download._token
+        download._transfer()
+    finally:
+        state.curdoc = None
+
+    assert token not in state._downloads
+    assert download._token in state._downloads
+    state._session_destroyed(doc.session_context)
+    assert download._token not in state._downloads
+
+
+def test_server_download_handler_prefix_and_filename(tmpdir):
+    from bokeh.client import pull_session
+    from tornado.httpclient import AsyncHTTPClient
+    from panel.pane import HTML
+    from panel.widgets import FileDownload
+
+    html = HTML('A')
+    server = html._get_server(port=5016, prefix='app_prefix')
+    pull_session(
+        session_id='Test',
+        url="http://localhost:{:d}/app_prefix/".format(server.port),
+        io_loop=server.io_loop
+    )
+    path = tmpdir.join('test.txt')
+    path.write('Some text')
+
+    download = FileDownload(str(path), filename='r\u00e9sum\u00e9 "1".txt')
+    state.curdoc = server.get_sessions('/')[0].document
+    try:
+        download._transfer()
+    finally:
+        state.curdoc = None
+
+    try:
+        assert download._url.startswith('/app_prefix/panel_download/')
+        url = "http://localhost:{:d}{}".format(server.port, download._url)
+        client = AsyncHTTPClient()
+        response = server.io_loop.run_sync(lambda: client.fetch(url))
+    finally:
+        server.stop()
+    assert response.body == b'Some text'
+    assert response.headers['Content-Disposition'] == (
+        'attachment; filename="r?sum? _1_.txt"; '
+        "filename*=UTF-8''r%C3%A9sum%C3%A9%20%221%22.txt"
+    )
+
+
+def test_server_download_handler_streams_generator(html_server_session):
+    from tornado.httpclient import AsyncHTTPClient
+    from panel.widgets import FileDownload
+
+    html, server, session = html_server_session
+
+    def chunks():
+        yield 'a,b\n'
+        yield b'1,2\n'
+
+    download = FileDownload(callback=chunks, filename='data.csv')
+    state.curdoc = server.get_sessions('/')[0].document
+    try:
+        download._transfer()
+    finally:
+        state.curdoc = None
+
+    url = "http://localhost:{:d}{}".format(server.port, download._url)
+    response = server.io_loop.run_sync(lambda: AsyncHTTPClient().fetch(url))
+    assert response.body == b'a,b\n1,2\n'
+    assert response.headers['Content-Type'] == 'text/plain;charset=UTF-8'
+
+
+def test_server_asset_handler_image_pane(html_server_session):
+    import os
+    from tornado.httpclient import AsyncHTTPClient
+    from panel.pane import PNG
+
+    html, server, session = html_server_session
+    path = os.path.join(os.path.dirname(__file__), 'test_data', 'logo.png')
+    png = PNG(path)
+    state.curdoc = server.get_sessions('/')[0].document
+    try:
+        model = png.get_root(state.curdoc)
+    finally:
+        state.curdoc = None
+
+    assert 'data:image' not in model.text
+    assert '/panel_asset/' in model.text
+    key = model.text.split('/panel_asset/')[1].split('&')[0]
+    url = "http://localhost:{:d}/panel_asset/{}".format(server.port, key)
+
+    client = AsyncHTTPClient()
+    response = server.io_loop.run_sync(lambda: client.fetch(url))
+    with open(path, 'rb') as f:
+        content = f.read()
+    assert response.body == content
+    assert response.headers['Content-Type'] == 'image/png'
+    assert response.headers['Etag'] == '"%s"' % key
+
+    response = server.io_loop.run_sync(lambda: client.fetch(
+        url, headers={'If-None-Match': '"%s"' % key}, raise_error=False))
+    assert response.code == 304
+
+    response = server.io_loop.run_sync(lambda: client.fetch(
+        url, headers={'Range': 'bytes=10-19'}))
+    assert response.code == 206
+    assert response.body == content[10:20]
+    assert response.headers['Content-Range'] == 'bytes 10-19/%d' % len(content)
+
+
+def test_server_asset_handler_gzip(html_server_session):
+    import gzip
+    from tornado.httpclient import AsyncHTTPClient
+
+    html, server, session = html_server_session
+    state.curdoc = server.get_sessions('/')[0].document
+    try:
+        url = state._asset_url(b'<svg></svg>'*100, 'image/svg+xml')
+    finally:
+        state.curdoc = None
+
+    url = "http://localhost:{:d}{}".format(server.port, url)
+    response = server.io_loop.run_sync(lambda: AsyncHTTPClient().fetch(
+        url, headers={'Accept-Encoding': 'gzip'}, decompress_response=False))
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.body) == b'<svg></svg>'*100
+
+
+def test_server_asset_handler_audio_range(html_server_session, tmpdir):
+    from tornado.httpclient import AsyncHTTPClient
+    from panel.pane import Audio
+
+    html, server, session = html_server_session
+    path = tmpdir.join('test.mp3')
+    path.write_binary(b'0123456789'*10)
+    state.curdoc = server.get_sessions('/')[0].document
+    try:
+        model = Audio(str(path)).get_root(state.curdoc)
+    finally:
+        state.curdoc = None
+
+    assert model.value.startswith('/panel_asset/')
+    url = "http://localhost:{:d}{}".format(server.port, model.value)
+    client = AsyncHTTPClient()
+    response = server.io_loop.run_sync(lambda: client.fetch(
+        url, headers={'Range': 'bytes=-5'}))
+    assert response.code == 206
+    assert response.body == b'56789'
+    assert response.headers['Content-Type'] == 'audio/mpeg'
+    assert response.headers['Content-Range'] == 'bytes 95-99/100'
+
+    response = server.io_loop.run_sync(lambda: client.fetch(
+        url, method='HEAD'))
+    assert response.headers['Content-Length'] == '100'
+    assert response.body == b''
+
+    response = server.io_loop.run_sync(lambda: client.fetch(
+        url, headers={'Range': 'bytes=200-'}, raise_error=False))
+    assert response.code == 416
+
+    response = server.io_loop.run_sync(lambda: client.fetch(
+        url[:-4] + 'abcd', raise_error=False))
+    assert response.code == 404
+
+
+def test_session_pool_hits_and_misses():
+    from panel.io.server import _SessionPool
+    from panel.pane import HTML
+
+    class Loop(object):
+        def __init__(self):
+            self.callbacks = []
+            self.timeouts = []
+        def add_callback(self, cb, *args):
+            self.callbacks.append((cb, args))
+        def call_later(self, delay, cb):
+            self.timeouts.append((delay, cb))
+            return len(self.timeouts)-1
+        def remove_timeout(self, timeout):
+            self.timeouts[timeout] = None
+
+    loop = Loop()
+    pool = _SessionPool(lambda: HTML('<h1>Title</h1>'), 2, loop)
+    pool._build_instance()
+    pool._build_instance()
+
+    instances = [pool.get() for _ in range(3)]
+    assert all(isinstance(instance, HTML) for instance in instances)
+    assert len(set(map(id, instances))) == 3
+    assert pool.info() == {'hits': 2, 'misses': 1, 'size': 2, 'available': 0}
+    assert loop.callbacks == [(pool._schedule_fill, (pool.idle_delay,))]*3
+
+    # Each new session postpones the refill
+    for cb, args in loop.callbacks:
+        cb(*args)
+    assert loop.timeouts == [None, None, (pool.idle_delay, pool.fill)]
+
+    # Instances are built in separate callbacks on the loop
+    loop.timeouts = []
+    pool.fill()
+    assert pool.info()['available'] == 1
+    assert loop.timeouts == [(0, pool.fill)]
+    pool.fill()
+    assert pool.info()['available'] == 2
+    assert len(loop.timeouts) == 1
+    pool.fill()
+    assert pool.info()['available'] == 2
+
+
+def test_server_session_pool():
+    from bokeh.client import pull_session
+    from panel.config import config
+    from panel.io.server import get_server
+    from panel.pane import HTML
+
+    with config.set(session_pool_size=2):
+        server = get_server(lambda: HTML('<h1>Title</h1>'), port=5008, start=False)
+    try:
+        session = pull_session(
+            url="http://localhost:{:d}/".format(server.port),
+            io_loop=server.io_loop
+        )
+        root = session.document.roots[0]
+        assert isinstance(root, BkHTML)
+        assert root.text == '&lt;h1&gt;Title&lt;/h1&gt;'
+        [info] = state.session_pool_info.values()
+        assert info['/']['hits'] + info['/']['misses'] == 1
+    finally:
+        server.stop()
+        state._session_pools.clear()
+
+
+def test_show_threaded_server_stops():
+    import time
+    from panel.pane import Markdown
+
+    thread = Markdown('A').show(port=5013, threaded=True, open=False, verbose=False)
+    time.sleep(0.5)
+    thread.stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not hasattr(thread, '_target')
+
+
+def test_server_async_on_click(monkeypatch):
+    import asyncio
+    from bokeh.client import pull_session
+    import panel.io.server as server_module
+    from panel.layout import Row
+    from panel.pane import HTML
+    from panel.widgets import Button
+
+    msgs = []
+    monkeypatch.setattr(server_module, '_dispatch_msg', lambda socket, msg: msgs.append(msg))
+
+    button, html = Button(), HTML('A')
+    docs = []
+
+    async def cb(event):
+        docs.append(state.curdoc)
+        html.object = 'B'
+        await asyncio.sleep(0)
+        html.object = 'C'
+        html.width = 200
+
+    button.on_click(cb)
+    row = Row(button, html)
+    server = row._get_server(port=5014)
+    pull_session(
+        session_id='Test',
+        url="http://localhost:{:d}/".format(server.port),
+        io_loop=server.io_loop
+    )
+    try:
+        doc = list(row._documents)[0]
+        button._server_click(doc, None, None)
+        server.io_loop.run_sync(lambda: asyncio.sleep(0.1))
+    finally:
+        server.stop()
+
+    assert docs == [doc]
+    assert len(msgs) == 2
+    assert [(e['attr'], e['new']) for e in msgs[0].content['events']] == [('text', 'B')]
+    assert [(e['attr'], e['new']) for e in msgs[1].content['events']] == [
+        ('text', 'C'), ('width', 200), ('min_width', 200)]
+
+
+def test_server_async_on_click_concurrent_sessions():
+    import asyncio
+    from bokeh.client import pull_session
+    from tornado.ioloop import IOLoop
+    from panel.widgets import Button
+
+    button = Button()
+    before, after, ticks = [], [], []
+
+    async def cb(event):
+        doc = state.curdoc
+        before.append(doc)
+        IOLoop.current().add_callback(lambda: ticks.append(state.curdoc))
+        await asyncio.sleep(0.2)
+        after.append((doc, state.curdoc))
+
+    button.on_click(cb)
+    server = button._get_server(port=5018)
+    for session_id in ('A', 'B'):
+        pull_session(
+            session_id=session_id,
+            url="http://localhost:{:d}/".format(server.port),
+            io_loop=server.io_loop
+        )
+    try:
+        doc_a, doc_b = list(button._documents)
+        button._server_click(doc_a, None, None)
+        server.io_loop.run_sync(lambda: asyncio.sleep(0.1))
+        button._server_click(doc_b, None, None)
+        server.io_loop.run_sync(lambda: asyncio.sleep(0.5))
+    finally:
+        server.stop()
+
+    assert before == [doc_a, doc_b]
+    assert after == [(doc_a, doc_a), (doc_b, doc_b)]
+    assert ticks == [None, None]
+    assert state.curdoc is None
+
+
+def test_server_hold_combines_layout_updates(monkeypatch):
+    from bokeh.client import pull_session
+    import panel.io.server as server_module
+    from panel.io.model import hold
+    from panel.layout import Column, Row
+    from panel.pane import HTML
+
+    msgs = []
+    monkeypatch.setattr(server_module, '_dispatch_msg', lambda socket, msg: msgs.append(msg))
+
+    h1, h2, inner = HTML('A'), HTML('B'), Row()
+    col = Column(h1, inner, h2)
+    server = col._get_server(port=5019)
+    pull_session(
+        session_id='Test',
+        url="http://localhost:{:d}/".format(server.port),
+        io_loop=server.io_loop
+    )
+    try:
+        doc = list(col._documents)[0]
+        with state._unblock(doc), hold():
+            h1.object = 'C'
+            inner.append(HTML('D'))
+            h2.object = 'E'
+            assert msgs == []
+    finally:
+        server.stop()
+
+    assert len(msgs) == 1
+
+def test_server_nthreads_scoped_to_server():
+    import threading
+    from bokeh.client import pull_session
+    from panel.config import _cleanup_server, config
+    from panel.pane import HTML
+
+    html = HTML('A')
+    server = html._get_server(port=5015, nthreads=2, server_id='threads')
+    pull_session(
+        session_id='Test',
+        url="http://localhost:{:d}/".format(server.port),
+        io_loop=server.io_loop
+    )
+    assert config.nthreads is None
+
+    doc = list(html._documents)[0]
+    threads, done = [], threading.Event()
+    def cb():
+        threads.append(threading.current_thread())
+        done.set()
+    try:
+        assert state._nthreads(doc) == 2
+        state._execute(doc, cb)
+        assert done.wait(5)
+        pool, size = state._thread_pools['threads']
+        assert size == 2
+        assert threads[0] is not threading.main_thread()
+    finally:
+        _cleanup_server('threads')
+
+    assert 'threads' not in state._thread_pools
+    assert 'threads' not in state._server_nthreads
+    with pytest.raises(RuntimeError):
+        pool.submit(cb)
+
+
+def test_server_app_script_tracks_sessions():
+    from bokeh.application import Application
+    from bokeh.application.handlers import FunctionHandler
+    from bokeh.client import pull_session
+    from bokeh.server.server import Server
+    from panel.config import config
+    from panel.pane import HTML
+
+    # Apps launched with `panel serve` call servable on the Document
+    def app(doc):
+        HTML('A').server_doc(doc)
+
+    server = Server({'/': Application(FunctionHandler(app))}, port=5017)
+    try:
+        with config.set(session_idle_ttl=10):
+            session = pull_session(
+                url="http://localhost:{:d}/".format(server.port),
+                io_loop=server.io_loop
+            )
+            server_session = server.get_sessions('/')[0]
+            activity = state._session_activity[server_session.document]
+            assert server.io_loop in state._reapers
+            assert session.id in [info['id'] for info in state.session_info]
+            activity['last_activity'] -= 20
+            state._reapers[server.io_loop].callback()
+        assert server_session.expiration_requested
+    finally:
+        # Stop the server first so it is released even if no reaper
+        # was registered
+        server.stop()
+        reaper = state._reapers.pop(server.io_loop, None)
+        if reaper is not None:
+            reaper.stop()
@@ -95,3 +95,32 @@ def test_widget_triggers_events(document, comm):
     assert event.attr == 'value'
     assert event.model is widget
     assert event.new == '123'
+
+
+@pytest.mark.parametrize('widget', all_widgets)
+def test_widget_event_policy_not_synced(widget, document, comm):
+    w = widget(event_policy='debounce', max_wait=100)
+    model = w.get_root(document, comm)
+    w.event_policy = 'latest'
+    assert not any(p in model.properties() for p in ('event_policy', 'max_wait'))
+
+
+def test_widget_event_policy_overrides_config(document, comm):
+    from panel.config import config
+
+    text_input = TextInput(event_policy='debounce', max_wait=0)
+    text_input._debounce = 10000
+    other = TextInput()
+    with config.set(event_policy='latest'):
+        assert text_input._policy == 'debounce'
+        assert other._policy == 'latest'
+
+        scheduled = []
+        text_input._schedule_change = lambda doc, delay=None, comm=False: scheduled.append(delay)
+        text_input._queue_event('value', 'B')
+        text_input._processing = True
+        assert not text_input._defer_change(document)
+
+        text_input.max_wait = None
+        assert text_input._defer_change(document)
+        assert 0 < scheduled[0] <= 10000
@@ -1,5 +1,9 @@
 from __future__ import absolute_import, division, unicode_literals
 
+import asyncio
+
+from tornado.ioloop import IOLoop
+
 from panel.widgets import Button, Toggle
 
 
@@ -15,6 +19,22 @@ def test_button(document, comm):
     assert button.clicks == 1
 
 
+def test_button_async_on_click(document, comm):
+    button = Button()
+    clicks = []
+
+    async def cb(event):
+        await asyncio.sleep(0)
+        clicks.append(event.new)
+
+    button.on_click(cb)
+    button._process_events({'clicks': 1})
+    assert clicks == []
+
+    IOLoop.current().run_sync(lambda: asyncio.sleep(0.01))
+    assert clicks == [1]
+
+
 def test_toggle(document, comm):
     toggle = Toggle(name='Toggle', value=True)
 
@@ -2,8 +2,10 @@ from __future__ import absolute_import, division, unicode_literals
 
 import pytest
 from datetime import datetime, date
+from io import BytesIO
 
 from bokeh.models.widgets import FileInput as BkFileInput
+from panel.models import ChunkedFileInput
 from panel.widgets import (Checkbox, DatePicker, DatetimeInput, FileInput,
                            LiteralInput, TextInput, StaticText)
 
@@ -66,6 +68,32 @@ def test_file_input(document, comm):
     assert file_input.filename == 'testfile'
 
 
+def test_file_input_chunked(document, comm):
+    file_input = FileInput(accept='.txt', chunk_size=4, spool_threshold=8)
+
+    widget = file_input.get_root(document, comm=comm)
+
+    assert isinstance(widget, ChunkedFileInput)
+    assert widget.chunk_size == 4
+
+    widget.update(filename='testfile', mime_type='text/plain', size=10)
+    for i, chunk in enumerate(['U29tZQ==', 'IHRleA==', 'dAo=']):
+        widget.chunk = chunk
+        widget.chunk_index = i
+        assert widget.received == i+1
+        if i < 2:
+            assert file_input.value is None
+
+    assert file_input.progress == 1
+    assert file_input.filename == 'testfile'
+    assert file_input.mime_type == 'text/plain'
+    assert file_input.value.read() == b'Some text\n'
+
+    out = BytesIO()
+    file_input.save(out)
+    assert out.getvalue() == b'Some text\n'
+
+
 def test_literal_input(document, comm):
 
     literal = LiteralInput(value={}, type=dict, name='Literal')
@@ -13,7 +13,7 @@ from bokeh.models.widgets.tables import (
     SelectEditor, DateFormatter, DateEditor
 )
 
-from panel.widgets import DataFrame
+from panel.widgets import DataFrame, Spinner
 
 
 def test_dataframe_widget(dataframe, document, comm):
@@ -115,3 +115,149 @@ def test_dataframe_process_data_event(dataframe):
     table._process_events({'data': {'int': {1: 3, 2: 4, 0: 1}}})
     df['int'] = [1, 3, 4]
     pd.testing.assert_frame_equal(table.value, df)
+
+
+def test_dataframe_stream(dataframe, document, comm):
+    table = DataFrame(dataframe)
+    model = table.get_root(document, comm)
+    columns = model.columns
+
+    events = []
+    table.param.watch(events.append, 'value')
+    table.stream({'int': [4], 'float': [12.56], 'str': ['D']})
+
+    assert len(events) == 1
+    assert list(table.value.index) == [1, 2, 3, 4]
+    assert list(model.source.data['index']) == [1, 2, 3, 4]
+    assert list(model.source.data['str']) == ['A', 'B', 'C', 'D']
+    assert model.columns is columns
+
+
+def test_dataframe_stream_rollover(dataframe, document, comm):
+    table = DataFrame(dataframe)
+    model = table.get_root(document, comm)
+
+    table.stream(pd.DataFrame({'int': [4], 'float': [12.56], 'str': ['D']}), rollover=3)
+
+    assert list(table.value.index) == [2, 3, 4]
+    assert list(model.source.data['int']) == [2, 3, 4]
+
+
+def test_dataframe_patch(dataframe, document, comm):
+    table = DataFrame(dataframe)
+    model = table.get_root(document, comm)
+
+    table.patch(pd.DataFrame({'int': [7]}, index=[2]))
+    assert list(table.value['int']) == [1, 7, 3]
+    assert list(model.source.data['int']) == [1, 7, 3]
+
+    table.patch({'str': [(0, 'Z')]})
+    assert list(table.value['str']) == ['Z', 'B', 'C']
+    assert list(model.source.data['str']) == ['Z', 'B', 'C']
+
+    # The original DataFrame is not modified
+    assert list(dataframe['int']) == [1, 2, 3]
+    assert list(dataframe['str']) == ['A', 'B', 'C']
+
+
+def test_dataframe_patch_slice(dataframe, document, comm):
+    table = DataFrame(dataframe)
+    model = table.get_root(document, comm)
+
+    table.patch({'int': [(slice(0, 2), [8, 9])]})
+    assert list(table.value['int']) == [8, 9, 3]
+    assert list(model.source.data['int']) == [8, 9, 3]
+
+
+def test_dataframe_value_update_reuses_columns(dataframe, document, comm):
+    table = DataFrame(dataframe)
+    model = table.get_root(document, comm)
+    columns = model.columns
+
+    table.value = dataframe.iloc[:2].copy()
+    assert model.columns is columns
+    assert list(model.source.data['int']) == [1, 2]
+
+    table.value = dataframe[['int', 'str']]
+    assert model.columns is not columns
+
+
+def test_dataframe_remote_pagination(document, comm):
+    df = pd.DataFrame({'int': list(range(10)), 'str': list('ABCDEFGHIJ')})
+    table = DataFrame(df, pagination='remote', page_size=4)
+    model = table.get_root(document, comm)
+
+    assert table.page_count == 3
+    assert list(model.source.data['int']) == [0, 1, 2, 3]
+    assert model.height == 4 * table.row_height + 30
+    assert not model.sortable
+
+    table.page = 3
+    assert list(model.source.data['int']) == [8, 9]
+
+
+def test_dataframe_remote_pagination_sort_filter(document, comm):
+    df = pd.DataFrame({'int': list(range(10)), 'str': list('ABCDEFGHIJ')})
+    table = DataFrame(df, pagination='remote', page_size=3)
+    model = table.get_root(document, comm)
+
+    table.filters = [lambda df: df['int'] % 2 == 0]
+    table.sorters = [{'field': 'int', 'dir': 'desc'}]
+    assert list(model.source.data['int']) == [8, 6, 4]
+    assert table.page_count == 2
+
+    table._process_events({'indices': [1]})
+    assert table.selection == [6]
+    assert list(table.selected_dataframe['str']) == ['G']
+
+    table.selection = [4]
+    assert model.source.selected.indices == [2]
+
+
+def test_dataframe_remote_pagination_clamps_page(document, comm):
+    df = pd.DataFrame({'int': list(range(10))})
+    table = DataFrame(df, pagination='remote', page_size=3, page=4)
+    model = table.get_root(document, comm)
+    assert list(model.source.data['int']) == [9]
+
+    table.filters = [lambda df: df['int'] < 5]
+    assert table.page == 2
+    assert list(model.source.data['int']) == [3, 4]
+
+
+def test_dataframe_remote_pagination_sort_index_column(document, comm):
+    df = pd.DataFrame({'index': [3, 1, 2], 'str': list('ABC')}, index=[2, 0, 1])
+    table = DataFrame(df, pagination='remote', page_size=2)
+    model = table.get_root(document, comm)
+
+    table.sorters = [{'field': 'index'}]
+    assert list(model.source.data['str']) == ['B', 'C']
+
+    table.sorters = [{'field': 'str', 'dir': 'desc'}]
+    assert list(model.source.data['str']) == ['C', 'B']
+
+
+def test_dataframe_remote_pagination_linked_pager(document, comm):
+    df = pd.DataFrame({'int': list(range(10))})
+    table = DataFrame(df, pagination='remote', page_size=4)
+    pager = Spinner(value=1, start=1, end=table.page_count)
+    pager.link(table, value='page')
+    table.link(pager, page='value')
+    model = table.get_root(document, comm)
+
+    pager.value = 3
+    assert table.page == 3
+    assert list(model.source.data['int']) == [8, 9]
+
+    table.page_size = 5
+    assert pager.value == 2
+    assert list(model.source.data['int']) == [5, 6, 7, 8, 9]
+
+
+def test_dataframe_remote_pagination_edit(document, comm):
+    df = pd.DataFrame({'int': list(range(10))})
+    table = DataFrame(df, pagination='remote', page_size=3, page=2)
+    table.get_root(document, comm)
+
+    table._process_events({'data': {'int': [3, 40, 5]}})
+    assert list(table.value['int']) == [0, 1, 2, 3, 40, 5, 6, 7, 8, 9]
@@ -58,6 +58,21 @@ def is_dataframe(obj):
     return isinstance(obj, pd.DataFrame)
 
 
+def is_array_like(obj):
+    """
+    Whether the object is a numpy array or pandas object, or a list,
+    tuple or dictionary containing one, i.e. an object which cannot
+    be cheaply compared by equality.
+    """
+    pd = sys.modules.get('pandas')
+    array_types = (np.ndarray,) + ((pd.Series, pd.DataFrame, pd.Index) if pd else ())
+    if isinstance(obj, dict):
+        return any(isinstance(v, array_types) for v in obj.values())
+    elif isinstance(obj, (list, tuple)):
+        return any(isinstance(v, array_types) for v in obj)
+    return isinstance(obj, array_types)
+
+
 def hashable(x):
     if isinstance(x, MutableSequence):
         return tuple(x)
@@ -24,6 +24,7 @@ from pyviz_comms import JupyterCommManager
 from .config import config, panel_extension
 from .io.embed import embed_state
 from .io.model import add_to_doc, patch_cds_msg
+from .io.profile import profiled
 from .io.notebook import (
     ipywidget, render_mimebundle, render_model, show_embed, show_server
 )
@@ -400,6 +401,7 @@ class Renderable(param.Parameterized):
         if root.ref['id'] in state._handles:
             del state._handles[root.ref['id']]
 
+    @profiled('preprocess')
     def _preprocess(self, root):
         """
         Applies preprocessing hooks to the model.
@@ -634,7 +636,7 @@ class Viewable(Renderable, Layoutable, ServableMixin):
     def save(self, filename, title=None, resources=None, template=None,
              template_variables=None, embed=False, max_states=1000,
              max_opts=3, embed_json=False, json_prefix='', save_path='./',
-             load_path=None):
+             load_path=None, embed_format=None):
         """
         Saves Panel objects to file.
 
@@ -664,10 +666,14 @@ class Viewable(Renderable, Layoutable, ServableMixin):
            The path to save json files to
         load_path: str (default=None)
            The path or URL the json files will be loaded from.
+        embed_format: str (default=None)
+           Whether to export json files per state ('json') or
+           compressed binary shards ('shards').
         """
         return save(self, filename, title, resources, template,
                     template_variables, embed, max_states, max_opts,
-                    embed_json, json_prefix, save_path, load_path)
+                    embed_json, json_prefix, save_path, load_path,
+                    embed_format=embed_format)
 
     def server_doc(self, doc=None, title=None, location=True):
         """
@@ -691,6 +697,8 @@ class Viewable(Renderable, Layoutable, ServableMixin):
         """
         from .io.location import Location
         doc = doc or _curdoc()
+        if doc.session_context:
+            state._init_session(doc)
         title = title or 'Panel Application'
         doc.title = title
         model = self.get_root(doc)
@@ -24,6 +24,15 @@ class Widget(Reactive):
     disabled = param.Boolean(default=False, doc="""
        Whether the widget is disabled.""")
 
+    event_policy = param.ObjectSelector(default=None, objects=[
+        'throttle', 'debounce', 'latest', None], doc="""
+        How events received from the frontend are coalesced before
+        they are processed (defaults to config.event_policy).""")
+
+    max_wait = param.Integer(default=None, bounds=(0, None), doc="""
+        Maximum time (in ms) the 'debounce' event policy may defer
+        processing of events received from the frontend.""")
+
     name = param.String(default='')
 
     height = param.Integer(default=None, bounds=(0, None))
@@ -48,6 +57,9 @@ class Widget(Reactive):
 
     _rename = {'name': 'title'}
 
+    # Parameters which configure the widget but are not synced with the model
+    _policy_params = ['event_policy', 'max_wait']
+
     def __init__(self, **params):
         if 'name' not in params:
             params['name'] = ''
@@ -67,17 +79,24 @@ class Widget(Reactive):
         """
 
     def _update_widget(self, *events):
+        self._apply_update(partial(self._manual_update, events))
+
+    def _apply_update(self, update):
+        """
+        Applies an update function, which is called with the model,
+        document, root, parent and comm, to all models of the widget.
+        """
         for ref, (model, parent) in self._models.items():
             if ref not in state._views or ref in state._fake_roots:
                 continue
             viewable, root, doc, comm = state._views[ref]
             if comm or state._unblocked(doc):
                 with unlocked():
-                    self._manual_update(events, model, doc, root, parent, comm)
+                    update(model, doc, root, parent, comm)
                 if comm and 'embedded' not in root.tags:
                     push(doc, comm)
             else:
-                cb = partial(self._manual_update, events, model, doc, root, parent, comm)
+                cb = partial(update, model, doc, root, parent, comm)
                 if doc.session_context:
                     doc.add_next_tick_callback(cb)
                 else:
@@ -99,11 +118,25 @@ class Widget(Reactive):
         return [p for p in self._synced_params() if self._rename.get(p, False) is not None
                 and self._source_transforms.get(p, False) is not None]
 
+    @property
+    def _event_policy(self):
+        return self.event_policy
+
+    @property
+    def _max_wait(self):
+        return self.max_wait
+
+    def _init_properties(self):
+        return {k: v for k, v in super(Widget, self)._init_properties().items()
+                if k not in self._policy_params}
+
     def _synced_params(self):
-        return [p for p in self.param if p not in self._manual_params]
+        return [p for p in self.param if p not in self._manual_params
+                and p not in self._policy_params]
 
     def _filter_properties(self, properties):
-        return [p for p in properties if p not in Layoutable.param]
+        return [p for p in properties if p not in Layoutable.param
+                and p not in self._policy_params]
 
     def _get_embed_state(self, root, max_opts=3):
         """
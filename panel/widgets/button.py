@@ -4,12 +4,16 @@ or merely toggling between on-off states.
 """
 from __future__ import absolute_import, division, unicode_literals
 
+import inspect
+
 from functools import partial
 
 import param
 
 from bokeh.models import Button as _BkButton, Toggle as _BkToggle
 
+from ..io.server import _DocumentAwaitable
+from ..io.state import state
 from .base import Widget
 
 
@@ -38,11 +42,11 @@ class Button(_ButtonBase):
         return model
 
     def _server_click(self, doc, ref, event):
-        self._events.update({"clicks": 1})
+        self._queue_event("clicks", 1)
         if not self._processing:
             self._processing = True
             if doc.session_context:
-                doc.add_timeout_callback(partial(self._change_event, doc), self._debounce)
+                self._schedule_change(doc)
             else:
                 self._change_event(doc)
 
@@ -53,8 +57,24 @@ class Button(_ButtonBase):
         return msg
 
     def on_click(self, callback):
+        if inspect.iscoroutinefunction(callback):
+            callback = partial(self._schedule_click, callback)
         self.param.watch(callback, 'clicks')
 
+    def _schedule_click(self, callback, event):
+        state._schedule_async(self._eval_click, callback, event, state.curdoc)
+
+    async def _eval_click(self, callback, event, doc):
+        """
+        Runs a coroutine click callback with the Document it was
+        triggered on as the current document, dispatching the model
+        updates made between two await points as a single message.
+        """
+        if doc is None or not doc.session_context:
+            await callback(event)
+        else:
+            await _DocumentAwaitable(callback(event), doc)
+
     def js_on_click(self, args={}, code=""):
         """
         Allows defining a JS callback to be triggered when the button
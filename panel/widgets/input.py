@@ -6,10 +6,13 @@ from __future__ import absolute_import, division, unicode_literals
 
 import ast
 import json
+import shutil
 
 from base64 import b64decode
 from datetime import datetime
+from functools import partial
 from six import string_types
+from tempfile import SpooledTemporaryFile
 
 import param
 
@@ -19,6 +22,8 @@ from bokeh.models.widgets import (
     PasswordInput as _BkPasswordInput, Spinner as _BkSpinner,
     FileInput as _BkFileInput, TextAreaInput as _BkTextAreaInput)
 
+from ..io.notebook import push
+from ..models import ChunkedFileInput as _BkChunkedFileInput
 from ..util import as_unicode
 from .base import Widget
 
@@ -56,17 +61,35 @@ class FileInput(Widget):
 
     accept = param.String(default=None)
 
+    chunk_size = param.Integer(default=None, bounds=(1, None), doc="""
+        If set the file is uploaded in chunks of this size (in bytes)
+        and spooled to a temporary file, in which case the value is a
+        file-like object rather than bytes.""")
+
     filename = param.String(default=None)
 
     mime_type = param.String(default=None)
 
+    progress = param.Number(default=0, bounds=(0, 1), constant=True, doc="""
+        The fraction of the current chunked upload which was received.""")
+
+    spool_threshold = param.Integer(default=10*1024*1024, doc="""
+        Size (in bytes) above which chunked uploads are spooled to
+        disk rather than held in memory.""")
+
     value = param.Parameter(default=None)
 
     _widget_type = _BkFileInput
 
     _source_transforms = {'value': "'data:' + source.mime_type + ';base64,' + value"}
 
-    _rename = {'name': None, 'filename': None}
+    _rename = {'name': None, 'filename': None, 'chunk_size': None,
+               'progress': None, 'spool_threshold': None}
+
+    def __init__(self, **params):
+        super(FileInput, self).__init__(**params)
+        self._spool = None
+        self._received = 0
 
     def _process_param_change(self, msg):
         msg = super(FileInput, self)._process_param_change(msg)
@@ -86,6 +109,43 @@ class FileInput(Widget):
             msg['value'] = b64decode(msg['value'])
         return msg
 
+    def _get_model(self, doc, root=None, parent=None, comm=None):
+        if self.chunk_size is None:
+            return super(FileInput, self)._get_model(doc, root, parent, comm)
+        props = self._process_param_change(self._init_properties())
+        props = {k: v for k, v in props.items() if v is not None}
+        model = _BkChunkedFileInput(chunk_size=self.chunk_size, **props)
+        if root is None:
+            root = model
+        self._models[root.ref['id']] = (model, parent)
+        model.on_change('chunk_index', partial(self._chunk_change, doc, model, comm))
+        return model
+
+    def _chunk_change(self, doc, model, comm, attr, old, new):
+        if new < 0:
+            return
+        if new == 0:
+            if self._spool is not None and self._spool is not self.value:
+                self._spool.close()
+            self._spool = SpooledTemporaryFile(max_size=self.spool_threshold)
+            self._received = 0
+        data = b64decode(model.chunk)
+        self._spool.write(data)
+        self._received += len(data)
+        model.received = new+1
+        if comm:
+            push(doc, comm)
+        size = model.size
+        with param.edit_constant(self):
+            self.progress = min(self._received/size, 1) if size else 1
+        if self._received < size:
+            return
+        spool, self._spool = self._spool, None
+        spool.seek(0)
+        self.param.set_param(
+            filename=model.filename, mime_type=model.mime_type, value=spool
+        )
+
     def save(self, filename):
         """
         Saves the uploaded FileInput data to a file or BytesIO object.
@@ -96,9 +156,17 @@ class FileInput(Widget):
         """
         if isinstance(filename, string_types):
             with open(filename, 'wb') as f:
-                f.write(self.value)
+                self._write(f)
+        else:
+            self._write(filename)
+
+    def _write(self, fileobj):
+        if hasattr(self.value, 'read'):
+            self.value.seek(0)
+            shutil.copyfileobj(self.value, fileobj)
+            self.value.seek(0)
         else:
-            filename.write(self.value)
+            fileobj.write(self.value)
 
 
 class StaticText(Widget):
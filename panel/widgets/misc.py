@@ -4,9 +4,11 @@ Miscellaneous widgets which do not fit into the other main categories.
 from __future__ import absolute_import, division, unicode_literals
 
 import os
+import uuid
 
 from io import BytesIO
 from base64 import b64encode
+from urllib.parse import quote
 from six import string_types
 
 import param
@@ -168,7 +170,9 @@ class FileDownload(Widget):
         'default', 'primary', 'success', 'warning', 'danger'])
 
     callback = param.Callable(default=None, doc="""
-        A callable that returns the file path or file-like object.""")
+        A callable that returns the file path or file-like object.
+        When served the callable may also return a generator yielding
+        chunks of bytes or strings which are streamed to the browser.""")
 
     data = param.String(default=None, doc="""
         The data being transferred.""")
@@ -190,6 +194,9 @@ class FileDownload(Widget):
 
     _clicks = param.Integer(default=0)
 
+    _url = param.String(default=None, doc="""
+        One-time URL the file is streamed from when served.""")
+
     _mime_types = {
         'application': {
             'pdf': 'pdf', 'zip': 'zip'
@@ -215,12 +222,13 @@ class FileDownload(Widget):
 
     _rename = {
         'callback': None, 'embed': None, 'file': None,
-        '_clicks': 'clicks', 'name': 'title'
+        '_clicks': 'clicks', '_url': 'url', 'name': 'title'
     }
 
     def __init__(self, file=None, **params):
         self._default_label = 'label' not in params
         self._synced = False
+        self._token = None
         super(FileDownload, self).__init__(file=file, **params)
         if self.embed:
             self._transfer()
@@ -265,25 +273,51 @@ class FileDownload(Widget):
         else:
             fileobj = ParamFunction.eval(self.callback)
         filename = self.filename
+        streamable = self._streamable
         if isinstance(fileobj, str):
             if not os.path.isfile(fileobj):
                 raise FileNotFoundError('File "%s" not found.' % fileobj)
-            with open(fileobj, 'rb') as f:
-                b64 = b64encode(f.read()).decode("utf-8")
             if filename is None:
                 filename = os.path.basename(fileobj)
-        elif hasattr(fileobj, 'read'):
+        elif not (hasattr(fileobj, 'read') or
+                  (streamable and hasattr(fileobj, '__iter__'))):
+            raise ValueError('Cannot transfer unknown object of type %s' %
+                             type(fileobj).__name__)
+        elif filename is None:
+            raise ValueError('Must provide filename if file-like '
+                             'object is provided.')
+
+        self._synced = True
+        if streamable:
+            # Stream the file from the server instead of embedding it
+            self._register_download(fileobj, filename)
+            self._update_label()
+            return
+
+        if isinstance(fileobj, str):
+            with open(fileobj, 'rb') as f:
+                b64 = b64encode(f.read()).decode("utf-8")
+        else:
             bdata = fileobj.read()
             if not isinstance(bdata, bytes):
                 bdata = bdata.encode("utf-8")
             b64 = b64encode(bdata).decode("utf-8")
-            if filename is None:
-                raise ValueError('Must provide filename if file-like '
-                                 'object is provided.')
-        else:
-            raise ValueError('Cannot transfer unknown object of type %s' %
-                             type(fileobj).__name__)
 
+        data = "data:{mime};base64,{b64}".format(mime=self._mime_type(filename), b64=b64)
+        self.param.set_param(data=data, filename=filename)
+        self._update_label()
+
+    @property
+    def _streamable(self):
+        """
+        Whether the file can be streamed from the server rather than
+        being embedded in the model as base64 encoded data.
+        """
+        doc = state.curdoc
+        return (not self.embed and state._download_route is not None and
+                doc is not None and doc.session_context is not None)
+
+    def _mime_type(self, filename):
         ext = filename.split('.')[-1]
         for mtype, subtypes in self._mime_types.items():
             stype = None
@@ -291,12 +325,26 @@ class FileDownload(Widget):
                 stype = subtypes[ext]
                 break
         if stype is None:
-            mime = 'application/octet-stream'
-        else:
-            mime = '{type}/{subtype}'.format(type=mtype, subtype=stype)
-
-        data = "data:{mime};base64,{b64}".format(mime=mime, b64=b64)
-        self._synced = True
-
-        self.param.set_param(data=data, filename=filename)
-        self._update_label()
+            return 'application/octet-stream'
+        return '{type}/{subtype}'.format(type=mtype, subtype=stype)
+
+    def _register_download(self, fileobj, filename):
+        doc = state.curdoc
+        session_id = doc.session_context.id
+        token = uuid.uuid4().hex
+        download = (fileobj, filename, self._mime_type(filename), session_id)
+        # Replace the previous download and issue the new token at once
+        # so concurrent transfers cannot leave a stale token behind
+        with state._download_lock:
+            state._downloads.pop(self._token, None)
+            state._downloads[token] = download
+            self._token = token
+        url = '%s%s%s?session=%s' % (state._server_prefix(doc), state._download_route,
+                                     token, quote(session_id))
+        self.param.set_param(_url=url, filename=filename)
+
+    def _cleanup(self, root):
+        super(FileDownload, self)._cleanup(root)
+        if not self._models:
+            with state._download_lock:
+                state._downloads.pop(self._token, None)
@@ -1,5 +1,7 @@
 from __future__ import absolute_import, division, unicode_literals
 
+from functools import partial
+
 import numpy as np
 import param
 
@@ -9,6 +11,7 @@ from bokeh.models.widgets import (
     DateFormatter, DateEditor, StringFormatter, StringEditor, IntEditor
 )
 
+from ..io.profile import profiled
 from ..viewable import Layoutable
 from ..util import isdatetime
 from .base import Widget
@@ -24,14 +27,46 @@ class DataFrame(Widget):
         Bokeh CellFormatter to use for a particular column
         (overrides the default chosen based on the type).""")
 
+    filters = param.List(default=[], doc="""
+        List of callables which are given the DataFrame and return a
+        boolean mask of the rows to display. Only applied if
+        pagination='remote'.""")
+
     fit_columns = param.Boolean(default=True, doc="""
         Whether columns should expand to the available width. This
         results in no horizontal scrollbar showing up, but data can
         get unreadable if there is no enough space available.""")
 
+    page = param.Integer(default=1, bounds=(1, None), doc="""
+        The currently displayed page if pagination='remote'. The table
+        itself does not display page controls, instead a widget may be
+        linked to the page, e.g.:
+
+            pager = pn.widgets.Spinner(value=1, start=1, end=table.page_count)
+            pager.link(table, value='page')
+            table.link(pager, page='value')
+
+        The page is reduced to the last page if the number of pages
+        shrinks, e.g. because of a filter.""")
+
+    page_size = param.Integer(default=20, bounds=(1, None), doc="""
+        The number of rows displayed per page if pagination='remote'.""")
+
+    pagination = param.ObjectSelector(default=None, objects=[None, 'remote'], doc="""
+        Whether to paginate the data. If 'remote' only the rows on the
+        current page are sent to the frontend, while filtering and
+        sorting is performed on the server. Since the browser only
+        holds a single page, sorting by clicking on the column headers
+        is disabled and the sorters should be used instead.""")
+
     selection = param.List(default=[], doc="""
         The currently selected rows of the table.""")
 
+    sorters = param.List(default=[], doc="""
+        List of sorters, each declared as a dictionary with a 'field'
+        and a 'dir' ('asc' or 'desc'). Only applied if
+        pagination='remote', otherwise sorting is done in the browser.""")
+
     row_height = param.Integer(default=25, doc="""
         The height of each table row.""")
 
@@ -41,13 +76,24 @@ class DataFrame(Widget):
     value = param.Parameter(default=None)
 
     _rename = {'editors': None, 'formatters': None, 'widths': None,
-               'disabled': None}
+               'disabled': None, 'filters': None, 'page': None,
+               'page_size': None, 'pagination': None, 'sorters': None}
+
+    _manual_params = ['value', 'editors', 'formatters', 'selection', 'widths',
+                      'filters', 'page', 'page_size', 'pagination', 'sorters']
 
-    _manual_params = ['value', 'editors', 'formatters', 'selection', 'widths']
+    _page_params = ['filters', 'page', 'page_size', 'pagination', 'sorters']
 
     def __init__(self, value=None, **params):
         super(DataFrame, self).__init__(value=value, **params)
         self._renamed_cols = {}
+        self._updating = False
+        self._positions = None
+        self.param.watch(self._clamp_page, ['filters', 'page_size', 'value'])
+
+    def _clamp_page(self, *events):
+        if self.pagination == 'remote' and self.page > self.page_count:
+            self.page = self.page_count
 
     def _get_columns(self):
         if self.value is None:
@@ -88,18 +134,86 @@ class DataFrame(Widget):
             columns.append(column)
         return columns
 
+    def _get_data(self, df):
+        if df is None:
+            return {}
+        return {k if isinstance(k, str) else str(k): v
+                for k, v in ColumnDataSource.from_df(df).items()}
+
+    def _get_positions(self):
+        """
+        Returns the integer positions of the filtered and sorted rows.
+        """
+        df = self.value
+        positions = np.arange(len(df))
+        for fltr in self.filters:
+            positions = positions[np.asarray(fltr(df.iloc[positions]), dtype=bool)]
+        if self.sorters:
+            import pandas as pd
+            fields = [s['field'] for s in self.sorters]
+            ascending = [s.get('dir', 'asc') == 'asc' for s in self.sorters]
+            index = str(df.index.name or 'index')
+            columns = {str(col): col for col in df.columns}
+            subset = pd.DataFrame({
+                field: df[columns[field]].values[positions] if field in columns
+                else df.index.values[positions] if field == index
+                else df[field].values[positions] for field in fields
+            }, index=np.arange(len(positions)))
+            order = subset.sort_values(fields, ascending=ascending, kind='mergesort').index
+            positions = positions[np.asarray(order)]
+        return positions
+
+    def _get_page(self):
+        """
+        Returns the DataFrame rows on the current page and records
+        their positions in the full DataFrame.
+        """
+        if self.value is None:
+            self._positions = None
+            return None
+        positions = self._get_positions()
+        # The page may not have been clamped to the page count yet
+        page = min(self.page, max(1, -(-len(positions) // self.page_size)))
+        start = (page-1) * self.page_size
+        self._positions = positions[start:start+self.page_size]
+        return self.value.iloc[self._positions]
+
+    def _get_source_data(self):
+        if self.pagination == 'remote':
+            return self._get_data(self._get_page())
+        self._positions = None
+        return self._get_data(self.value)
+
+    def _get_page_selection(self):
+        if self._positions is None:
+            return self.selection
+        lookup = {p: i for i, p in enumerate(self._positions.tolist())}
+        return [lookup[s] for s in self.selection if s in lookup]
+
+    @property
+    def page_count(self):
+        """
+        The number of pages if pagination='remote'.
+        """
+        if self.value is None:
+            return 0
+        nrows = len(self._get_positions()) if self.filters else len(self.value)
+        return max(1, -(-nrows // self.page_size))
+
     def _get_properties(self):
         props = {p : getattr(self, p) for p in list(Layoutable.param)
                  if getattr(self, p) is not None}
-        if self.value is None:
-            data = {}
-        else:
-            data = {k if isinstance(k, str) else str(k): v
-                    for k, v in ColumnDataSource.from_df(self.value).items()}
+        data = self._get_source_data()
         if props.get('height', None) is None:
-            length = max([len(v) for v in data.values()]) if data else 0
+            if self.pagination == 'remote':
+                length = self.page_size
+            else:
+                length = max([len(v) for v in data.values()]) if data else 0
             props['height'] = length * self.row_height + 30
+        if self.pagination == 'remote':
+            props['sortable'] = False
         props['source'] = ColumnDataSource(data=data)
+        props['source'].selected.indices = self._get_page_selection()
         props['columns'] = self._get_columns()
         props['index_position'] = None
         props['fit_columns'] = self.fit_columns
@@ -124,13 +238,17 @@ class DataFrame(Widget):
     def _manual_update(self, events, model, doc, root, parent, comm):
         for event in events:
             if event.name == 'value':
-                cds = model.source
-                data = {k if isinstance(k, str) else str(k): v
-                        for k, v in ColumnDataSource.from_df(self.value).items()}
-                cds.data = data
-                model.columns = self._get_columns()
+                model.source.data = self._get_source_data()
+                model.source.selected.indices = self._get_page_selection()
+                columns = self._get_columns()
+                if self._columns_changed(model.columns, columns):
+                    model.columns = columns
+            elif event.name in self._page_params:
+                model.source.data = self._get_source_data()
+                model.source.selected.indices = self._get_page_selection()
+                model.sortable = self.pagination != 'remote'
             elif event.name == 'selection':
-                model.source.selected.indices = self.selection
+                model.source.selected.indices = self._get_page_selection()
             else:
                 for col in model.columns:
                     if col.name in self.editors:
@@ -140,29 +258,180 @@ class DataFrame(Widget):
                     if col.name in self.widths:
                         col.width = self.widths[col.name]
 
+    @classmethod
+    def _columns_changed(cls, old_columns, new_columns):
+        """
+        Whether the TableColumns differ, allowing the existing columns
+        to be reused if the schema of the data is unchanged.
+        """
+        if len(old_columns) != len(new_columns):
+            return True
+        for old, new in zip(old_columns, new_columns):
+            if (old.field != new.field or old.title != new.title or
+                old.width != new.width):
+                return True
+            for attr in ('formatter', 'editor'):
+                old_model, new_model = getattr(old, attr), getattr(new, attr)
+                if (type(old_model) is not type(new_model) or
+                    old_model.properties_with_values(include_defaults=False) !=
+                    new_model.properties_with_values(include_defaults=False)):
+                    return True
+        return False
+
+    def _update_widget(self, *events):
+        if self._updating:
+            # Models were already updated incrementally
+            events = [event for event in events if event.name != 'value']
+            if not events:
+                return
+        super(DataFrame, self)._update_widget(*events)
+
+    def _update_source(self, method, data, rollover, model, doc, root, parent, comm):
+        ref = root.ref['id']
+        # The data property is linked twice (data and patching)
+        self._changing[ref] = ['data', 'data']
+        try:
+            if self.pagination == 'remote':
+                # The current page may have changed entirely
+                model.source.data = self._get_source_data()
+            elif method == 'stream':
+                model.source.stream(data, rollover)
+            else:
+                model.source.patch(data)
+        finally:
+            del self._changing[ref]
+
+    def _trigger_value(self):
+        self._updating = True
+        try:
+            self.param.trigger('value')
+        finally:
+            self._updating = False
+
+    @profiled('process_events')
     def _process_events(self, events):
         if 'data' in events:
             data = events.pop('data')
             updated = False
             for k, v in data.items():
-                if k == 'index':
-                    continue
                 k = self._renamed_cols.get(k, k)
+                if k not in self.value.columns:
+                    # Skip the index, which may be renamed to avoid
+                    # clashing with an index column
+                    continue
                 if isinstance(v, dict):
                     v = [v for _, v in sorted(v.items(), key=lambda it: int(it[0]))]
+                values = self.value[k].values
+                if self._positions is not None:
+                    values = values[self._positions]
                 try:
-                    isequal = (self.value[k].values == np.asarray(v)).all()
+                    isequal = (values == np.asarray(v)).all()
                 except Exception:
                     isequal = False
-                if not isequal:
+                if isequal:
+                    continue
+                if self._positions is None:
                     self.value[k] = v
-                    updated = True
+                else:
+                    col_index = self.value.columns.get_loc(k)
+                    self.value.iloc[self._positions, col_index] = v
+                updated = True
             if updated:
                 self.param.trigger('value')
         if 'indices' in events:
-            self.selection = events.pop('indices')
+            indices = events.pop('indices')
+            if self._positions is not None:
+                indices = [int(self._positions[i]) for i in indices]
+            self.selection = indices
         super(DataFrame, self)._process_events(events)
 
+    def stream(self, stream_value, rollover=None, reset_index=True):
+        """
+        Streams (appends) the stream_value to the existing value,
+        sending only the new rows to the frontend.
+
+        Arguments
+        ---------
+        stream_value: (pd.DataFrame | pd.Series | dict)
+          The new value(s) to append to the existing value.
+        rollover: (int)
+          A maximum column size, above which data from the start of
+          the column begins to be discarded. If None, then columns
+          will continue to grow unbounded.
+        reset_index: (bool, default=True)
+          If True the index of the stream_value is replaced with a
+          range continuing from the index of the existing value.
+        """
+        import pandas as pd
+        if isinstance(stream_value, dict):
+            stream_value = pd.DataFrame(stream_value)
+        elif isinstance(stream_value, pd.Series):
+            stream_value = stream_value.to_frame().T
+        elif not isinstance(stream_value, pd.DataFrame):
+            raise ValueError("The stream value must be a pandas DataFrame, "
+                             "Series or a dictionary of columns, got %s."
+                             % type(stream_value).__name__)
+        if self.value is None:
+            self.value = stream_value
+            return
+        if reset_index:
+            index = self.value.index
+            start = index.max()+1 if len(index) else 0
+            stream_value = stream_value.reset_index(drop=True)
+            stream_value.index = stream_value.index + start
+            stream_value.index.name = index.name
+        value = pd.concat([self.value, stream_value])
+        if rollover is not None:
+            value = value.iloc[-rollover:]
+        with param.discard_events(self):
+            self.value = value
+        data = self._get_data(stream_value)
+        self._apply_update(partial(self._update_source, 'stream', data, rollover))
+        self._trigger_value()
+
+    def patch(self, patch_value):
+        """
+        Patches the existing value with the supplied patch_value,
+        sending only the changed values to the frontend. The value
+        is replaced with a patched copy, the original DataFrame is
+        not modified.
+
+        Arguments
+        ---------
+        patch_value: (pd.DataFrame | dict)
+          A DataFrame whose index and columns identify the values to
+          update or a dictionary mapping from column name to a list
+          of (row position, value) or (slice, values) tuples.
+        """
+        import pandas as pd
+        if self.value is None:
+            raise ValueError("Cannot patch a DataFrame widget without a value.")
+        if isinstance(patch_value, pd.DataFrame):
+            positions = self.value.index.get_indexer(patch_value.index)
+            if (positions < 0).any():
+                raise ValueError("The patch_value index contains labels "
+                                 "which are not present in the value.")
+            patches = {col: list(zip(positions.tolist(), patch_value[col]))
+                       for col in patch_value.columns}
+        elif isinstance(patch_value, dict):
+            patches = patch_value
+        else:
+            raise ValueError("The patch value must be a pandas DataFrame "
+                             "or a dictionary of patches, got %s."
+                             % type(patch_value).__name__)
+        value = self.value.copy()
+        for col, values in patches.items():
+            col_index = value.columns.get_loc(col)
+            for index, patch in values:
+                value.iloc[index, col_index] = patch
+        with param.discard_events(self):
+            self.value = value
+        data = {str(col): [(i if isinstance(i, slice) else int(i), v)
+                           for i, v in values]
+                for col, values in patches.items()}
+        self._apply_update(partial(self._update_source, 'patch', data, None))
+        self._trigger_value()
+
     @property
     def selected_dataframe(self):
         """